@@ -1,13 +1,30 @@
 """Configuration management for PDF-to-PNG email processor."""
 
+import functools
 import os
 import re
 from dataclasses import dataclass, field
 
 
-@dataclass
+@functools.lru_cache(maxsize=32)
+def compile_whitelist_pattern(pattern: str) -> re.Pattern:
+    """Compile a sender whitelist pattern, memoized per pattern string.
+
+    Shared by Configuration and WhitelistService, so validating the
+    configuration and building the service compile the pattern only once.
+    """
+    # ASCII-only case folding: under Unicode rules non-ASCII look-alikes
+    # such as the Kelvin sign (U+212A) would match a literal "k"
+    return re.compile(pattern, re.ASCII | re.IGNORECASE)
+
+
+@dataclass(slots=True, frozen=True)
 class Configuration:
-    """System configuration loaded from environment variables."""
+    """System configuration loaded from environment variables.
+
+    Frozen so the pattern compiled in __post_init__ can never drift from
+    sender_whitelist_regex.
+    """
 
     # IMAP settings
     imap_host: str
@@ -38,18 +55,30 @@ class Configuration:
     pdf_density_dpi: int = 300
     pdf_background: str = "white"
     pdf_conversion_timeout_seconds: int = 120
+    # PDFs of one email converted at the same time; 0 means one per CPU core
+    pdf_max_concurrency: int = 0
 
     # SMTP timeout
     smtp_timeout_seconds: int = 120
 
+    # Reply batching: PNGs and encoded megabytes per reply email before
+    # splitting into several
+    attachments_per_email: int = 20
+    max_reply_size_mb: int = 20
+
+    # Incoming emails larger than this (as reported by the server) are not downloaded
+    max_email_size_mb: int = 150
+
     def __post_init__(self) -> None:
         """Validate configuration after initialization."""
         self._validate()
         # Compile regex for whitelist
         try:
-            self._compiled_whitelist = re.compile(self.sender_whitelist_regex)
+            compiled = compile_whitelist_pattern(self.sender_whitelist_regex)
         except re.error as e:
             raise ValueError(f"Invalid SENDER_WHITELIST_REGEX: {e}") from e
+        # Frozen dataclass: set the derived field through object.__setattr__
+        object.__setattr__(self, "_compiled_whitelist", compiled)
 
     def _validate(self) -> None:
         """Validate configuration values."""
@@ -90,26 +119,27 @@ class Configuration:
                 f"≥ polling_interval_seconds ({self.polling_interval_seconds})"
             )
 
-        # Validate PDF converter settings
-        if self.pdf_resolution_width < 1:
-            raise ValueError(f"pdf_resolution_width must be >= 1, got {self.pdf_resolution_width}")
-        if self.pdf_resolution_height < 1:
-            raise ValueError(
-                f"pdf_resolution_height must be >= 1, got {self.pdf_resolution_height}"
-            )
-        if self.pdf_density_dpi < 1:
-            raise ValueError(f"pdf_density_dpi must be >= 1, got {self.pdf_density_dpi}")
+        # Validate PDF converter, SMTP, reply and size settings
         if not self.pdf_background:
             raise ValueError("pdf_background must be a non-empty string")
-        if self.pdf_conversion_timeout_seconds < 1:
-            raise ValueError(
-                "pdf_conversion_timeout_seconds must be >= 1, "
-                f"got {self.pdf_conversion_timeout_seconds}"
-            )
-        if self.smtp_timeout_seconds < 1:
-            raise ValueError(
-                f"smtp_timeout_seconds must be >= 1, got {self.smtp_timeout_seconds}"
-            )
+
+        if self.pdf_max_concurrency < 0:
+            raise ValueError(f"pdf_max_concurrency must be >= 0, got {self.pdf_max_concurrency}")
+
+        positive_fields = [
+            ("pdf_resolution_width", self.pdf_resolution_width),
+            ("pdf_resolution_height", self.pdf_resolution_height),
+            ("pdf_density_dpi", self.pdf_density_dpi),
+            ("pdf_conversion_timeout_seconds", self.pdf_conversion_timeout_seconds),
+            ("smtp_timeout_seconds", self.smtp_timeout_seconds),
+            ("attachments_per_email", self.attachments_per_email),
+            ("max_reply_size_mb", self.max_reply_size_mb),
+            ("max_email_size_mb", self.max_email_size_mb),
+        ]
+
+        for field_name, field_value in positive_fields:
+            if field_value < 1:
+                raise ValueError(f"{field_name} must be >= 1, got {field_value}")
 
     @property
     def compiled_whitelist(self) -> re.Pattern:
@@ -162,5 +192,9 @@ class Configuration:
             pdf_conversion_timeout_seconds=int(
                 get_optional("PDF_CONVERSION_TIMEOUT_SECONDS", "120")
             ),
+            pdf_max_concurrency=int(get_optional("PDF_MAX_CONCURRENCY", "0")),
             smtp_timeout_seconds=int(get_optional("SMTP_TIMEOUT_SECONDS", "120")),
+            attachments_per_email=int(get_optional("ATTACHMENTS_PER_EMAIL", "20")),
+            max_reply_size_mb=int(get_optional("MAX_REPLY_SIZE_MB", "20")),
+            max_email_size_mb=int(get_optional("MAX_EMAIL_SIZE_MB", "150")),
         )
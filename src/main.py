@@ -3,11 +3,6 @@
 import sys
 
 from src.config import Configuration
-from src.services.imap_service import IMAPService
-from src.services.job_processor import JobProcessorService
-from src.services.pdf_converter import PDFConverterService
-from src.services.smtp_service import SMTPService
-from src.services.whitelist_service import WhitelistService
 from src.utils.logging import setup_logging
 
 # Setup logging
@@ -27,21 +22,33 @@ def main() -> None:  # noqa: PLR0915
     """
     try:
         # Load configuration
-        print("Loading configuration from environment variables...")
+        logger.info("Loading configuration from environment variables...")
         config = Configuration.from_env()
-        print("✓ Configuration loaded successfully")
-        print(f"  IMAP: {config.imap_host}:{config.imap_port}")
-        print(f"  SMTP: {config.smtp_host}:{config.smtp_port}")
-        print(f"  Whitelist: {config.sender_whitelist_regex}")
-        print(f"  Polling interval: {config.polling_interval_seconds}s")
+        logger.info(
+            "Configuration loaded: IMAP %s:%d, SMTP %s:%d, whitelist %s, polling every %ds",
+            config.imap_host,
+            config.imap_port,
+            config.smtp_host,
+            config.smtp_port,
+            config.sender_whitelist_regex,
+            config.polling_interval_seconds,
+        )
 
     except Exception as e:
         logger.exception("Failed to load configuration: %s", e)
         print(f"ERROR: Failed to load configuration: {e}", file=sys.stderr)
         sys.exit(1)
 
+    # Import services only once configuration is valid, so a misconfigured
+    # start exits without loading imaplib/smtplib/ssl and the service graph
+    from src.services.imap_service import IMAPService  # noqa: PLC0415
+    from src.services.job_processor import JobProcessorService  # noqa: PLC0415
+    from src.services.pdf_converter import PDFConverterService  # noqa: PLC0415
+    from src.services.smtp_service import SMTPService  # noqa: PLC0415
+    from src.services.whitelist_service import WhitelistService  # noqa: PLC0415
+
     # Initialize services
-    print("\nInitializing services...")
+    logger.info("Initializing services...")
     imap_service = IMAPService(config)
     smtp_service = SMTPService(config)
     pdf_converter = PDFConverterService(config)
@@ -53,53 +60,49 @@ def main() -> None:  # noqa: PLR0915
         pdf_converter=pdf_converter,
         whitelist_service=whitelist_service,
     )
-    print("✓ Services initialized")
+    logger.info("Services initialized")
 
     # Connect to IMAP with exponential backoff
-    print("\nConnecting to IMAP server...")
+    logger.info("Connecting to IMAP server...")
     try:
         imap_service.connect_with_backoff()
-        print(f"✓ Connected to IMAP: {config.imap_host}:{config.imap_port}")
+        logger.info("Connected to IMAP: %s:%d", config.imap_host, config.imap_port)
     except Exception as e:
         logger.exception("Failed to connect to IMAP: %s", e)
         print(f"ERROR: Failed to connect to IMAP: {e}", file=sys.stderr)
         sys.exit(1)
 
     # Connect to SMTP
-    print("Connecting to SMTP server...")
+    logger.info("Connecting to SMTP server...")
     try:
         smtp_service.connect()
-        print(f"✓ Connected to SMTP: {config.smtp_host}:{config.smtp_port}")
+        logger.info("Connected to SMTP: %s:%d", config.smtp_host, config.smtp_port)
     except Exception as e:
         logger.exception("Failed to connect to SMTP: %s", e)
         print(f"ERROR: Failed to connect to SMTP: {e}", file=sys.stderr)
         sys.exit(1)
 
     # Main processing loop
-    print("\n" + "=" * 60)
-    print("PDF-to-PNG Email Processor is now running!")
-    print("=" * 60)
-    print(f"Polling INBOX every {config.polling_interval_seconds} seconds...")
-    print("Press Ctrl+C to stop.\n")
+    logger.info("PDF-to-PNG Email Processor is now running (Ctrl+C to stop)")
 
     try:
         # Run daemon with continuous polling and connection recovery
         job_processor.run_daemon()
 
     except KeyboardInterrupt:
-        print("\n\nShutting down gracefully...")
+        logger.info("Shutting down gracefully...")
 
     finally:
         # Cleanup connections
-        print("Disconnecting from servers...")
+        logger.info("Disconnecting from servers...")
         try:
             imap_service.disconnect()
             smtp_service.disconnect()
-            print("✓ Disconnected successfully")
+            logger.info("Disconnected successfully")
         except Exception as e:
             logger.error("Error during disconnect: %s", e)
 
-        print("Shutdown complete.")
+        logger.info("Shutdown complete")
 
 
 if __name__ == "__main__":
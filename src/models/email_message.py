@@ -1,10 +1,11 @@
 """EmailMessage entity for PDF-to-PNG email processor."""
 
-from dataclasses import dataclass
+import email.message
+from dataclasses import dataclass, field
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class EmailMessage:
     """Represents an incoming email retrieved from IMAP INBOX.
 
@@ -13,16 +14,20 @@ class EmailMessage:
         sender: Email address of the sender
         subject: Email subject line
         body: Plain text body (optional, used for error context)
-        raw_bytes: Complete RFC 5322 message
+        raw_bytes: Complete RFC 5322 message; None once released by
+            ProcessingJob.release_raw() after attachment extraction
         received_at: Timestamp when email was retrieved
+        parsed: Message tree already parsed from raw_bytes at fetch time, reused
+            for attachment extraction to avoid a second MIME parse
     """
 
     uid: int
     sender: str
     subject: str
     body: str
-    raw_bytes: bytes
+    raw_bytes: bytes | None
     received_at: datetime
+    parsed: email.message.Message | None = field(default=None, compare=False, repr=False)
 
     def __post_init__(self) -> None:
         """Validate EmailMessage after initialization."""
@@ -31,4 +36,5 @@ class EmailMessage:
         if "@" not in self.sender:
             raise ValueError("Sender must be a valid email address")
         if not self.raw_bytes:
+            # None marks a released message and is never valid at construction
             raise ValueError("Raw bytes must not be empty")
@@ -0,0 +1,34 @@
+"""MessageSummary entity for PDF-to-PNG email processor."""
+
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, frozen=True)
+class MessageSummary:
+    """Envelope data of an unseen message, fetched without its body.
+
+    Used to decide whether a message is worth downloading at all: mail from
+    non-whitelisted senders and oversized mail are handled from the summary
+    alone.
+
+    Attributes:
+        uid: IMAP UID of the message (unique within mailbox)
+        sender: Email address of the sender (empty if the From header is unusable)
+        subject: Email subject line
+        size_bytes: RFC822.SIZE reported by the server (None if it sent none)
+        header_error: Why the From/Subject headers could not be read, if they
+            could not; sender and subject are then placeholders
+    """
+
+    uid: int
+    sender: str
+    subject: str
+    size_bytes: int | None
+    header_error: str | None = None
+
+    def __post_init__(self) -> None:
+        """Validate MessageSummary after initialization."""
+        if self.uid <= 0:
+            raise ValueError("UID must be positive")
+        if self.size_bytes is not None and self.size_bytes < 0:
+            raise ValueError("Size must not be negative")
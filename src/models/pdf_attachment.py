@@ -1,33 +1,42 @@
 """PDFAttachment entity for PDF-to-PNG email processor."""
 
+import re
 from dataclasses import dataclass
+from pathlib import Path
+from typing import ClassVar
 
+# Character set produced by sanitize_filename
+_SANITIZED_RE = re.compile(r"[A-Za-z0-9_\-]+")
 
-@dataclass
+
+@dataclass(slots=True)
 class PDFAttachment:
     """Represents a PDF file extracted from an email message.
 
     Attributes:
         filename: Original attachment filename from email
         sanitized_name: Filename sanitized for filesystem safety
-        content: Binary content of the PDF file
+        path: Filesystem path of the decoded PDF (in the job's temp directory)
         size_bytes: Size of the PDF in bytes
         page_count: Number of pages (detected after conversion, may be None)
     """
 
+    # Largest accepted attachment; extraction stops decoding past this size
+    MAX_SIZE_BYTES: ClassVar[int] = 100 * 1024 * 1024
+
     filename: str
     sanitized_name: str
-    content: bytes
+    path: Path
     size_bytes: int
     page_count: int | None = None
 
     def __post_init__(self) -> None:
         """Validate PDFAttachment after initialization."""
-        if not self.filename.lower().endswith(".pdf"):
+        if self.filename[-4:].lower() != ".pdf":
             raise ValueError("Filename must have .pdf extension")
         if self.size_bytes <= 0:
             raise ValueError("PDF must not be empty")
-        if self.size_bytes > 100 * 1024 * 1024:  # 100MB limit
+        if self.size_bytes > self.MAX_SIZE_BYTES:
             raise ValueError("PDF must be < 100MB")
-        if not all(c.isalnum() or c in "_-" for c in self.sanitized_name):
+        if _SANITIZED_RE.fullmatch(self.sanitized_name) is None:
             raise ValueError("Sanitized name must contain only alphanumeric, underscore, hyphen")
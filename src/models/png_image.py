@@ -1,10 +1,10 @@
 """PNGImage entity for PDF-to-PNG email processor."""
 
-from dataclasses import dataclass
+from dataclasses import InitVar, dataclass
 from pathlib import Path
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PNGImage:
     """Represents a generated PNG image from a single PDF page.
 
@@ -16,6 +16,7 @@ class PNGImage:
         size_bytes: File size of the PNG
         resolution: Output resolution as (width, height), configurable via Configuration
         density_dpi: Rendering DPI, configurable via Configuration
+        validate_fs: Check that ``path`` exists (init-only; default True)
     """
 
     path: Path
@@ -25,10 +26,15 @@ class PNGImage:
     size_bytes: int
     resolution: tuple[int, int]
     density_dpi: int
+    validate_fs: InitVar[bool] = True
 
-    def __post_init__(self) -> None:
-        """Validate PNGImage after initialization."""
-        if not self.path.exists():
+    def __post_init__(self, validate_fs: bool) -> None:
+        """Validate PNGImage after initialization.
+
+        The filesystem check costs a stat() per page; the converter, which has
+        just written and stat()ed the file, passes ``validate_fs=False``.
+        """
+        if validate_fs and not self.path.exists():
             raise ValueError("PNG file must exist on filesystem")
         if self.size_bytes <= 0:
             raise ValueError("PNG must not be empty")
@@ -1,13 +1,17 @@
 """ProcessingJob entity for PDF-to-PNG email processor."""
 
+import functools
+import time
 from dataclasses import dataclass, field
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from enum import Enum
 
 from src.models.email_message import EmailMessage
 from src.models.pdf_attachment import PDFAttachment
 from src.models.png_image import PNGImage
 
+_now_utc = functools.partial(datetime.now, UTC)
+
 
 class JobStatus(Enum):
     """Status of a processing job."""
@@ -18,7 +22,7 @@ class JobStatus(Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingJob:
     """Represents the complete processing lifecycle for one incoming email.
 
@@ -38,9 +42,13 @@ class ProcessingJob:
     png_images: list[PNGImage] = field(default_factory=list)
     status: JobStatus = JobStatus.PENDING
     error: Exception | None = None
-    started_at: datetime = field(default_factory=lambda: datetime.now(tz=UTC))
+    started_at: datetime = field(default_factory=_now_utc)
     completed_at: datetime | None = None
     duration_seconds: float | None = None
+    # Monotonic clock reading at construction; durations are measured from it
+    _started_monotonic: float = field(
+        init=False, default_factory=time.monotonic, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         """Validate ProcessingJob after initialization."""
@@ -55,6 +63,16 @@ class ProcessingJob:
         if self.completed_at is not None and self.completed_at < self.started_at:
             raise ValueError("completed_at must be >= started_at")
 
+    def release_raw(self) -> None:
+        """Drop the raw RFC 5322 bytes and parsed tree once attachments are extracted.
+
+        The PDFs are already written under the job's temp directory, so keeping
+        the full message alive for the rest of the job only inflates peak memory.
+        ``raw_bytes`` is set to None, marking the message as released.
+        """
+        self.email_message.raw_bytes = None
+        self.email_message.parsed = None
+
     def mark_processing(self) -> None:
         """Mark job as processing."""
         self.status = JobStatus.PROCESSING
@@ -62,8 +80,7 @@ class ProcessingJob:
     def mark_completed(self) -> None:
         """Mark job as completed successfully."""
         self.status = JobStatus.COMPLETED
-        self.completed_at = datetime.now(tz=UTC)
-        self.duration_seconds = (self.completed_at - self.started_at).total_seconds()
+        self._record_completion()
 
     def mark_failed(self, error: Exception) -> None:
         """Mark job as failed with error.
@@ -73,5 +90,13 @@ class ProcessingJob:
         """
         self.status = JobStatus.FAILED
         self.error = error
-        self.completed_at = datetime.now(tz=UTC)
-        self.duration_seconds = (self.completed_at - self.started_at).total_seconds()
+        self._record_completion()
+
+    def _record_completion(self) -> None:
+        """Set duration from the monotonic clock and derive completed_at from it.
+
+        Deriving the end timestamp instead of reading the wall clock again keeps
+        completed_at >= started_at even if the system clock steps backwards.
+        """
+        self.duration_seconds = time.monotonic() - self._started_monotonic
+        self.completed_at = self.started_at + timedelta(seconds=self.duration_seconds)
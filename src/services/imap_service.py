@@ -2,19 +2,58 @@
 
 import contextlib
 import email
+import email.header
+import email.message
+import email.parser
 import email.policy
 import email.utils
+import functools
 import imaplib
+import random
+import re
+import select
+import socket
 import ssl
 import time
+from collections.abc import Iterator
 from datetime import UTC, datetime
 
 from src.config import Configuration
 from src.models.email_message import EmailMessage
+from src.models.message_summary import MessageSummary
+from src.utils.email_utils import get_header_text
 from src.utils.logging import get_logger
 
 logger = get_logger()
 
+# imaplib exception classes, bound once so except clauses skip attribute lookups
+_IMAP_ERROR = imaplib.IMAP4.error
+_IMAP_ABORT = imaplib.IMAP4.abort
+# Errors meaning the connection is gone and must be re-established
+_CONNECTION_ERRORS = (_IMAP_ABORT, BrokenPipeError, ConnectionError, OSError)
+# Server error text that indicates rejected credentials
+_AUTH_ERROR_RE = re.compile(r"auth|login|credential", re.IGNORECASE)
+
+# Data items requested per message; BODY.PEEK[] leaves the \Seen flag unset
+_FETCH_ITEMS = "(UID INTERNALDATE BODY.PEEK[])"
+_SUMMARY_ITEMS = "(UID RFC822.SIZE BODY.PEEK[HEADER.FIELDS (FROM SUBJECT)])"
+_UID_RE = re.compile(rb"\bUID (\d+)")
+_SIZE_RE = re.compile(rb"\bRFC822\.SIZE (\d+)")
+_INTERNALDATE_RE = re.compile(rb'INTERNALDATE "([^"]+)"')
+
+# Parses the header-only literals of summary fetches
+_HEADER_PARSER = email.parser.BytesHeaderParser(policy=email.policy.compat32)
+
+# Exponent cap for the reconnect backoff; 60s << 20 is far beyond any max delay
+_MAX_BACKOFF_SHIFT = 20
+
+# Linux-specific keepalive tuning; options missing on other platforms are skipped
+_TCP_KEEPALIVE_OPTIONS = (
+    (getattr(socket, "TCP_KEEPIDLE", None), 120),
+    (getattr(socket, "TCP_KEEPINTVL", None), 30),
+    (getattr(socket, "TCP_KEEPCNT", None), 3),
+)
+
 
 class IMAPError(Exception):
     """Base exception for IMAP operations."""
@@ -28,12 +67,25 @@ class IMAPAuthenticationError(IMAPError):
     """Raised when IMAP login credentials are rejected."""
 
 
+class MessageParseError(Exception):
+    """Raised when a fetched message cannot be parsed.
+
+    Not an IMAPError: the connection is fine, and retrying would fetch the
+    same message again.
+    """
+
+
 class IMAPService:
     """Service for IMAP email operations with TLS fallback and exponential backoff.
 
     Implements FR-001, FR-021, FR-025, FR-026, FR-027, FR-028.
     """
 
+    # RFC 2177: clients should re-issue IDLE at least every 29 minutes
+    IDLE_TIMEOUT_SECONDS = 29 * 60
+    # UIDs per summary UID FETCH; keeps command lines and responses bounded
+    SUMMARY_BATCH_SIZE = 50
+
     def __init__(self, config: Configuration) -> None:
         """Initialize IMAP service with configuration.
 
@@ -62,14 +114,16 @@ class IMAPService:
 
         # Try IMAP4_SSL first
         try:
-            self.connection = imaplib.IMAP4_SSL(host, port)
+            self.connection = imaplib.IMAP4_SSL(host, port, ssl_context=_ssl_context())
             self.connection.login(username, password)
+            _refresh_capabilities(self.connection)
+            _enable_tcp_keepalive(self.connection.sock)
             return
         except ssl.SSLError:
             # SSL failed, will try STARTTLS next
             pass
-        except imaplib.IMAP4.error as e:
-            if "authentication" in str(e).lower() or "login" in str(e).lower():
+        except _IMAP_ERROR as e:
+            if _AUTH_ERROR_RE.search(str(e)):
                 raise IMAPAuthenticationError(f"IMAP authentication failed: {e}") from e
             # Other errors - will try STARTTLS
         except Exception:
@@ -80,11 +134,13 @@ class IMAPService:
         try:
             self.connection = imaplib.IMAP4(host, port)
             with contextlib.suppress(Exception):
-                self.connection.starttls()
+                self.connection.starttls(ssl_context=_ssl_context())
             self.connection.login(username, password)
+            _refresh_capabilities(self.connection)
+            _enable_tcp_keepalive(self.connection.sock)
             return
-        except imaplib.IMAP4.error as e:
-            if "authentication" in str(e).lower() or "login" in str(e).lower():
+        except _IMAP_ERROR as e:
+            if _AUTH_ERROR_RE.search(str(e)):
                 raise IMAPAuthenticationError(f"IMAP authentication failed: {e}") from e
             raise IMAPConnectionError(f"IMAP connection failed for {host}:{port}: {e}") from e
         except Exception as e:
@@ -93,7 +149,9 @@ class IMAPService:
     def connect_with_backoff(self, max_retries: int | None = None) -> None:
         """Connect with exponential backoff on failure per FR-027.
 
-        Backoff schedule: 60s → 120s → 240s → ... up to 900s (15 min)
+        Backoff schedule: 60s → 120s → 240s → ... up to 900s (15 min), with
+        equal jitter (each delay is drawn from [capped/2, capped]) so several
+        clients recovering from the same outage do not reconnect in lockstep.
         Logs every failure attempt per FR-028.
 
         Args:
@@ -116,15 +174,18 @@ class IMAPService:
             except IMAPConnectionError as e:
                 attempt += 1
 
-                # Calculate exponential backoff delay
-                delay = min(base_delay * (2 ** (attempt - 1)), max_delay)
+                # Calculate exponential backoff delay (shift capped to bound the integer)
+                capped = min(base_delay << min(attempt - 1, _MAX_BACKOFF_SHIFT), max_delay)
+                delay = random.uniform(capped / 2, capped)
 
                 # Log the failure per FR-028
                 logger.error(
-                    "IMAP connection failed (attempt %d): %s. Retrying in %d seconds...",
+                    "IMAP connection failed (attempt %d): %s. Retrying in %.1f seconds "
+                    "(backoff cap %d seconds)...",
                     attempt,
                     e,
                     delay,
+                    capped,
                 )
 
                 # Wait before retry
@@ -133,87 +194,177 @@ class IMAPService:
         # Max retries exceeded
         raise IMAPConnectionError(f"IMAP connection failed after {max_retries} attempts")
 
-    def fetch_unseen_messages(self) -> list[EmailMessage]:
-        """Fetch all UNSEEN messages from INBOX per FR-001.
+    def fetch_unseen_summaries(self) -> list[MessageSummary]:
+        """Fetch sender, subject and size of all UNSEEN messages in INBOX per FR-001.
+
+        Only the From/Subject headers and RFC822.SIZE are requested, with
+        one ``UID FETCH`` per SUMMARY_BATCH_SIZE messages, so listing the
+        queue costs few round-trips and no message bodies; the Seen flag is
+        left untouched. Bodies are downloaded one at a time with
+        fetch_message().
 
         Returns:
-            List of EmailMessage objects
+            MessageSummary objects in UID (arrival) order; empty if none
 
         Raises:
-            IMAPError: If fetch operation fails
+            IMAPError: If the search or fetch fails
         """
         if not self.connection:
             raise IMAPError("IMAP connection not established. Call connect() first.")
 
         try:
-            # Select INBOX
+            # Select INBOX; the EXISTS/RECENT counts it reports are covered by
+            # this search, so they must not wake the next idle()
             self.connection.select("INBOX")
+            _take_mailbox_updates(self.connection)
 
-            # Search for UNSEEN messages
-            status, message_ids = self.connection.search(None, "UNSEEN")
+            # Search for UNSEEN messages (returns UIDs, not sequence numbers);
+            # messages already flagged \Deleted but not yet expunged are skipped
+            status, message_ids = self.connection.uid("SEARCH", None, "UNSEEN", "UNDELETED")
 
             if status != "OK":
                 raise IMAPError(f"IMAP search failed: {status}")
 
-            # Parse message IDs (space-separated list)
+            # Parse UIDs (space-separated list)
             if not message_ids[0]:
                 return []  # No unseen messages
 
-            uid_list = message_ids[0].split()
+            uids = message_ids[0].split()
+            msg_data = []
+            for start in range(0, len(uids), self.SUMMARY_BATCH_SIZE):
+                uid_set = b",".join(uids[start : start + self.SUMMARY_BATCH_SIZE]).decode()
 
-            # Fetch each message
-            messages = []
-            for uid in uid_list:
-                status, msg_data = self.connection.fetch(uid, "(RFC822)")
+                # Fetch headers and sizes of the whole batch in one round-trip
+                status, batch_data = self.connection.uid("FETCH", uid_set, _SUMMARY_ITEMS)
 
                 if status != "OK":
-                    logger.error("Failed to fetch message UID %s: %s", uid, status)
-                    continue
-
-                # Parse email
-                raw_bytes = msg_data[0][1]
-                parsed_msg = email.message_from_bytes(raw_bytes, policy=email.policy.default)
-
-                # Extract sender
-                sender = email.utils.parseaddr(parsed_msg["From"])[1]
-
-                # Extract subject
-                subject = parsed_msg.get("Subject", "(no subject)")
-
-                # Extract plain text body
-                body = ""
-                if parsed_msg.is_multipart():
-                    for part in parsed_msg.walk():
-                        if part.get_content_type() == "text/plain":
-                            body = part.get_payload(decode=True).decode("utf-8", errors="ignore")
-                            break
-                else:
-                    body = parsed_msg.get_payload(decode=True).decode("utf-8", errors="ignore")
-
-                messages.append(
-                    EmailMessage(
-                        uid=int(uid),
-                        sender=sender,
-                        subject=subject,
-                        body=body,
-                        raw_bytes=raw_bytes,
-                        received_at=datetime.now(tz=UTC),
-                    )
-                )
-
-            return messages
+                    raise IMAPError(f"IMAP fetch failed for UIDs {uid_set}: {status}")
+                msg_data.extend(batch_data)
 
-        except (imaplib.IMAP4.abort, BrokenPipeError, ConnectionError, OSError) as e:
+        except _CONNECTION_ERRORS as e:
             self.disconnect()
             raise IMAPConnectionError(f"Failed to fetch unseen messages: {e}") from e
         except Exception as e:
             raise IMAPError(f"Failed to fetch unseen messages: {e}") from e
 
-    def delete_message(self, uid: int) -> None:
+        summaries = []
+        for meta, header_bytes in _iter_fetch_response(msg_data):
+            uid_match = _UID_RE.search(meta)
+            if uid_match is None:
+                logger.error("Skipping fetched message without UID")
+                continue
+
+            size_match = _SIZE_RE.search(meta)
+            header_error = None
+            try:
+                headers = _HEADER_PARSER.parsebytes(header_bytes)
+                sender = _extract_sender(get_header_text(headers, "From"))
+                subject = get_header_text(headers, "Subject", "(no subject)")
+            except Exception as e:
+                # Listed anyway, so the message can be set aside instead of
+                # failing the whole listing (and again on every poll)
+                sender, subject, header_error = "", "(no subject)", str(e)
+            summaries.append(
+                MessageSummary(
+                    uid=int(uid_match.group(1)),
+                    sender=sender,
+                    subject=subject,
+                    size_bytes=int(size_match.group(1)) if size_match else None,
+                    header_error=header_error,
+                )
+            )
+
+        # Servers may answer in any order; process oldest first
+        summaries.sort(key=lambda summary: summary.uid)
+        return summaries
+
+    def fetch_message(self, uid: int) -> EmailMessage | None:
+        """Download and parse one complete message by UID.
+
+        Fetched with ``BODY.PEEK[]`` so the Seen flag is left untouched.
+
+        Args:
+            uid: IMAP message UID
+
+        Returns:
+            Parsed EmailMessage, or None if the message no longer exists
+
+        Raises:
+            IMAPError: If the message cannot be fetched
+            MessageParseError: If the fetched message cannot be parsed
+        """
+        if not self.connection:
+            raise IMAPError("IMAP connection not established. Call connect() first.")
+
+        try:
+            status, msg_data = self.connection.uid("FETCH", str(uid), _FETCH_ITEMS)
+
+            if status != "OK":
+                raise IMAPError(f"IMAP fetch failed for UID {uid}: {status}")
+
+        except _CONNECTION_ERRORS as e:
+            self.disconnect()
+            raise IMAPConnectionError(f"Failed to fetch message UID {uid}: {e}") from e
+        except Exception as e:
+            raise IMAPError(f"Failed to fetch message UID {uid}: {e}") from e
+
+        for meta, raw_bytes in _iter_fetch_response(msg_data):
+            date_match = _INTERNALDATE_RE.search(meta)
+            internaldate = date_match.group(1).decode() if date_match else None
+            try:
+                return self._parse_message(uid, internaldate, raw_bytes)
+            except Exception as e:
+                raise MessageParseError(f"Failed to parse message UID {uid}: {e}") from e
+
+        # Servers answer a FETCH for an expunged UID with no data
+        return None
+
+    @staticmethod
+    def _parse_message(uid: int, internaldate: str | None, raw_bytes: bytes) -> EmailMessage:
+        """Build an EmailMessage from a fetched RFC 5322 literal.
+
+        Args:
+            uid: IMAP UID of the message
+            internaldate: INTERNALDATE string reported by the server, if any
+            raw_bytes: Complete RFC 5322 message
+
+        Returns:
+            Parsed EmailMessage
+        """
+        parsed_msg = email.message_from_bytes(raw_bytes, policy=email.policy.compat32)
+
+        # Extract sender and subject; compat32 leaves both undecoded
+        sender = _extract_sender(get_header_text(parsed_msg, "From"))
+        subject = get_header_text(parsed_msg, "Subject", "(no subject)")
+
+        return EmailMessage(
+            uid=uid,
+            sender=sender,
+            subject=subject,
+            body=_extract_body(parsed_msg),
+            raw_bytes=raw_bytes,
+            received_at=_parse_internaldate(internaldate),
+            parsed=parsed_msg,
+        )
+
+    def delete_message(self, uid: int, *, expunge: bool = True) -> None:
         """Delete message by UID per FR-021.
 
         Args:
             uid: IMAP message UID
+            expunge: Expunge immediately; pass False to defer to expunge()
+
+        Raises:
+            IMAPError: If deletion fails
+        """
+        self.delete_messages([uid], expunge=expunge)
+
+    def delete_messages(self, uids: list[int], *, expunge: bool = True) -> None:
+        """Delete several messages with one UID STORE and at most one EXPUNGE.
+
+        Args:
+            uids: IMAP message UIDs
+            expunge: Expunge immediately; pass False to defer to expunge()
 
         Raises:
             IMAPError: If deletion fails
@@ -221,18 +372,159 @@ class IMAPService:
         if not self.connection:
             raise IMAPError("IMAP connection not established. Call connect() first.")
 
+        if not uids:
+            return
+
+        uid_set = ",".join(str(uid) for uid in uids)
         try:
-            # Mark message as deleted
-            self.connection.store(str(uid), "+FLAGS", r"(\Deleted)")
+            # Mark messages as deleted
+            self.connection.uid("STORE", uid_set, "+FLAGS", r"(\Deleted)")
 
             # Expunge to permanently delete
+            if expunge:
+                self.connection.expunge()
+
+        except _CONNECTION_ERRORS as e:
+            self.disconnect()
+            raise IMAPConnectionError(f"Failed to delete message UID {uid_set}: {e}") from e
+        except Exception as e:
+            raise IMAPError(f"Failed to delete message UID {uid_set}: {e}") from e
+
+    def expunge(self) -> None:
+        """Permanently remove all messages flagged as deleted.
+
+        Raises:
+            IMAPError: If the expunge fails
+        """
+        if not self.connection:
+            raise IMAPError("IMAP connection not established. Call connect() first.")
+
+        try:
             self.connection.expunge()
 
-        except (imaplib.IMAP4.abort, BrokenPipeError, ConnectionError, OSError) as e:
+        except _CONNECTION_ERRORS as e:
             self.disconnect()
-            raise IMAPConnectionError(f"Failed to delete message UID {uid}: {e}") from e
+            raise IMAPConnectionError(f"Failed to expunge INBOX: {e}") from e
         except Exception as e:
-            raise IMAPError(f"Failed to delete message UID {uid}: {e}") from e
+            raise IMAPError(f"Failed to expunge INBOX: {e}") from e
+
+    def mark_seen(self, uid: int) -> None:
+        """Set the Seen flag on a message by UID.
+
+        Messages are fetched with BODY.PEEK[] and therefore stay UNSEEN until
+        they are explicitly flagged. Used to keep a failed message in INBOX
+        for manual recovery per NFR-007 without reprocessing it on every poll.
+
+        Args:
+            uid: IMAP message UID
+
+        Raises:
+            IMAPError: If the flag cannot be stored
+        """
+        if not self.connection:
+            raise IMAPError("IMAP connection not established. Call connect() first.")
+
+        try:
+            self.connection.uid("STORE", str(uid), "+FLAGS", r"(\Seen)")
+
+        except _CONNECTION_ERRORS as e:
+            self.disconnect()
+            raise IMAPConnectionError(f"Failed to mark message UID {uid} as seen: {e}") from e
+        except Exception as e:
+            raise IMAPError(f"Failed to mark message UID {uid} as seen: {e}") from e
+
+    def noop(self) -> None:
+        """Send NOOP so the server does not drop an otherwise idle connection.
+
+        Raises:
+            IMAPConnectionError: If the connection has been lost
+            IMAPError: If the server rejects the command
+        """
+        if not self.connection:
+            raise IMAPError("IMAP connection not established. Call connect() first.")
+
+        try:
+            self.connection.noop()
+
+        except _CONNECTION_ERRORS as e:
+            self.disconnect()
+            raise IMAPConnectionError(f"IMAP NOOP failed: {e}") from e
+        except Exception as e:
+            raise IMAPError(f"IMAP NOOP failed: {e}") from e
+
+    def supports_idle(self) -> bool:
+        """Check whether the connected server advertises the IDLE capability.
+
+        Uses the CAPABILITY list re-read after login by connect().
+
+        Returns:
+            True if IDLE (RFC 2177) can be used instead of polling
+        """
+        return self.connection is not None and "IDLE" in self.connection.capabilities
+
+    def idle(self, timeout: int | None = None) -> bool:
+        """Block in IMAP IDLE until the server reports new mail or timeout elapses.
+
+        Returns immediately when an earlier command (e.g. the batch EXPUNGE)
+        already carried an EXISTS/RECENT update. Untagged responses that do
+        not announce mail, such as server keepalives, do not end the wait.
+
+        Args:
+            timeout: Seconds to wait before ending IDLE (default: IDLE_TIMEOUT_SECONDS)
+
+        Returns:
+            True if the server pushed an EXISTS/RECENT update, False on timeout
+
+        Raises:
+            IMAPConnectionError: If the connection drops while idling
+            IMAPError: If the server rejects IDLE
+        """
+        if not self.connection:
+            raise IMAPError("IMAP connection not established. Call connect() first.")
+
+        if timeout is None:
+            timeout = self.IDLE_TIMEOUT_SECONDS
+
+        conn = self.connection
+        try:
+            if conn.state != "SELECTED":
+                conn.select("INBOX")
+                _take_mailbox_updates(conn)
+            elif _take_mailbox_updates(conn):
+                return True
+
+            # imaplib (3.11-3.13) has no IDLE command of its own; _new_tag()
+            # returns the next tag in its sequence, so the hand-written command
+            # never reuses a tag imaplib issues later
+            tag = conn._new_tag()
+            conn.send(tag + b" IDLE\r\n")
+
+            has_new_mail = _read_idle_continuation(conn, tag)
+            if not has_new_mail:
+                has_new_mail = _wait_for_mailbox_update(conn, timeout)
+
+            # Leave IDLE and drain untagged responses up to the tagged completion
+            conn.send(b"DONE\r\n")
+            while True:
+                response = conn.readline()
+                if not response:
+                    raise _IMAP_ABORT("connection closed while leaving IDLE")
+                if response.startswith(tag):
+                    break
+                has_new_mail = has_new_mail or _is_mailbox_update(response)
+
+            return has_new_mail
+
+        except IMAPError:
+            raise
+        except _CONNECTION_ERRORS as e:
+            self.disconnect()
+            raise IMAPConnectionError(f"IMAP IDLE failed: {e}") from e
+        except Exception as e:
+            # The server may still be idling with a reply pending; any later
+            # command on this connection would read out of sync
+            self.disconnect()
+            raise IMAPError(f"IMAP IDLE failed: {e}") from e
 
     def disconnect(self) -> None:
         """Close IMAP connection gracefully."""
@@ -245,3 +537,176 @@ class IMAPService:
                 pass
             finally:
                 self.connection = None
+
+
+def _iter_fetch_response(msg_data: list) -> Iterator[tuple[bytes, bytes]]:
+    """Walk a multi-message UID FETCH response.
+
+    imaplib returns each message as a ``(header, literal)`` tuple followed by
+    a closing bytes token; servers may place data items such as UID either
+    before the literal or in that trailing token.
+
+    Args:
+        msg_data: Data list returned by ``IMAP4.uid("FETCH", ...)``
+
+    Yields:
+        Tuples of (metadata, literal), where metadata joins the header and
+        the trailing token
+    """
+    for index, item in enumerate(msg_data):
+        if not isinstance(item, tuple):
+            continue
+
+        header, literal = item
+        trailer = msg_data[index + 1] if index + 1 < len(msg_data) else b""
+        yield header + b" " + (trailer if isinstance(trailer, bytes) else b""), literal
+
+
+@functools.cache
+def _ssl_context() -> ssl.SSLContext:
+    """Return the TLS context shared by all IMAP connections.
+
+    Built on first use so the CA bundle is loaded once per process rather
+    than on every reconnect.
+    """
+    return ssl.create_default_context()
+
+
+def _refresh_capabilities(conn: imaplib.IMAP4) -> None:
+    """Re-read CAPABILITY after login.
+
+    imaplib only stores the list from the pre-login greeting; servers often
+    advertise extensions such as IDLE only to authenticated clients. If
+    CAPABILITY fails, the greeting's list is kept; a lost connection then
+    surfaces on the next command.
+    """
+    with contextlib.suppress(_IMAP_ERROR):
+        status, data = conn.capability()
+        if status == "OK" and data and data[-1]:
+            conn.capabilities = tuple(data[-1].decode("ascii", "replace").upper().split())
+
+
+def _enable_tcp_keepalive(sock: socket.socket) -> None:
+    """Turn on TCP keepalive so dead peers are detected while the daemon waits.
+
+    Probe timing (idle 120s, interval 30s, 3 probes) is applied where the
+    platform exposes the options; failures are ignored.
+    """
+    with contextlib.suppress(OSError, AttributeError):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for option, value in _TCP_KEEPALIVE_OPTIONS:
+            if option is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, option, value)
+
+
+def _extract_sender(from_header: str | email.header.Header) -> str:
+    """Extract the address from a From header.
+
+    The common ``Name <addr@host>`` form is sliced directly; anything else
+    (bare addresses, groups, malformed brackets) goes through parseaddr.
+    A ``Header`` object, as ``compat32`` returns for raw 8-bit values, is
+    converted to text first.
+    """
+    from_header = str(from_header)
+    start = from_header.rfind("<")
+    end = from_header.rfind(">")
+    if 0 <= start < end:
+        return from_header[start + 1 : end].strip()
+    return email.utils.parseaddr(from_header)[1]
+
+
+def _extract_body(parsed_msg: email.message.Message) -> str:
+    """Decode the first text/plain part of a message (walk() stops at the first hit)."""
+    if not parsed_msg.is_multipart():
+        return parsed_msg.get_payload(decode=True).decode("utf-8", errors="ignore")
+
+    for part in parsed_msg.walk():
+        if part.get_content_type() == "text/plain":
+            return part.get_payload(decode=True).decode("utf-8", errors="ignore")
+    return ""
+
+
+def _is_mailbox_update(response: bytes) -> bool:
+    """Check whether an untagged IDLE response announces new messages."""
+    return response.startswith(b"*") and (b"EXISTS" in response or b"RECENT" in response)
+
+
+def _read_idle_continuation(conn: imaplib.IMAP4, tag: bytes) -> bool:
+    """Read up to the "+ idling" continuation that confirms IDLE.
+
+    Untagged data (e.g. "* 3 EXISTS") may precede the continuation.
+
+    Returns:
+        True if one of those responses announced new mail
+
+    Raises:
+        IMAPError: If the server answered with a tagged NO/BAD; the command is
+            then complete and the connection stays in sync
+    """
+    has_new_mail = False
+    while not (response := conn.readline()).startswith(b"+"):
+        if not response:
+            raise _IMAP_ABORT("connection closed while entering IDLE")
+        if response.startswith(tag):
+            raise IMAPError(f"IMAP server rejected IDLE: {response!r}")
+        has_new_mail = has_new_mail or _is_mailbox_update(response)
+    return has_new_mail
+
+
+def _wait_for_mailbox_update(conn: imaplib.IMAP4, timeout: float) -> bool:
+    """Read untagged IDLE responses until one announces new mail or timeout elapses."""
+    deadline = time.monotonic() + timeout
+    while (remaining := deadline - time.monotonic()) > 0:
+        # select() cannot see lines imaplib has already buffered
+        if not _has_buffered_input(conn):
+            ready, _, _ = select.select([conn.sock], [], [], remaining)
+            if not ready:
+                break
+        response = conn.readline()
+        if not response:
+            raise _IMAP_ABORT("connection closed while idling")
+        if _is_mailbox_update(response):
+            return True
+    return False
+
+
+def _take_mailbox_updates(conn: imaplib.IMAP4) -> bool:
+    """Pop EXISTS/RECENT responses imaplib stored from earlier commands.
+
+    Returns:
+        True if any were pending, i.e. mail may have arrived since the last search
+    """
+    pending = conn.untagged_responses
+    exists = pending.pop("EXISTS", None)
+    recent = pending.pop("RECENT", None)
+    return bool(exists or recent)
+
+
+def _has_buffered_input(conn: imaplib.IMAP4) -> bool:
+    """Check without blocking whether a server line can be read immediately.
+
+    imaplib reads through a buffered file (and TLS keeps its own record
+    buffer), so data may already sit in user space while the socket itself
+    is not readable.
+    """
+    sock = conn.sock
+    timeout = sock.gettimeout()
+    sock.settimeout(0.0)
+    try:
+        return bool(conn.file.peek(1))
+    except (BlockingIOError, ssl.SSLWantReadError):
+        return False
+    finally:
+        sock.settimeout(timeout)
+
+
+def _parse_internaldate(internaldate: str | None) -> datetime:
+    """Convert an IMAP INTERNALDATE (``17-Jul-1996 02:44:25 -0700``) to a UTC datetime.
+
+    Falls back to the current time when the server omitted the value or sent
+    something unparseable.
+    """
+    if internaldate:
+        with contextlib.suppress(ValueError):
+            return datetime.strptime(internaldate.strip(), "%d-%b-%Y %H:%M:%S %z").astimezone(UTC)
+    return datetime.now(tz=UTC)
@@ -2,22 +2,38 @@
 
 import email
 import email.policy
+import os
 import tempfile
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from src.config import Configuration
+from src.models.message_summary import MessageSummary
 from src.models.pdf_attachment import PDFAttachment
 from src.models.processing_job import ProcessingJob
-from src.services.imap_service import IMAPConnectionError, IMAPError, IMAPService
+from src.services.imap_service import (
+    IMAPConnectionError,
+    IMAPError,
+    IMAPService,
+    MessageParseError,
+)
 from src.services.pdf_converter import PDFConverterService
 from src.services.smtp_service import SMTPService
 from src.services.whitelist_service import WhitelistService
+from src.utils.email_utils import decode_header_value, write_decoded_payload
 from src.utils.file_utils import sanitize_filename
 from src.utils.logging import get_logger
 
 logger = get_logger()
 
+_BYTES_PER_MB = 1024 * 1024
+
+
+class EmailTooLargeError(Exception):
+    """Raised when an incoming email exceeds the configured maximum size."""
+
 
 class JobProcessorService:
     """Service that orchestrates the complete email→PDF→PNG→reply workflow.
@@ -25,6 +41,10 @@ class JobProcessorService:
     Implements FR-003, FR-004, FR-009, FR-012, FR-013, FR-021, FR-022, FR-023, FR-024.
     """
 
+    # Longest stretch the IMAP connection is left silent while polling; kept
+    # below the common 5-minute server/NAT idle timeout
+    KEEPALIVE_INTERVAL_SECONDS = 240
+
     def __init__(
         self,
         config: Configuration,
@@ -47,75 +67,84 @@ class JobProcessorService:
         self.smtp_service = smtp_service
         self.pdf_converter = pdf_converter
         self.whitelist_service = whitelist_service
+        # Deleted messages are expunged once per batch instead of once per message
+        self._expunge_pending = False
+        # MessageSummary objects of accepted unseen messages not processed
+        # yet; refilled with a single search once drained
+        self._queue = deque()
 
-    def process_next_email(self) -> None:
+    def process_next_email(self) -> bool:
         """Process the next unseen email from INBOX.
 
         Workflow per FR-003, FR-004, FR-009, FR-021:
-        1. Fetch unseen messages from IMAP
-        2. For each message:
-           a. Extract PDF attachments
-           b. Convert PDFs to PNGs
-           c. Send reply email with PNG attachments
-           d. Delete original email from INBOX
+        1. When the queue is empty, list unseen messages (headers and sizes
+           only) from IMAP, delete those from non-whitelisted senders and
+           reject oversized ones
+        2. For the next queued message:
+           a. Download it
+           b. Extract PDF attachments
+           c. Convert PDFs to PNGs
+           d. Send reply email with PNG attachments
+           e. Delete original email from INBOX
 
         Sequential processing per FR-022 (one email at a time).
 
         Error handling per FR-012, FR-013:
         - Send error notification email to sender if processing fails
         - Original email NOT deleted if processing fails per NFR-007
+
+        Returns:
+            True if a message was consumed (deleted or flagged as seen), so
+            further unseen messages may be waiting
         """
         try:
-            # Fetch unseen messages
-            messages = self.imap_service.fetch_unseen_messages()
+            if not self._queue:
+                consumed = self._refill_queue()
+                if not self._queue:
+                    # No messages to process (True if some were ignored or rejected)
+                    return consumed
 
-            if not messages:
-                return  # No messages to process
+            # Process one message at a time (sequential processing per FR-022)
+            summary = self._queue.popleft()
 
-            # Process first message only (sequential processing per FR-022)
-            message = messages[0]
+            try:
+                message = self.imap_service.fetch_message(summary.uid)
+            except MessageParseError as e:
+                # Fetching it again would fail the same way; set it aside
+                logger.error("Failed to parse email from %s: %s", summary.sender, e)
+                context = {"Email Subject": summary.subject, "Sender": summary.sender}
+                return self._handle_failure(summary.uid, summary.sender, e, context)
+            if message is None:
+                # Removed by another client since the queue was listed
+                logger.info("Email UID %d vanished before processing", summary.uid)
+                return True
             logger.info("Processing email from %s: %s", message.sender, message.subject)
 
-            # Validate sender against whitelist per FR-002, FR-014
-            if not self.whitelist_service.is_whitelisted(message.sender):
-                # Non-whitelisted sender - ignore silently per FR-014
-                # No processing, no response, no error notification
-                logger.error("Ignored email from non-whitelisted sender: %s", message.sender)
-                # Delete the message to prevent reprocessing
-                self.imap_service.delete_message(message.uid)
-                return
-
             # Create processing job
             job = ProcessingJob(email_message=message)
             job.mark_processing()
 
             try:
-                # Extract PDF attachments from email
-                pdf_attachments = self._extract_pdf_attachments(message)
-
-                if not pdf_attachments:
-                    # No PDFs found - ignore this email (extension of FR-014)
-                    logger.error("No PDF attachments found in email from %s", message.sender)
-                    # Delete email since there's nothing to process
-                    self.imap_service.delete_message(message.uid)
-                    return
-
-                job.pdf_attachments = pdf_attachments
-
-                # Convert all PDFs to PNGs
                 with tempfile.TemporaryDirectory() as tmpdir:
                     temp_path = Path(tmpdir)
 
-                    for pdf in pdf_attachments:
-                        # Write PDF content to temp file
-                        pdf_path = temp_path / pdf.filename
-                        pdf_path.write_bytes(pdf.content)
+                    # Extract PDF attachments from email straight into the temp directory
+                    pdf_attachments = self._extract_pdf_attachments(message, temp_path)
+                    job.release_raw()
+
+                    if not pdf_attachments:
+                        # No PDFs found - ignore this email (extension of FR-014)
+                        logger.error("No PDF attachments found in email from %s", message.sender)
+                        # Delete email since there's nothing to process
+                        self._delete_message(message.uid)
+                        return True
 
-                        # Convert to PNG
-                        png_images = self.pdf_converter.convert_pdf_to_png(
-                            pdf_path=pdf_path, output_prefix=pdf.sanitized_name, temp_dir=temp_path
-                        )
+                    job.pdf_attachments = pdf_attachments
 
+                    # Convert all PDFs to PNGs
+                    for pdf, png_images in zip(
+                        pdf_attachments, self._convert_pdfs(pdf_attachments), strict=True
+                    ):
                         # Update page count
                         pdf.page_count = len(png_images)
 
@@ -150,13 +179,16 @@ class JobProcessorService:
                 logger.info("Successfully processed email from %s", message.sender)
 
                 # Delete original email per FR-021
-                self.imap_service.delete_message(message.uid)
+                self._delete_message(message.uid)
+                return True
 
             except Exception as e:
                 # Mark job as failed
                 job.mark_failed(e)
 
-                # Send error notification per FR-012, FR-013
+                # Log the error per FR-023, FR-024
+                logger.exception("Failed to process email from %s: %s", message.sender, e)
+
                 context = {
                     "Email Subject": message.subject,
                     "PDF Filenames": ", ".join(pdf.filename for pdf in job.pdf_attachments)
@@ -164,59 +196,208 @@ class JobProcessorService:
                     else "None",
                     "Sender": message.sender,
                 }
-
-                try:
-                    self.smtp_service.send_error_notification(
-                        to_address=message.sender, error=e, context=context
-                    )
-                except Exception as smtp_error:
-                    logger.error("Failed to send error notification: %s", smtp_error)
-
-                # Log the error per FR-023, FR-024
-                logger.exception("Failed to process email from %s: %s", message.sender, e)
-
-                # Do NOT delete original email per NFR-007
-                # Email remains in INBOX for manual recovery
+                return self._handle_failure(message.uid, message.sender, e, context)
 
         except Exception as e:
             # Fatal error in email fetching
             logger.exception("Failed to fetch or process emails: %s", e)
             raise
 
-    def _extract_pdf_attachments(self, message) -> list[PDFAttachment]:
-        """Extract PDF attachments from email message.
+    def _refill_queue(self) -> bool:
+        """List unseen messages and queue the ones to process.
+
+        Messages from non-whitelisted senders are ignored silently per
+        FR-002, FR-014 (no processing, no response, no error notification)
+        and deleted with a single UID STORE so they are not listed again.
+        Oversized messages, and messages whose size the server did not
+        report, are refused before they are downloaded, so peak memory is
+        bounded by the configured limit rather than by the sender. Messages
+        with unreadable headers are flagged as seen so they are not listed
+        again.
+
+        Returns:
+            True if any message was deleted, rejected or set aside
+        """
+        max_size_bytes = self.config.max_email_size_mb * _BYTES_PER_MB
+        ignored = []
+        rejected = False
+        for summary in self.imap_service.fetch_unseen_summaries():
+            if summary.header_error is not None:
+                rejected = self._set_aside_unreadable(summary) or rejected
+            elif not self.whitelist_service.is_whitelisted(summary.sender):
+                logger.error("Ignored email from non-whitelisted sender: %s", summary.sender)
+                ignored.append(summary.uid)
+            elif summary.size_bytes is None or summary.size_bytes > max_size_bytes:
+                rejected = self._reject_oversized(summary) or rejected
+            else:
+                self._queue.append(summary)
+
+        if ignored:
+            self.imap_service.delete_messages(ignored, expunge=False)
+            self._expunge_pending = True
+        return bool(ignored) or rejected
+
+    def _reject_oversized(self, summary: MessageSummary) -> bool:
+        """Notify the sender that an email is too large, without downloading it.
+
+        An email whose size the server did not report is refused as well,
+        since the cap could not be enforced.
+
+        Returns:
+            True if the email was flagged as seen
+        """
+        limit = f"the maximum is {self.config.max_email_size_mb} MB"
+        if summary.size_bytes is None:
+            error = EmailTooLargeError(f"Email size could not be determined; {limit}")
+        else:
+            error = EmailTooLargeError(
+                f"Email is {summary.size_bytes / _BYTES_PER_MB:.1f} MB; {limit}"
+            )
+        logger.error("Rejected email from %s: %s", summary.sender, error)
+        context = {"Email Subject": summary.subject, "Sender": summary.sender}
+        return self._handle_failure(summary.uid, summary.sender, error, context)
+
+    def _set_aside_unreadable(self, summary: MessageSummary) -> bool:
+        """Flag an email whose headers cannot be read as seen, without downloading it.
+
+        Returns:
+            True if the email was flagged as seen
+        """
+        error = MessageParseError(
+            f"Unreadable headers in message UID {summary.uid}: {summary.header_error}"
+        )
+        logger.error("Set aside email UID %d: %s", summary.uid, error)
+        context = {"Email Subject": summary.subject, "Sender": summary.sender}
+        return self._handle_failure(summary.uid, summary.sender, error, context)
+
+    def _handle_failure(
+        self, uid: int, sender: str, error: Exception, context: dict[str, str]
+    ) -> bool:
+        """Notify the sender of a failed email and keep it for manual recovery.
+
+        Sends the error notification per FR-012, FR-013. The email is NOT
+        deleted per NFR-007: it remains in INBOX, flagged as seen so the next
+        poll does not pick it up (and notify) again.
+
+        Args:
+            uid: IMAP UID of the failed email
+            sender: Address the notification is sent to (empty if unknown:
+                the email is only flagged)
+            error: Why processing failed
+            context: Details included in the notification
+
+        Returns:
+            True if the email was flagged as seen
+        """
+        if sender:
+            try:
+                self.smtp_service.send_error_notification(
+                    to_address=sender, error=error, context=context
+                )
+            except Exception as smtp_error:
+                logger.error("Failed to send error notification: %s", smtp_error)
+
+        try:
+            self.imap_service.mark_seen(uid)
+        except Exception as imap_error:
+            logger.error("Failed to mark email UID %d as seen: %s", uid, imap_error)
+            return False
+        return True
+
+    def _convert_pdfs(self, pdf_attachments: list[PDFAttachment]) -> list:
+        """Convert PDF attachments to PNGs concurrently.
+
+        Each conversion is a separate ``magick`` process, so threads are enough
+        to run them in parallel; at most PDF_MAX_CONCURRENCY (default: one per
+        CPU core) run at once, since each process holds its own pixel cache.
+        Every PDF was extracted into its own subdirectory, which also receives
+        its PNGs, keeping the output globs of concurrent conversions apart.
+
+        Args:
+            pdf_attachments: PDFs extracted from the email
+
+        Returns:
+            One list of PNGImage objects per PDF, in attachment order
+        """
+
+        def convert(pdf: PDFAttachment) -> list:
+            return self.pdf_converter.convert_pdf_to_png(
+                pdf_path=pdf.path, output_prefix=pdf.sanitized_name, temp_dir=pdf.path.parent
+            )
+
+        limit = self.config.pdf_max_concurrency or os.cpu_count() or 1
+        workers = min(len(pdf_attachments), limit)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(convert, pdf_attachments))
+
+    def _delete_message(self, uid: int) -> None:
+        """Flag a message as deleted, deferring the EXPUNGE to flush_deletions()."""
+        self.imap_service.delete_message(uid, expunge=False)
+        self._expunge_pending = True
+
+    def flush_deletions(self) -> None:
+        """Expunge messages deleted since the last flush in a single round-trip."""
+        if self._expunge_pending:
+            self.imap_service.expunge()
+            self._expunge_pending = False
+
+    def _extract_pdf_attachments(self, message, temp_path: Path) -> list[PDFAttachment]:
+        """Extract PDF attachments from email message to disk.
+
+        Each PDF is decoded directly into its own subdirectory of
+        ``temp_path``, so attachment contents are never held in memory whole.
 
         Args:
             message: EmailMessage object
+            temp_path: Temporary directory for the job
 
         Returns:
             List of PDFAttachment objects
+
+        Raises:
+            ValueError: If the message was already released
         """
-        parsed_msg = email.message_from_bytes(message.raw_bytes, policy=email.policy.default)
+        # Reuse the tree parsed at fetch time; parse only if it was not kept
+        parsed_msg = message.parsed
+        if parsed_msg is None:
+            if message.raw_bytes is None:
+                raise ValueError(f"Email UID {message.uid} was released before extraction")
+            parsed_msg = email.message_from_bytes(message.raw_bytes, policy=email.policy.compat32)
 
         pdf_attachments = []
 
         # Iterate through email parts
-        for part in parsed_msg.walk():
+        for index, part in enumerate(parsed_msg.walk()):
             # Check if this is an attachment
-            if part.get_content_disposition() == "attachment":
-                filename = part.get_filename()
-
-                # Check if PDF file
-                if filename and filename.lower().endswith(".pdf"):
-                    content = part.get_payload(decode=True)
-
-                    if content:
-                        sanitized_name = sanitize_filename(filename)
-
-                        pdf_attachments.append(
-                            PDFAttachment(
-                                filename=filename,
-                                sanitized_name=sanitized_name,
-                                content=content,
-                                size_bytes=len(content),
-                            )
-                        )
+            if part.get_content_disposition() != "attachment":
+                continue
+
+            filename = part.get_filename()
+            if filename:
+                filename = decode_header_value(filename)
+
+            # Check if PDF file
+            if not (filename and filename.lower().endswith(".pdf")):
+                continue
+
+            pdf_dir = temp_path / str(index)
+            pdf_dir.mkdir()
+            # Drop any directory components the sender put in the filename
+            pdf_path = pdf_dir / Path(filename).name
+
+            with pdf_path.open("wb") as f:
+                # Oversized PDFs are cut short here and rejected by PDFAttachment
+                size_bytes = write_decoded_payload(part, f, PDFAttachment.MAX_SIZE_BYTES)
+
+            if size_bytes:
+                pdf_attachments.append(
+                    PDFAttachment(
+                        filename=filename,
+                        sanitized_name=sanitize_filename(filename),
+                        path=pdf_path,
+                        size_bytes=size_bytes,
+                    )
+                )
 
         return pdf_attachments
 
@@ -229,19 +410,30 @@ class JobProcessorService:
         3. IMAP connection recovery with exponential backoff per FR-027
         4. Runs indefinitely per NFR-011
 
+        When the server supports IDLE the loop blocks until new mail is pushed
+        instead of sleeping; polling remains the fallback.
+
         The daemon will continue running even if:
         - IMAP connection is lost (reconnects with backoff)
         - Individual email processing fails (logs error, continues)
         - SMTP errors occur (logs error, continues)
         """
         while True:
+            processed = False
             try:
                 # Process next email
-                self.process_next_email()
+                processed = self.process_next_email()
+                if not processed:
+                    # Batch finished - expunge everything deleted during it
+                    self.flush_deletions()
 
             except (IMAPConnectionError, IMAPError) as e:
                 # IMAP connection lost - reconnect with backoff per FR-027
-                logger.error("IMAP connection error: %s. Attempting reconnection with backoff...", e)
+                logger.error(
+                    "IMAP connection error: %s. Attempting reconnection with backoff...", e
+                )
+                # Re-list the INBOX after reconnecting rather than trusting queued UIDs
+                self._queue.clear()
                 self.imap_service.disconnect()
                 try:
                     self.imap_service.connect_with_backoff()
@@ -258,5 +450,42 @@ class JobProcessorService:
                 # Log error but keep running per NFR-011
                 logger.exception("Error in daemon loop: %s", e)
 
-            # Sleep for polling interval per FR-001
-            time.sleep(self.config.polling_interval_seconds)
+            # Drain remaining unseen messages before waiting for new ones
+            if processed:
+                continue
+
+            self._wait_for_new_mail()
+
+    def _wait_for_new_mail(self) -> None:
+        """Wait until new mail may be available.
+
+        Uses IMAP IDLE when the server supports it; otherwise (or if IDLE
+        fails) sleeps for the polling interval per FR-001.
+        """
+        if self.imap_service.supports_idle():
+            try:
+                self.imap_service.idle()
+                return
+            except IMAPError as e:
+                logger.warning("IMAP IDLE failed, falling back to polling: %s", e)
+
+        self._sleep_with_keepalive(self.config.polling_interval_seconds)
+
+    def _sleep_with_keepalive(self, seconds: float) -> None:
+        """Sleep for the polling interval, sending IMAP NOOPs during long waits.
+
+        A failed NOOP ends the wait early; the next poll then hits the
+        dropped connection and goes through the normal reconnect path.
+        """
+        remaining = seconds
+        while remaining > 0:
+            chunk = min(remaining, self.KEEPALIVE_INTERVAL_SECONDS)
+            time.sleep(chunk)
+            remaining -= chunk
+
+            if remaining > 0:
+                try:
+                    self.imap_service.noop()
+                except IMAPError as e:
+                    logger.warning("IMAP keepalive failed: %s", e)
+                    return
@@ -1,5 +1,8 @@
 """PDF to PNG conversion service using ImageMagick."""
 
+import dataclasses
+import os
+import re
 import subprocess
 from pathlib import Path
 
@@ -9,6 +12,24 @@ from src.utils.logging import get_logger
 
 logger = get_logger()
 
+# Trailing part of ImageMagick's stderr quoted in conversion errors
+_STDERR_TAIL_BYTES = 4096
+
+# Keywords in ImageMagick's stderr that identify the failure, checked in this order
+_PASSWORD_ERROR_RE = re.compile(rb"password|encrypted", re.IGNORECASE)
+_CORRUPTED_ERROR_RE = re.compile(rb"corrupt|invalid|error", re.IGNORECASE)
+
+# Settings used without a Configuration, read from its field defaults so the
+# two cannot drift apart
+_CONFIG_DEFAULTS = {field.name: field.default for field in dataclasses.fields(Configuration)}
+_DEFAULT_RESOLUTION: tuple[int, int] = (
+    _CONFIG_DEFAULTS["pdf_resolution_width"],
+    _CONFIG_DEFAULTS["pdf_resolution_height"],
+)
+_DEFAULT_DPI: int = _CONFIG_DEFAULTS["pdf_density_dpi"]
+_DEFAULT_BACKGROUND: str = _CONFIG_DEFAULTS["pdf_background"]
+_DEFAULT_TIMEOUT_SECONDS: int = _CONFIG_DEFAULTS["pdf_conversion_timeout_seconds"]
+
 
 class PDFConversionError(Exception):
     """Base exception for PDF conversion errors."""
@@ -36,16 +57,31 @@ class PDFConverterService:
         Args:
             config: Optional Configuration instance. When None, defaults are used.
         """
-        if config is not None:
+        if config is None:
+            self.target_resolution = _DEFAULT_RESOLUTION
+            self.target_dpi = _DEFAULT_DPI
+            self.background = _DEFAULT_BACKGROUND
+            self.timeout = _DEFAULT_TIMEOUT_SECONDS
+        else:
             self.target_resolution = (config.pdf_resolution_width, config.pdf_resolution_height)
             self.target_dpi = config.pdf_density_dpi
             self.background = config.pdf_background
             self.timeout = config.pdf_conversion_timeout_seconds
-        else:
-            self.target_resolution = (1920, 1080)
-            self.target_dpi = 300
-            self.background = "white"
-            self.timeout = 120
+
+        # Only the input file and output pattern vary between conversions;
+        # the arguments around them are built once here
+        self._input_args = ("magick", "-density", str(self.target_dpi))
+        geometry = f"{self.target_resolution[0]}x{self.target_resolution[1]}!"
+        self._output_args = (
+            "-resize",
+            geometry,
+            "-extent",
+            geometry,
+            "-gravity",
+            "center",
+            "-background",
+            self.background,
+        )
 
     def convert_pdf_to_png(
         self, pdf_path: Path, output_prefix: str, temp_dir: Path
@@ -73,52 +109,45 @@ class PDFConverterService:
 
         # Build ImageMagick command
         cmd = [
-            "magick",
-            "-density",
-            str(self.target_dpi),  # Set DPI for PDF reading
+            *self._input_args,  # -density sets the DPI for PDF reading
             str(pdf_path),
-            "-resize",
-            f"{self.target_resolution[0]}x{self.target_resolution[1]}!",
-            "-extent",
-            f"{self.target_resolution[0]}x{self.target_resolution[1]}!",
-            "-gravity",
-            "center",
-            "-background",
-            self.background,
+            *self._output_args,
             str(output_pattern),
         ]
 
+        # Keep ImageMagick's pixel cache and Ghostscript's scratch files in the
+        # job directory so they count against it and are removed with it
+        env = {**os.environ, "MAGICK_TEMPORARY_PATH": str(temp_dir), "TMPDIR": str(temp_dir)}
+
         try:
+            # stdout is unused; stderr stays bytes since it is only scanned for
+            # ASCII keywords and quoted (tail only) on failure
             result = subprocess.run(
                 cmd,
-                capture_output=True,
-                text=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 timeout=self.timeout,
                 check=False,  # Don't raise exception, we'll handle errors manually
+                env=env,
             )
 
             # Check for specific error patterns
             if result.returncode != 0:
-                stderr_lower = result.stderr.lower()
+                stderr_tail = _decode_tail(result.stderr)
 
                 # Check for password protection
-                if "password" in stderr_lower or "encrypted" in stderr_lower:
+                if _PASSWORD_ERROR_RE.search(result.stderr):
                     raise PDFPasswordProtectedError(
-                        f"PDF is password-protected or encrypted: {result.stderr}"
+                        f"PDF is password-protected or encrypted: {stderr_tail}"
                     )
 
                 # Check for corruption
-                if (
-                    "corrupt" in stderr_lower
-                    or "invalid" in stderr_lower
-                    or "error" in stderr_lower
-                ):
-                    raise PDFCorruptedError(f"PDF is corrupted or malformed: {result.stderr}")
+                if _CORRUPTED_ERROR_RE.search(result.stderr):
+                    raise PDFCorruptedError(f"PDF is corrupted or malformed: {stderr_tail}")
 
                 # Generic conversion error
                 raise PDFConversionError(
-                    f"ImageMagick conversion failed "
-                    f"(exit code {result.returncode}): {result.stderr}"
+                    f"ImageMagick conversion failed (exit code {result.returncode}): {stderr_tail}"
                 )
 
         except subprocess.TimeoutExpired as e:
@@ -130,31 +159,47 @@ class PDFConverterService:
                 "ImageMagick 'magick' command not found. Is ImageMagick installed?"
             ) from e
 
-        # Find all generated PNG files
-        png_files = sorted(temp_dir.glob(f"{output_prefix}_pdf-*.png"))
+        # Find all generated PNG files with a single directory read; page
+        # numbers are zero-padded, so ordering by (length, name) keeps pages
+        # in sequence beyond 999
+        name_prefix = f"{output_prefix}_pdf-"
+        with os.scandir(temp_dir) as it:
+            png_entries = sorted(
+                (e for e in it if e.name.startswith(name_prefix) and e.name.endswith(".png")),
+                key=lambda e: (len(e.name), e.name),
+            )
 
-        if not png_files:
+        if not png_entries:
             raise PDFConversionError(
                 f"No PNG files generated from PDF: {pdf_path}. PDF may be empty or have 0 pages."
             )
 
         # Create PNGImage objects for each generated file
         png_images = []
-        for idx, png_path in enumerate(png_files, start=1):
-            # Extract page number from filename (e.g., "prefix_pdf-002.png" → page 3)
-            # The %03d format means: 000 → page 1, 001 → page 2, etc.
-            page_number = idx  # Sequential numbering
-
+        for page_number, entry in enumerate(png_entries, start=1):
+            # The %03d output index starts at 000, so page numbers are sequential from 1
             png_images.append(
                 PNGImage(
-                    path=png_path,
-                    filename=png_path.name,
+                    path=Path(entry.path),
+                    filename=entry.name,
                     source_pdf=pdf_path.name,
                     page_number=page_number,
-                    size_bytes=png_path.stat().st_size,
+                    size_bytes=entry.stat().st_size,
                     resolution=self.target_resolution,
                     density_dpi=self.target_dpi,
+                    validate_fs=False,
                 )
             )
 
         return png_images
+
+
+def _decode_tail(stderr: bytes) -> str:
+    """Decode the last _STDERR_TAIL_BYTES of tool output for an error message.
+
+    Noisy PDFs can make Ghostscript emit thousands of warning lines; the
+    final lines carry the actual failure.
+    """
+    tail = stderr[-_STDERR_TAIL_BYTES:]
+    text = tail.decode("utf-8", errors="replace").strip()
+    return f"...{text}" if len(stderr) > _STDERR_TAIL_BYTES else text
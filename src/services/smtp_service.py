@@ -1,20 +1,59 @@
 """SMTP service for sending emails with attachments."""
 
+import base64
 import contextlib
+import re
 import smtplib
 import ssl
+import time
 import traceback
-from email import encoders
+from collections.abc import Iterable, Iterator
+from email import policy as email_policy
 from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
 from src.config import Configuration
 from src.models.png_image import PNGImage
-from src.utils.logging import get_logger
+from src.utils.logging import TRACEBACK_LIMIT, get_logger
 
 logger = get_logger()
 
+# Serialize with CRLF line endings as required on the wire (RFC 5321)
+_SMTP_POLICY = email_policy.compat32.clone(linesep="\r\n")
+
+# SMTP reply codes checked while streaming a message (RFC 5321 section 4.2)
+_SMTP_OK = 250
+_SMTP_WILL_FORWARD = 251
+_SMTP_START_MAIL_INPUT = 354
+
+# Fixed parts of the error notification body (FR-012, FR-013)
+_RULE = "-" * 60
+_ERROR_HEADER = "An error occurred while processing your PDF attachment.\n"
+_ERROR_FOOTER = "\n".join(
+    [
+        "",
+        "Please verify your PDF file is:",
+        "- Not corrupted or malformed",
+        "- Not password-protected or encrypted",
+        "- A valid PDF document",
+        "",
+        "If the problem persists, please contact support.",
+    ]
+)
+
+# Raw bytes base64-encoded per step; a multiple of 57 so each step yields
+# whole 76-character lines
+_BASE64_READ_SIZE = 57 * 1024
+
+# Allowance per attachment for its part headers and boundary line
+_PART_OVERHEAD_BYTES = 512
+_BYTES_PER_MB = 1024 * 1024
+
+# Lines starting with "." must be doubled inside SMTP DATA; base64 lines never
+# start with one, so only headers and body text are scanned
+_LEADING_DOT_RE = re.compile(rb"^\.", re.MULTILINE)
+
 
 class SMTPError(Exception):
     """Base exception for SMTP operations."""
@@ -35,6 +74,9 @@ class SMTPService:
     """
 
     MAX_SEND_RETRIES = 2
+    # Idle time after which the connection is probed with NOOP before a send;
+    # kept below the common 5-minute server/NAT idle timeout
+    IDLE_CHECK_SECONDS = 240
 
     def __init__(self, config: Configuration) -> None:
         """Initialize SMTP service with configuration.
@@ -44,6 +86,8 @@ class SMTPService:
         """
         self.config = config
         self.connection: smtplib.SMTP | None = None
+        # Monotonic time the connection was last known to be working
+        self._last_activity = time.monotonic()
 
     def connect(self) -> None:
         """Establish SMTP connection with TLS fallback per FR-025, FR-026.
@@ -67,6 +111,7 @@ class SMTPService:
         try:
             self.connection = smtplib.SMTP_SSL(host, port, timeout=timeout)
             self.connection.login(username, password)
+            self._last_activity = time.monotonic()
             logger.info("SMTP connected via SSL to %s:%d", host, port)
             return
         except ssl.SSLError:
@@ -84,6 +129,7 @@ class SMTPService:
             with contextlib.suppress(Exception):
                 self.connection.starttls()
             self.connection.login(username, password)
+            self._last_activity = time.monotonic()
             logger.info("SMTP connected via STARTTLS to %s:%d", host, port)
             return
         except smtplib.SMTPAuthenticationError as e:
@@ -101,6 +147,13 @@ class SMTPService:
     ) -> None:
         """Send reply email with PNG attachments per FR-009, FR-010, FR-011, FR-020.
 
+        When there are more attachments than ``config.attachments_per_email``,
+        or their encoded size exceeds ``config.max_reply_size_mb``, they are
+        split across several replies whose subjects are suffixed ``(1/K)``,
+        ``(2/K)``, ... so no single message grows past what receiving servers
+        accept. Parts are sent in order over the same connection; if one
+        fails, the parts before it have already been sent.
+
         Args:
             to_address: Recipient email address
             subject: Email subject
@@ -111,7 +164,55 @@ class SMTPService:
         Raises:
             SMTPError: If email sending fails
         """
-        # Create multipart message
+        batches = self._batch_attachments(attachments)
+        if len(batches) <= 1:
+            self._send_reply(to_address, subject, body, attachments, cc_addresses)
+            return
+
+        for number, batch in enumerate(batches, start=1):
+            self._send_reply(
+                to_address, f"{subject} ({number}/{len(batches)})", body, batch, cc_addresses
+            )
+
+    def _batch_attachments(self, attachments: list[PNGImage]) -> list[list[PNGImage]]:
+        """Group attachments into replies, keeping their order.
+
+        A reply is closed once it holds ``attachments_per_email`` images or
+        the next image would push its base64-encoded size past
+        ``max_reply_size_mb``. An image too large on its own still gets a
+        reply by itself.
+
+        Args:
+            attachments: PNG images in reply order
+
+        Returns:
+            Non-empty batches of attachments (a single empty batch if none)
+        """
+        max_count = self.config.attachments_per_email
+        max_bytes = self.config.max_reply_size_mb * _BYTES_PER_MB
+
+        batches = [[]]
+        batch_bytes = 0
+        for png in attachments:
+            encoded_bytes = _encoded_part_size(png)
+            batch = batches[-1]
+            if batch and (len(batch) >= max_count or batch_bytes + encoded_bytes > max_bytes):
+                batches.append([])
+                batch_bytes = 0
+            batches[-1].append(png)
+            batch_bytes += encoded_bytes
+        return batches
+
+    def _send_reply(
+        self,
+        to_address: str,
+        subject: str,
+        body: str,
+        attachments: list[PNGImage],
+        cc_addresses: list[str] | None,
+    ) -> None:
+        """Send a single reply email carrying the given attachments."""
+        # Create multipart message; attachments are added while streaming
         msg = MIMEMultipart()
         msg["From"] = self.config.smtp_username
         msg["To"] = to_address
@@ -124,29 +225,22 @@ class SMTPService:
         # Attach body text
         msg.attach(MIMEText(body, "plain"))
 
-        # Attach PNG files
-        for png in attachments:
-            with png.path.open("rb") as f:
-                part = MIMEBase("image", "png")
-                part.set_payload(f.read())
-
-            # Encode in base64
-            encoders.encode_base64(part)
-
-            # Add header with filename
-            part.add_header("Content-Disposition", f"attachment; filename= {png.filename}")
-
-            msg.attach(part)
-
         # Build recipient list (To + CC)
         recipients = [to_address]
         if cc_addresses:
             recipients.extend(cc_addresses)
 
+        # Upper bound for the ESMTP SIZE parameter: body and headers plus the parts
+        size_estimate = (
+            len(body.encode())
+            + _PART_OVERHEAD_BYTES
+            + sum(_encoded_part_size(png) for png in attachments)
+        )
+
         # Send email with reconnection retry
         self._send_with_retry(
-            lambda: self.connection.sendmail(
-                self.config.smtp_username, recipients, msg.as_string()
+            lambda: self._send_streamed(
+                recipients, _iter_message_chunks(msg, attachments), size_estimate
             ),
             error_context=f"send reply email to {to_address}",
         )
@@ -156,6 +250,10 @@ class SMTPService:
     ) -> None:
         """Send error notification email with detailed stack trace per FR-012, FR-013.
 
+        The stack trace is taken from ``error`` itself, limited to its
+        innermost frames, so the notification does not depend on being sent
+        from inside the ``except`` block that caught it.
+
         Args:
             to_address: Recipient email address (original sender)
             error: The exception that occurred
@@ -168,55 +266,104 @@ class SMTPService:
         # Build error email subject
         subject = f"Error processing your PDF: {type(error).__name__}"
 
-        # Build detailed error body
+        # Build detailed error body around the fixed header and footer text
         body_parts = [
-            "An error occurred while processing your PDF attachment.",
-            "",
+            _ERROR_HEADER,
             f"Error Type: {type(error).__name__}",
             f"Error Message: {error!s}",
             "",
             "Technical Details:",
-            "-" * 60,
-            traceback.format_exc(),
-            "-" * 60,
+            _RULE,
+            "".join(traceback.format_exception(error, limit=-TRACEBACK_LIMIT)),
+            _RULE,
         ]
 
         # Add context information if provided
         if context:
-            body_parts.extend(["", "Email Context:", "-" * 60])
-            for key, value in context.items():
-                body_parts.append(f"{key}: {value}")
-            body_parts.append("-" * 60)
-
-        body_parts.extend(
-            [
-                "",
-                "Please verify your PDF file is:",
-                "- Not corrupted or malformed",
-                "- Not password-protected or encrypted",
-                "- A valid PDF document",
-                "",
-                "If the problem persists, please contact support.",
-            ]
-        )
+            body_parts.extend(["", "Email Context:", _RULE])
+            body_parts.extend(f"{key}: {value}" for key, value in context.items())
+            body_parts.append(_RULE)
 
-        body = "\n".join(body_parts)
+        body_parts.append(_ERROR_FOOTER)
 
-        # Create and send error email
-        msg = MIMEMultipart()
+        # Create and send error email; a single text part needs no multipart wrapper
+        msg = MIMEText("\n".join(body_parts), "plain")
         msg["From"] = self.config.smtp_username
         msg["To"] = to_address
         msg["Subject"] = subject
-        msg.attach(MIMEText(body, "plain"))
+
+        # Serialized straight to CRLF bytes, as on the reply path, instead of
+        # building a str that sendmail() would re-scan and encode
+        data = msg.as_bytes(policy=_SMTP_POLICY)
 
         # Send error email with reconnection retry
         self._send_with_retry(
-            lambda: self.connection.sendmail(
-                self.config.smtp_username, [to_address], msg.as_string()
-            ),
+            lambda: self.connection.sendmail(self.config.smtp_username, [to_address], data),
             error_context=f"send error notification to {to_address}",
         )
 
+    def _send_streamed(
+        self, recipients: list[str], chunks: Iterable[bytes], size_estimate: int
+    ) -> None:
+        """Send a message over SMTP DATA chunk by chunk.
+
+        ``sendmail()`` needs the complete message as one string, which for a
+        reply with many PNGs means holding every encoded attachment at once.
+        Writing each chunk to the socket as it is produced keeps only one
+        attachment in memory.
+
+        Args:
+            recipients: Envelope recipient addresses
+            chunks: CRLF-terminated, already dot-stuffed message lines,
+                grouped into chunks
+            size_estimate: Message size announced with ESMTP SIZE (RFC 1870)
+                when the server supports it, as sendmail() would
+
+        Raises:
+            smtplib.SMTPException: If the server rejects the envelope or data
+        """
+        conn = self.connection
+        from_addr = self.config.smtp_username
+
+        conn.ehlo_or_helo_if_needed()
+        mail_options = [f"SIZE={size_estimate}"] if conn.has_extn("size") else []
+        code, resp = conn.mail(from_addr, mail_options)
+        if code != _SMTP_OK:
+            _reset(conn)
+            raise smtplib.SMTPSenderRefused(code, resp, from_addr)
+
+        refused = {}
+        for recipient in recipients:
+            code, resp = conn.rcpt(recipient)
+            if code not in (_SMTP_OK, _SMTP_WILL_FORWARD):
+                refused[recipient] = (code, resp)
+        if len(refused) == len(recipients):
+            _reset(conn)
+            raise smtplib.SMTPRecipientsRefused(refused)
+        for recipient, (code, resp) in refused.items():
+            logger.warning("SMTP server refused recipient %s: %d %s", recipient, code, resp)
+
+        code, resp = conn.docmd("data")
+        if code != _SMTP_START_MAIL_INPUT:
+            _reset(conn)
+            raise smtplib.SMTPDataError(code, resp)
+
+        try:
+            for chunk in chunks:
+                conn.send(chunk)
+            conn.send(b".\r\n")
+        except Exception:
+            # Still inside DATA, where QUIT would only extend the message body
+            # (and then wait out the timeout); drop the socket instead
+            with contextlib.suppress(Exception):
+                conn.close()
+            self.connection = None
+            raise
+
+        code, resp = conn.getreply()
+        if code != _SMTP_OK:
+            raise smtplib.SMTPDataError(code, resp)
+
     def _send_with_retry(self, send_fn, *, error_context: str) -> None:
         """Execute a send operation with automatic reconnection on failure.
 
@@ -235,10 +382,12 @@ class SMTPService:
 
         for attempt in range(1, self.MAX_SEND_RETRIES + 1):
             try:
+                self._drop_if_stale()
                 if not self.connection:
                     logger.info("SMTP connection not active, reconnecting...")
                     self.connect()
                 send_fn()
+                self._last_activity = time.monotonic()
                 if attempt > 1:
                     logger.info("SMTP send succeeded on attempt %d", attempt)
                 return
@@ -258,6 +407,30 @@ class SMTPService:
         logger.error("Failed to %s after %d attempts", error_context, self.MAX_SEND_RETRIES)
         raise SMTPError(f"Failed to {error_context}: {last_error}") from last_error
 
+    def _drop_if_stale(self) -> None:
+        """Probe a connection that has been idle too long and drop it if dead.
+
+        Servers commonly close idle sessions after a few minutes; finding out
+        with a NOOP is cheaper than failing partway through streaming a reply.
+        """
+        if not self.connection:
+            return
+        if time.monotonic() - self._last_activity <= self.IDLE_CHECK_SECONDS:
+            return
+
+        try:
+            code, resp = self.connection.noop()
+            if code != _SMTP_OK:
+                raise smtplib.SMTPResponseException(code, resp)
+        except (smtplib.SMTPException, OSError) as e:
+            logger.info("Idle SMTP connection is no longer usable, reconnecting: %s", e)
+            # The peer is gone, so skip QUIT and just close the socket
+            with contextlib.suppress(Exception):
+                self.connection.close()
+            self.connection = None
+        else:
+            self._last_activity = time.monotonic()
+
     def disconnect(self) -> None:
         """Close SMTP connection gracefully."""
         if self.connection:
@@ -268,3 +441,59 @@ class SMTPService:
                 pass
             finally:
                 self.connection = None
+
+
+def _encoded_part_size(png: PNGImage) -> int:
+    """Estimate the bytes a PNG attachment part adds to a message."""
+    # base64 turns every 57 raw bytes into a 76-character line plus CRLF
+    return (png.size_bytes + 56) // 57 * 78 + _PART_OVERHEAD_BYTES
+
+
+def _iter_message_chunks(msg: MIMEMultipart, attachments: list[PNGImage]) -> Iterator[bytes]:
+    """Serialize a multipart message, appending PNG attachments one at a time.
+
+    The message is flattened without the attachments first; each PNG is then
+    base64-encoded straight from its file in fixed-size blocks, followed by
+    the closing boundary. Neither the raw nor the encoded image is ever held
+    in memory whole.
+
+    Args:
+        msg: Multipart message holding the headers and body text
+        attachments: PNG images to append as attachments
+
+    Yields:
+        CRLF-terminated chunks of the serialized message, dot-stuffed for
+        SMTP DATA
+    """
+    skeleton = msg.as_bytes(policy=_SMTP_POLICY)
+    # The generator picks a boundary that does not clash with the body text
+    delimiter = b"--" + msg.get_boundary().encode("ascii")
+    closing = delimiter + b"--\r\n"
+    # Dot-stuffing per RFC 5321 section 4.5.2
+    yield _LEADING_DOT_RE.sub(b"..", skeleton.removesuffix(closing))
+
+    # One read buffer for every block of every attachment
+    buffer = bytearray(_BASE64_READ_SIZE)
+    view = memoryview(buffer)
+
+    for png in attachments:
+        part = MIMEBase("image", "png")
+        part["Content-Transfer-Encoding"] = "base64"
+
+        # Add header with filename
+        part.add_header("Content-Disposition", f"attachment; filename= {png.filename}")
+
+        # Part headers and the blank line that ends them
+        yield delimiter + b"\r\n" + part.as_bytes(policy=_SMTP_POLICY)
+
+        with png.path.open("rb") as f:
+            while size := f.readinto(buffer):
+                yield base64.encodebytes(view[:size]).replace(b"\n", b"\r\n")
+
+    yield closing
+
+
+def _reset(conn: smtplib.SMTP) -> None:
+    """Abort the current SMTP transaction, ignoring a dead connection."""
+    with contextlib.suppress(smtplib.SMTPServerDisconnected):
+        conn.rset()
@@ -1,11 +1,25 @@
 """Whitelist service for sender validation."""
 
+import functools
 import re
 
+from src.config import compile_whitelist_pattern
+
+# ".*@" followed by a literal domain with every dot escaped, e.g. .*@company\.com
+_DOMAIN_SUFFIX_PATTERN_RE = re.compile(r"\.\*@((?:[A-Za-z0-9-]|\\[.-])+)")
+_REGEX_ESCAPE_RE = re.compile(r"\\(.)")
+
 
 class WhitelistService:
     """Service for validating email senders against a whitelist regex per FR-002, FR-019."""
 
+    # Distinct senders remembered per service instance
+    MATCH_CACHE_SIZE = 1024
+
+    # Longest address RFC 5321 permits; anything longer is rejected before the
+    # regex runs, which also caps backtracking on hostile From headers
+    MAX_ADDRESS_LENGTH = 254
+
     def __init__(self, regex_pattern: str) -> None:
         """Initialize whitelist service with regex pattern.
 
@@ -19,20 +33,53 @@ class WhitelistService:
 
         # Compile and validate regex
         try:
-            self.compiled_pattern = re.compile(regex_pattern)
+            self.compiled_pattern = compile_whitelist_pattern(regex_pattern)
         except re.error as e:
             raise ValueError(f"Invalid regex pattern: {e}") from e
 
+        # The common "anyone at this domain" pattern is a plain suffix test
+        suffix_match = _DOMAIN_SUFFIX_PATTERN_RE.fullmatch(regex_pattern)
+        self._domain_suffix = (
+            "@" + _REGEX_ESCAPE_RE.sub(r"\1", suffix_match.group(1)).lower()
+            if suffix_match
+            else None
+        )
+
+        # Per-instance cache so repeat senders skip the regex engine
+        self._matches = functools.lru_cache(maxsize=self.MATCH_CACHE_SIZE)(self._fullmatch)
+
     def is_whitelisted(self, email_address: str) -> bool:
         """Check if email address matches whitelist pattern per FR-002.
 
+        The pattern must match the whole address, so ``.*@company\\.com``
+        does not accept ``user@company.com.evil.org``. Matching is
+        case-insensitive for ASCII letters, as mail servers treat addresses;
+        classes such as ``\\w`` match ASCII characters only.
+
+        Addresses longer than MAX_ADDRESS_LENGTH cannot be valid and are
+        rejected without running the pattern.
+
         Args:
             email_address: Email address to validate
 
         Returns:
             True if address matches whitelist pattern, False otherwise
         """
-        if not email_address:
+        if not email_address or len(email_address) > self.MAX_ADDRESS_LENGTH:
             return False
 
-        return self.compiled_pattern.match(email_address) is not None
+        # Lowercase once so differently-cased spellings share one cache entry;
+        # str.lower() folds non-ASCII look-alikes too, so only ASCII is lowered
+        if email_address.isascii():
+            email_address = email_address.lower()
+        return self._matches(email_address)
+
+    def _fullmatch(self, email_address: str) -> bool:
+        """Run the compiled pattern (or its suffix equivalent) against the complete address."""
+        suffix = self._domain_suffix
+        if suffix is not None:
+            # Same result as the regex: "." does not match a newline, and only
+            # ASCII letters fold case
+            tail = email_address[-len(suffix) :]
+            return "\n" not in email_address and tail.isascii() and tail.lower() == suffix
+        return self.compiled_pattern.fullmatch(email_address) is not None
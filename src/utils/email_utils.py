@@ -0,0 +1,110 @@
+"""Email header and payload utilities for PDF-to-PNG email processor."""
+
+import binascii
+import email.errors
+import email.header
+import email.message
+import email.policy
+from typing import BinaryIO
+
+# Base64 characters decoded per step when streaming a payload (a multiple of 4)
+_BASE64_CHUNK_CHARS = 64 * 1024
+
+
+def decode_header_value(value: str) -> str:
+    """Decode RFC 2047 encoded-words in a header value.
+
+    Messages are parsed with the ``compat32`` policy, which leaves
+    ``=?charset?...?=`` words undecoded.
+
+    Args:
+        value: Raw header value (e.g., "=?utf-8?q?Caf=C3=A9?=")
+
+    Returns:
+        Decoded header value (e.g., "Café"), or the input unchanged if it
+        cannot be decoded
+    """
+    try:
+        return str(email.header.make_header(email.header.decode_header(value)))
+    except (LookupError, UnicodeError, email.errors.HeaderParseError):
+        return str(value)
+
+
+def get_header_text(msg: email.message.Message, name: str, default: str = "") -> str:
+    """Read a header from a ``compat32`` message as decoded text.
+
+    ``compat32`` leaves RFC 2047 encoded-words undecoded and returns headers
+    holding raw 8-bit bytes as ``email.header.Header`` objects, whose
+    ``str()`` replaces every non-ASCII byte. The stored value is decoded
+    with ``policy.default`` instead, which handles both (8-bit bytes are
+    read as UTF-8).
+
+    Args:
+        msg: Message parsed with the ``compat32`` policy
+        name: Header name (case-insensitive)
+        default: Value returned if the header is absent
+
+    Returns:
+        Decoded value of the first header called ``name``
+    """
+    name = name.lower()
+    for key, value in msg.raw_items():
+        if key.lower() == name:
+            return str(email.policy.default.header_fetch_parse(key, value))
+    return default
+
+
+def write_decoded_payload(
+    part: email.message.Message, fp: BinaryIO, max_bytes: int | None = None
+) -> int:
+    """Write the transfer-decoded payload of a MIME part to a binary file.
+
+    Base64 bodies are decoded chunk by chunk, so only a small slice of the
+    decoded data is held in memory at a time. Other transfer encodings (and
+    base64 bodies that fail to decode) fall back to
+    ``get_payload(decode=True)``.
+
+    Args:
+        part: Non-multipart MIME part
+        fp: Binary file opened for writing
+        max_bytes: Optional size cap; base64 decoding stops as soon as more
+            than this many bytes have been written
+
+    Returns:
+        Number of bytes written; a value above ``max_bytes`` means the
+        payload was truncated because it exceeds the cap
+    """
+    payload = part.get_payload()
+    # str(): compat32 returns a Header object for a raw 8-bit value
+    encoding = str(part.get("Content-Transfer-Encoding", ""))
+    if encoding.strip().lower() == "base64" and isinstance(payload, str):
+        start = fp.tell()
+        try:
+            return _write_base64(payload, fp, max_bytes)
+        except binascii.Error:
+            # Malformed base64; let the email package apply its lenient decoding
+            fp.seek(start)
+            fp.truncate()
+
+    content = part.get_payload(decode=True) or b""
+    fp.write(content)
+    return len(content)
+
+
+def _write_base64(payload: str, fp: BinaryIO, max_bytes: int | None) -> int:
+    """Decode a base64 payload into a file in fixed-size chunks."""
+    written = 0
+    carry = ""
+    for offset in range(0, len(payload), _BASE64_CHUNK_CHARS):
+        # Line breaks may fall anywhere; decode whole 4-character groups only
+        chunk = carry + "".join(payload[offset : offset + _BASE64_CHUNK_CHARS].split())
+        usable = len(chunk) - len(chunk) % 4
+        carry = chunk[usable:]
+        written += fp.write(binascii.a2b_base64(chunk[:usable]))
+        if max_bytes is not None and written > max_bytes:
+            return written
+
+    if carry:
+        # Unpadded tail, as tolerated by get_payload(decode=True)
+        written += fp.write(binascii.a2b_base64(carry + "=" * (-len(carry) % 4)))
+    return written
@@ -2,6 +2,10 @@
 
 import re
 
+# Runs of characters outside [a-zA-Z0-9-], underscores included, so that one
+# substitution both replaces special characters and collapses the result
+_UNSAFE_RUN_RE = re.compile(r"[^a-zA-Z0-9-]+")
+
 
 def sanitize_filename(filename: str, max_length: int = 50) -> str:
     """Sanitize filename for filesystem safety per FR-008.
@@ -25,16 +29,19 @@ def sanitize_filename(filename: str, max_length: int = 50) -> str:
         'aaaaa...' (truncated to 50 chars)
     """
     # Remove file extension if present
-    name_without_ext = filename.rsplit(".", 1)[0] if "." in filename else filename
-
-    # Replace non-alphanumeric characters (except underscore and hyphen) with underscore
-    sanitized = re.sub(r"[^a-zA-Z0-9_-]", "_", name_without_ext)
-
-    # Remove consecutive underscores
-    sanitized = re.sub(r"_+", "_", sanitized)
-
-    # Remove leading/trailing underscores
-    sanitized = sanitized.strip("_")
+    head, dot, _ = filename.rpartition(".")
+    name_without_ext = head if dot else filename
+
+    if name_without_ext.isascii() and name_without_ext.replace("-", "").isalnum():
+        # Already safe (the common "invoice.pdf" case): nothing to replace or strip
+        sanitized = name_without_ext
+    else:
+        # Replace non-alphanumeric characters (except hyphen) with a single
+        # underscore per run, so consecutive underscores never appear
+        sanitized = _UNSAFE_RUN_RE.sub("_", name_without_ext)
+
+        # Remove leading/trailing underscores
+        sanitized = sanitized.strip("_")
 
     # Truncate to max_length
     if len(sanitized) > max_length:
@@ -3,6 +3,20 @@
 import logging
 import os
 import sys
+import traceback
+
+# Innermost stack frames kept when formatting a traceback, per exception in
+# a chain; the outer frames are the same daemon loop every time
+TRACEBACK_LIMIT = 25
+
+
+class _BoundedTracebackFormatter(logging.Formatter):
+    """Formatter that logs only the innermost TRACEBACK_LIMIT frames."""
+
+    def formatException(self, ei) -> str:  # noqa: N802 - overrides logging API
+        """Format exception info like logging.Formatter, with a frame limit."""
+        lines = traceback.format_exception(ei[1], limit=-TRACEBACK_LIMIT)
+        return "".join(lines).rstrip("\n")
 
 
 def setup_logging() -> logging.Logger:
@@ -14,6 +28,15 @@ def setup_logging() -> logging.Logger:
     Returns:
         Configured logger instance
     """
+    # The format below uses none of the caller, thread or process fields, so
+    # skip collecting them (a stack walk and several lookups) for every record
+    # Deliberate use of a CPython internal: with _srcfile unset, findCaller()
+    # skips the per-record stack walk (there is no public switch for it)
+    logging._srcfile = None
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     logger = logging.getLogger("pdf_to_png_mailer")
 
     level_name = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -25,7 +48,7 @@ def setup_logging() -> logging.Logger:
     handler.setLevel(logging.DEBUG)
 
     # Create formatter with timestamp, level, and message
-    formatter = logging.Formatter(
+    formatter = _BoundedTracebackFormatter(
         "%(asctime)s - %(name)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
     )
     handler.setFormatter(formatter)
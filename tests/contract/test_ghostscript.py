@@ -9,9 +9,7 @@ def test_ghostscript_availability():
     """T030 [US1] Contract test: GhostScript availability for PDF pre-processing."""
     # Test that 'gs' command is available
     try:
-        result = subprocess.run(
-            ["gs", "--version"], capture_output=True, text=True, check=True, timeout=5
-        )
+        result = subprocess.run(["gs", "--version"], capture_output=True, check=True, timeout=5)
         assert result.returncode == 0
         # Version should be a number (e.g., "10.02.1")
         assert len(result.stdout.strip()) > 0
@@ -11,7 +11,7 @@ from src.models.email_message import EmailMessage
 _UTC = timezone.utc
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def make_config():
     """Factory fixture for creating Configuration instances."""
 
@@ -33,13 +33,13 @@ def make_config():
     return _make
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def config(make_config):
-    """Default valid Configuration."""
+    """Default valid Configuration (shared; Configuration is frozen)."""
     return make_config()
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def make_email():
     """Factory fixture for creating EmailMessage instances."""
 
@@ -60,5 +60,5 @@ def make_email():
 
 @pytest.fixture()
 def email_msg(make_email):
-    """Default valid EmailMessage."""
+    """Default valid EmailMessage (per test; ProcessingJob.release_raw mutates it)."""
     return make_email()
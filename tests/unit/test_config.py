@@ -1,5 +1,6 @@
 """Unit tests for Configuration."""
 
+import dataclasses
 import os
 from unittest.mock import patch
 
@@ -82,6 +83,27 @@ class TestConfigValidation:
         with pytest.raises(ValueError, match="pdf_conversion_timeout_seconds"):
             make_config(pdf_conversion_timeout_seconds=0)
 
+    def test_invalid_attachments_per_email_raises(self, make_config):
+        """attachments_per_email < 1 raises ValueError."""
+        with pytest.raises(ValueError, match="attachments_per_email"):
+            make_config(attachments_per_email=0)
+
+    def test_invalid_max_reply_size_raises(self, make_config):
+        """max_reply_size_mb < 1 raises ValueError."""
+        with pytest.raises(ValueError, match="max_reply_size_mb"):
+            make_config(max_reply_size_mb=0)
+
+    def test_invalid_max_email_size_raises(self, make_config):
+        """max_email_size_mb < 1 raises ValueError."""
+        with pytest.raises(ValueError, match="max_email_size_mb"):
+            make_config(max_email_size_mb=0)
+
+    def test_negative_pdf_max_concurrency_raises(self, make_config):
+        """pdf_max_concurrency < 0 raises ValueError; 0 means one per CPU core."""
+        assert make_config(pdf_max_concurrency=0).pdf_max_concurrency == 0
+        with pytest.raises(ValueError, match="pdf_max_concurrency"):
+            make_config(pdf_max_concurrency=-1)
+
     def test_invalid_whitelist_regex_raises(self, make_config):
         """Invalid regex pattern raises ValueError."""
         with pytest.raises(ValueError, match="Invalid SENDER_WHITELIST_REGEX"):
@@ -93,6 +115,18 @@ class TestConfigValidation:
         assert config.compiled_whitelist.match("user@test.com")
         assert config.compiled_whitelist.match("user@other.com") is None
 
+    def test_compiled_whitelist_shared_across_instances(self, make_config):
+        """Identical whitelist patterns reuse the same compiled re.Pattern."""
+        first = make_config(sender_whitelist_regex=".*@shared\\.com")
+        second = make_config(sender_whitelist_regex=".*@shared\\.com")
+        assert first.compiled_whitelist is second.compiled_whitelist
+
+    def test_config_is_immutable(self, make_config):
+        """Fields cannot be reassigned after validation and regex compilation."""
+        config = make_config()
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            config.sender_whitelist_regex = ".*"
+
     def test_custom_values(self, make_config):
         """Config accepts custom PDF settings."""
         config = make_config(
@@ -149,6 +183,10 @@ class TestConfigFromEnv:
         assert config.smtp_host == "smtp.example.com"
         assert config.smtp_port == 587
         assert config.polling_interval_seconds == 60  # default
+        assert config.attachments_per_email == 20  # default
+        assert config.max_email_size_mb == 150  # default
+        assert config.pdf_max_concurrency == 0  # default
+        assert config.max_reply_size_mb == 20  # default
 
     def test_from_env_with_optional_vars(self):
         """from_env loads optional env vars with overrides."""
@@ -160,6 +198,10 @@ class TestConfigFromEnv:
             PDF_DENSITY_DPI="600",
             PDF_BACKGROUND="black",
             PDF_CONVERSION_TIMEOUT_SECONDS="300",
+            ATTACHMENTS_PER_EMAIL="5",
+            MAX_EMAIL_SIZE_MB="25",
+            PDF_MAX_CONCURRENCY="2",
+            MAX_REPLY_SIZE_MB="10",
         )
         with patch.dict(os.environ, env, clear=True):
             config = Configuration.from_env()
@@ -168,6 +210,10 @@ class TestConfigFromEnv:
         assert config.max_retry_interval_seconds == 1800
         assert config.pdf_resolution_width == 3840
         assert config.pdf_density_dpi == 600
+        assert config.attachments_per_email == 5
+        assert config.max_email_size_mb == 25
+        assert config.pdf_max_concurrency == 2
+        assert config.max_reply_size_mb == 10
 
     def test_from_env_cc_addresses(self):
         """from_env parses semicolon-separated CC_ADDRESSES."""
@@ -1,7 +1,12 @@
 """Unit tests for IMAPService."""
 
+import email
+import email.header
+import email.policy
 import imaplib
+import socket
 import ssl
+from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -11,9 +16,26 @@ from src.services.imap_service import (
     IMAPConnectionError,
     IMAPError,
     IMAPService,
+    MessageParseError,
+    _extract_sender,
+    _ssl_context,
 )
 
 
+def _mock_conn():
+    """Connection mock restricted to the IMAP4_SSL API.
+
+    Instance attributes that the spec cannot see are preset; a typo in a
+    method name fails the test instead of returning a fresh child mock.
+    """
+    conn = MagicMock(spec=imaplib.IMAP4_SSL)
+    conn.untagged_responses = {}
+    conn.file = MagicMock()
+    conn.sock = MagicMock()
+    conn.capability.return_value = ("OK", [b"IMAP4rev1 IDLE"])
+    return conn
+
+
 @pytest.fixture()
 def imap_service(config):
     """IMAPService with test config."""
@@ -35,32 +57,64 @@ class TestIMAPServiceConnect:
     @patch("src.services.imap_service.imaplib")
     def test_connect_ssl_success(self, mock_imaplib, imap_service):
         """connect() succeeds with IMAP4_SSL."""
-        mock_conn = MagicMock()
+        mock_conn = _mock_conn()
         mock_imaplib.IMAP4_SSL.return_value = mock_conn
 
         imap_service.connect()
 
-        mock_imaplib.IMAP4_SSL.assert_called_once_with("imap.test.com", 993)
+        mock_imaplib.IMAP4_SSL.assert_called_once_with(
+            "imap.test.com", 993, ssl_context=_ssl_context()
+        )
         mock_conn.login.assert_called_once_with("user@test.com", "secret")
         assert imap_service.connection is mock_conn
+        mock_conn.sock.setsockopt.assert_any_call(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+    @patch("src.services.imap_service.imaplib")
+    def test_connect_refreshes_capabilities_after_login(self, mock_imaplib, imap_service):
+        """Extensions advertised only after authentication, such as IDLE, are seen."""
+        mock_conn = _mock_conn()
+        mock_conn.capabilities = ("IMAP4REV1", "AUTH=PLAIN")
+        mock_imaplib.IMAP4_SSL.return_value = mock_conn
+        mock_imaplib.IMAP4.error = imaplib.IMAP4.error
+
+        imap_service.connect()
+
+        mock_conn.capability.assert_called_once()
+        assert mock_conn.capabilities == ("IMAP4REV1", "IDLE")
+        assert imap_service.supports_idle() is True
+
+    @patch("src.services.imap_service.imaplib")
+    def test_connect_keeps_greeting_capabilities_if_refresh_fails(self, mock_imaplib, imap_service):
+        """A rejected CAPABILITY after login does not fail the connection."""
+        mock_conn = _mock_conn()
+        mock_conn.capabilities = ("IMAP4REV1", "IDLE")
+        mock_conn.capability.side_effect = imaplib.IMAP4.error("CAPABILITY failed")
+        mock_imaplib.IMAP4_SSL.return_value = mock_conn
+        mock_imaplib.IMAP4.error = imaplib.IMAP4.error
+
+        imap_service.connect()
+
+        assert imap_service.connection is mock_conn
+        assert mock_conn.capabilities == ("IMAP4REV1", "IDLE")
 
     @patch("src.services.imap_service.imaplib")
     def test_connect_ssl_fails_starttls_succeeds(self, mock_imaplib, imap_service):
         """connect() falls back to STARTTLS when SSL fails."""
         mock_imaplib.IMAP4_SSL.side_effect = ssl.SSLError("SSL failed")
-        mock_conn = MagicMock()
+        mock_conn = _mock_conn()
         mock_imaplib.IMAP4.return_value = mock_conn
 
         imap_service.connect()
 
         mock_imaplib.IMAP4.assert_called_once_with("imap.test.com", 993)
+        mock_conn.starttls.assert_called_once_with(ssl_context=_ssl_context())
         mock_conn.login.assert_called_once()
 
     @patch("src.services.imap_service.imaplib")
     def test_connect_auth_failure_ssl(self, mock_imaplib, imap_service):
         """connect() raises IMAPAuthenticationError on auth failure."""
         mock_imaplib.IMAP4_SSL.side_effect = Exception("other error")
-        mock_imaplib.IMAP4.return_value = MagicMock()
+        mock_imaplib.IMAP4.return_value = _mock_conn()
         mock_imaplib.IMAP4.return_value.login.side_effect = Exception("login failed")
 
         with pytest.raises(IMAPConnectionError):
@@ -70,7 +124,7 @@ class TestIMAPServiceConnect:
     def test_connect_imap4_auth_error(self, mock_imaplib, imap_service):
         """connect() raises IMAPAuthenticationError on IMAP4 auth failure."""
         mock_imaplib.IMAP4_SSL.side_effect = ssl.SSLError("SSL failed")
-        mock_imaplib.IMAP4.return_value = MagicMock()
+        mock_imaplib.IMAP4.return_value = _mock_conn()
         mock_imaplib.IMAP4.return_value.login.side_effect = imaplib.IMAP4.error(
             "authentication failed"
         )
@@ -79,6 +133,24 @@ class TestIMAPServiceConnect:
         with pytest.raises(IMAPAuthenticationError):
             imap_service.connect()
 
+    @patch("src.services.imap_service.imaplib")
+    def test_connect_ssl_credentials_error(self, mock_imaplib, imap_service):
+        """connect() treats 'invalid credentials' responses as auth failures."""
+        mock_imaplib.IMAP4_SSL.return_value = _mock_conn()
+        mock_imaplib.IMAP4_SSL.return_value.login.side_effect = imaplib.IMAP4.error(
+            "[AUTHENTICATIONFAILED] Invalid credentials"
+        )
+
+        with pytest.raises(IMAPAuthenticationError):
+            imap_service.connect()
+
+        mock_imaplib.IMAP4.assert_not_called()
+
+    def test_ssl_context_is_shared(self):
+        """The TLS context is created once and reused."""
+        assert _ssl_context() is _ssl_context()
+        assert isinstance(_ssl_context(), ssl.SSLContext)
+
 
 class TestIMAPServiceConnectWithBackoff:
     """Tests for IMAPService.connect_with_backoff()."""
@@ -103,6 +175,31 @@ class TestIMAPServiceConnectWithBackoff:
 
         assert mock_sleep.call_count == 1
 
+    @patch("src.services.imap_service.random.uniform", side_effect=lambda _low, high: high)
+    @patch("src.services.imap_service.time.sleep")
+    def test_connect_with_backoff_schedule_capped(self, mock_sleep, _mock_uniform, imap_service):
+        """Backoff doubles from 60s and is capped at max_retry_interval_seconds."""
+        with (
+            patch.object(imap_service, "connect", side_effect=IMAPConnectionError("fail")),
+            pytest.raises(IMAPConnectionError),
+        ):
+            imap_service.connect_with_backoff(max_retries=6)
+
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [60, 120, 240, 480, 900, 900]
+
+    @patch("src.services.imap_service.time.sleep")
+    def test_connect_with_backoff_jitter_bounds(self, mock_sleep, imap_service):
+        """Jittered delays stay within [capped/2, capped]."""
+        with (
+            patch.object(imap_service, "connect", side_effect=IMAPConnectionError("fail")),
+            pytest.raises(IMAPConnectionError),
+        ):
+            imap_service.connect_with_backoff(max_retries=3)
+
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        for delay, capped in zip(delays, [60, 120, 240], strict=True):
+            assert capped / 2 <= delay <= capped
+
     @patch("src.services.imap_service.time.sleep")
     def test_connect_with_backoff_max_retries_exceeded(self, _mock_sleep, imap_service):
         """connect_with_backoff raises after max retries."""
@@ -132,65 +229,322 @@ class TestIMAPServiceConnectWithBackoff:
         mock_sleep.assert_not_called()
 
 
+class TestExtractSender:
+    """Tests for the From header address extractor."""
+
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            ("Alice Example <alice@test.com>", "alice@test.com"),
+            ('"Doe, John" <john@test.com>', "john@test.com"),
+            ("bob@test.com", "bob@test.com"),
+            ("carol@test.com (Carol)", "carol@test.com"),
+            ("", ""),
+        ],
+    )
+    def test_extract_sender(self, header, expected):
+        """Angle-bracket addresses are sliced; other forms fall back to parseaddr."""
+        assert _extract_sender(header) == expected
+
+    def test_extract_sender_accepts_header_object(self):
+        """A compat32 Header for a raw 8-bit From value does not break the slicing."""
+        raw = email.message_from_bytes(
+            b"From: J\xc3\xbcrgen <j@test.com>\r\n\r\n", policy=email.policy.compat32
+        )
+        header = raw["From"]
+
+        assert isinstance(header, email.header.Header)
+        assert _extract_sender(header) == "j@test.com"
+
+
 class TestIMAPServiceFetchUnseen:
-    """Tests for IMAPService.fetch_unseen_messages()."""
+    """Tests for IMAPService.fetch_unseen_summaries()."""
 
     def test_fetch_no_connection_raises(self, imap_service):
-        """fetch_unseen_messages raises when not connected."""
+        """fetch_unseen_summaries raises when not connected."""
         with pytest.raises(IMAPError, match="not established"):
-            imap_service.fetch_unseen_messages()
+            imap_service.fetch_unseen_summaries()
 
     def test_fetch_no_unseen_messages(self, imap_service):
-        """fetch_unseen_messages returns empty list when no unseen."""
-        mock_conn = MagicMock()
+        """fetch_unseen_summaries returns nothing when no unseen."""
+        mock_conn = _mock_conn()
         mock_conn.select.return_value = ("OK", [b"1"])
-        mock_conn.search.return_value = ("OK", [b""])
+        mock_conn.uid.return_value = ("OK", [b""])
         imap_service.connection = mock_conn
 
-        result = imap_service.fetch_unseen_messages()
-        assert result == []
+        assert imap_service.fetch_unseen_summaries() == []
+        mock_conn.uid.assert_called_once_with("SEARCH", None, "UNSEEN", "UNDELETED")
+
+    def test_fetch_consumes_select_counts(self, imap_service):
+        """EXISTS/RECENT reported by SELECT are cleared so idle() does not wake on them."""
+        mock_conn = _mock_conn()
+        mock_conn.untagged_responses = {}
+        mock_conn.select.side_effect = lambda _: mock_conn.untagged_responses.update(
+            EXISTS=[b"1"], RECENT=[b"1"]
+        )
+        mock_conn.uid.return_value = ("OK", [b""])
+        imap_service.connection = mock_conn
+
+        imap_service.fetch_unseen_summaries()
+
+        assert mock_conn.untagged_responses == {}
 
     def test_fetch_search_failure(self, imap_service):
-        """fetch_unseen_messages raises on search failure."""
-        mock_conn = MagicMock()
+        """fetch_unseen_summaries raises on search failure."""
+        mock_conn = _mock_conn()
         mock_conn.select.return_value = ("OK", [b"1"])
-        mock_conn.search.return_value = ("BAD", [b""])
+        mock_conn.uid.return_value = ("BAD", [b""])
         imap_service.connection = mock_conn
 
         with pytest.raises(IMAPError):
-            imap_service.fetch_unseen_messages()
+            imap_service.fetch_unseen_summaries()
 
-    def test_fetch_parses_email(self, imap_service):
-        """fetch_unseen_messages parses a simple email."""
+    def test_fetch_batches_headers_and_sizes(self, imap_service):
+        """One UID FETCH retrieves From/Subject and RFC822.SIZE, never the body."""
+        mock_conn = _mock_conn()
+        mock_conn.select.return_value = ("OK", [b"1"])
+        mock_conn.uid.side_effect = [
+            ("OK", [b"3 5"]),
+            (
+                "OK",
+                [
+                    (
+                        b"2 (UID 5 RFC822.SIZE 2048 BODY[HEADER.FIELDS (FROM SUBJECT)] {30}",
+                        b"From: c@d.com\r\nSubject: B\r\n\r\n",
+                    ),
+                    b")",
+                    (
+                        b"1 (RFC822.SIZE 512 BODY[HEADER.FIELDS (FROM SUBJECT)] {38}",
+                        b"From: Alice <a@b.com>\r\nSubject: A\r\n\r\n",
+                    ),
+                    b" UID 3)",
+                ],
+            ),
+        ]
+        imap_service.connection = mock_conn
+
+        summaries = imap_service.fetch_unseen_summaries()
+
+        fetch_call = mock_conn.uid.call_args_list[1]
+        assert fetch_call[0][:2] == ("FETCH", "3,5")
+        assert "RFC822.SIZE" in fetch_call[0][2]
+        assert "BODY.PEEK[HEADER.FIELDS (FROM SUBJECT)]" in fetch_call[0][2]
+        assert "BODY.PEEK[]" not in fetch_call[0][2]
+        # Sorted back into UID order
+        assert [(m.uid, m.sender, m.subject, m.size_bytes) for m in summaries] == [
+            (3, "a@b.com", "A", 512),
+            (5, "c@d.com", "B", 2048),
+        ]
+
+    def test_fetch_decodes_encoded_subject(self, imap_service):
+        """fetch_unseen_summaries decodes RFC 2047 subjects."""
+        mock_conn = _mock_conn()
+        mock_conn.uid.side_effect = [
+            ("OK", [b"1"]),
+            (
+                "OK",
+                [
+                    (
+                        b"1 (UID 1 RFC822.SIZE 100 BODY[HEADER.FIELDS (FROM SUBJECT)] {56}",
+                        b"From: a@b.com\r\nSubject: =?utf-8?q?Caf=C3=A9?=\r\n\r\n",
+                    ),
+                    b")",
+                ],
+            ),
+        ]
+        imap_service.connection = mock_conn
+
+        assert imap_service.fetch_unseen_summaries()[0].subject == "Caf\u00e9"
+
+    def test_fetch_decodes_8bit_headers(self, imap_service):
+        """Raw UTF-8 in From/Subject (not RFC 2047 encoded) is decoded, not fatal."""
+        mock_conn = _mock_conn()
+        mock_conn.uid.side_effect = [
+            ("OK", [b"1"]),
+            (
+                "OK",
+                [
+                    (
+                        b"1 (UID 1 RFC822.SIZE 100 BODY[HEADER.FIELDS (FROM SUBJECT)] {48}",
+                        "From: J\u00fcrgen <j@b.com>\r\nSubject: Gr\u00fc\u00dfe\r\n\r\n".encode(),
+                    ),
+                    b")",
+                ],
+            ),
+        ]
+        imap_service.connection = mock_conn
+
+        summary = imap_service.fetch_unseen_summaries()[0]
+        assert summary.sender == "j@b.com"
+        assert summary.subject == "Gr\u00fc\u00dfe"
+
+    def test_fetch_flags_message_with_unreadable_headers(self, imap_service):
+        """A message whose headers cannot be read is listed with the error; the others too."""
+        mock_conn = _mock_conn()
+        mock_conn.uid.side_effect = [
+            ("OK", [b"1 2"]),
+            (
+                "OK",
+                [
+                    (
+                        b"1 (UID 1 RFC822.SIZE 9 BODY[HEADER.FIELDS (FROM)] {17}",
+                        b"From: a@b.com\r\n\r\n",
+                    ),
+                    b")",
+                    (
+                        b"2 (UID 2 RFC822.SIZE 9 BODY[HEADER.FIELDS (FROM)] {17}",
+                        b"From: c@d.com\r\n\r\n",
+                    ),
+                    b")",
+                ],
+            ),
+        ]
+        imap_service.connection = mock_conn
+
+        with patch(
+            "src.services.imap_service._extract_sender",
+            side_effect=[ValueError("bad header"), "c@d.com"],
+        ):
+            summaries = imap_service.fetch_unseen_summaries()
+
+        assert [(s.uid, s.sender, s.header_error) for s in summaries] == [
+            (1, "", "bad header"),
+            (2, "c@d.com", None),
+        ]
+
+    def test_fetch_tolerates_missing_from(self, imap_service):
+        """A message without a usable From header is listed with an empty sender."""
+        mock_conn = _mock_conn()
+        mock_conn.uid.side_effect = [
+            ("OK", [b"1"]),
+            (
+                "OK",
+                [(b"1 (UID 1 RFC822.SIZE 9 BODY[HEADER.FIELDS (FROM SUBJECT)] {2}", b"\r\n"), b")"],
+            ),
+        ]
+        imap_service.connection = mock_conn
+
+        summary = imap_service.fetch_unseen_summaries()[0]
+        assert summary.sender == ""
+        assert summary.subject == "(no subject)"
+
+    def test_fetch_missing_size_is_unknown(self, imap_service):
+        """A response without RFC822.SIZE yields size None, not 0."""
+        mock_conn = _mock_conn()
+        mock_conn.uid.side_effect = [
+            ("OK", [b"1"]),
+            (
+                "OK",
+                [(b"1 (UID 1 BODY[HEADER.FIELDS (FROM)] {17}", b"From: a@b.com\r\n\r\n"), b")"],
+            ),
+        ]
+        imap_service.connection = mock_conn
+
+        assert imap_service.fetch_unseen_summaries()[0].size_bytes is None
+
+    def test_fetch_splits_large_queues(self, imap_service):
+        """UIDs are fetched SUMMARY_BATCH_SIZE at a time."""
+        mock_conn = _mock_conn()
+        mock_conn.uid.side_effect = [("OK", [b"1 2 3 4 5"]), ("OK", []), ("OK", []), ("OK", [])]
+        imap_service.connection = mock_conn
+
+        with patch.object(IMAPService, "SUMMARY_BATCH_SIZE", 2):
+            imap_service.fetch_unseen_summaries()
+
+        fetched = [c[0][1] for c in mock_conn.uid.call_args_list[1:]]
+        assert fetched == ["1,2", "3,4", "5"]
+
+    def test_fetch_failure_raises(self, imap_service):
+        """fetch_unseen_summaries raises when the batched FETCH fails."""
+        mock_conn = _mock_conn()
+        mock_conn.uid.side_effect = [("OK", [b"1 2"]), ("NO", [None])]
+        imap_service.connection = mock_conn
+
+        with pytest.raises(IMAPError, match="fetch failed"):
+            imap_service.fetch_unseen_summaries()
+
+
+class TestIMAPServiceFetchMessage:
+    """Tests for IMAPService.fetch_message()."""
+
+    def test_fetch_message_no_connection_raises(self, imap_service):
+        """fetch_message raises when not connected."""
+        with pytest.raises(IMAPError, match="not established"):
+            imap_service.fetch_message(1)
+
+    def test_fetch_message_parses_email(self, imap_service):
+        """fetch_message downloads one message with BODY.PEEK[] and parses it."""
         raw_email = (
             b"From: sender@test.com\r\nSubject: Test\r\nContent-Type: text/plain\r\n\r\nHello world"
         )
+        mock_conn = _mock_conn()
+        mock_conn.uid.return_value = (
+            "OK",
+            [
+                (b'1 (UID 7 INTERNALDATE "17-Jul-1996 02:44:25 -0700" BODY[] {71}', raw_email),
+                b")",
+            ],
+        )
+        imap_service.connection = mock_conn
 
-        mock_conn = MagicMock()
-        mock_conn.select.return_value = ("OK", [b"1"])
-        mock_conn.search.return_value = ("OK", [b"1"])
-        mock_conn.fetch.return_value = ("OK", [(b"1", raw_email)])
+        message = imap_service.fetch_message(7)
+
+        mock_conn.uid.assert_called_once_with("FETCH", "7", "(UID INTERNALDATE BODY.PEEK[])")
+        assert message.uid == 7
+        assert message.sender == "sender@test.com"
+        assert message.subject == "Test"
+        assert message.body == "Hello world"
+        assert message.parsed["Subject"] == "Test"
+        assert message.received_at == datetime(1996, 7, 17, 9, 44, 25, tzinfo=timezone.utc)
+
+    def test_fetch_message_vanished_returns_none(self, imap_service):
+        """fetch_message returns None when the server returns no message data."""
+        mock_conn = _mock_conn()
+        mock_conn.uid.return_value = ("OK", [None])
         imap_service.connection = mock_conn
 
-        messages = imap_service.fetch_unseen_messages()
-        assert len(messages) == 1
-        assert messages[0].sender == "sender@test.com"
-        assert messages[0].subject == "Test"
-        assert messages[0].body == "Hello world"
+        assert imap_service.fetch_message(7) is None
 
-    def test_fetch_skips_failed_uid(self, imap_service):
-        """fetch_unseen_messages skips UIDs that fail to fetch."""
-        mock_conn = MagicMock()
-        mock_conn.select.return_value = ("OK", [b"1"])
-        mock_conn.search.return_value = ("OK", [b"1 2"])
-        mock_conn.fetch.side_effect = [
-            ("BAD", None),
-            ("OK", [(b"2", b"From: a@b.com\r\nSubject: S\r\n\r\nbody")]),
-        ]
+    def test_fetch_message_decodes_8bit_headers(self, imap_service):
+        """Raw UTF-8 in From/Subject is decoded, as are RFC 2047 encoded-words."""
+        raw_email = (
+            "From: J\u00fcrgen <j@test.com>\r\n"
+            "Subject: Gr\u00fc\u00dfe =?utf-8?q?Caf=C3=A9?=\r\n\r\nHello"
+        ).encode()
+        mock_conn = _mock_conn()
+        mock_conn.uid.return_value = ("OK", [(b"1 (UID 7 BODY[] {64}", raw_email), b")"])
+        imap_service.connection = mock_conn
+
+        message = imap_service.fetch_message(7)
+
+        assert message.sender == "j@test.com"
+        assert message.subject == "Gr\u00fc\u00dfe Caf\u00e9"
+
+    def test_fetch_message_unparseable_raises(self, imap_service):
+        """A message that does not yield a valid EmailMessage raises MessageParseError."""
+        mock_conn = _mock_conn()
+        mock_conn.uid.return_value = (
+            "OK",
+            [(b"1 (UID 7 BODY[] {17}", b"Subject: x\r\n\r\nbody"), b")"],
+        )
+        imap_service.connection = mock_conn
+
+        with pytest.raises(MessageParseError, match="Failed to parse message UID 7") as exc_info:
+            imap_service.fetch_message(7)
+
+        # Not a connection problem: the daemon must not reconnect and retry it
+        assert not isinstance(exc_info.value, IMAPError)
+        assert imap_service.connection is mock_conn
+
+    def test_fetch_message_connection_lost(self, imap_service):
+        """fetch_message wraps connection errors and drops the connection."""
+        mock_conn = _mock_conn()
+        mock_conn.uid.side_effect = imaplib.IMAP4.abort("socket error")
         imap_service.connection = mock_conn
 
-        messages = imap_service.fetch_unseen_messages()
-        assert len(messages) == 1
+        with pytest.raises(IMAPConnectionError, match="UID 7"):
+            imap_service.fetch_message(7)
+        assert imap_service.connection is None
 
 
 class TestIMAPServiceDeleteMessage:
@@ -203,30 +557,282 @@ class TestIMAPServiceDeleteMessage:
 
     def test_delete_success(self, imap_service):
         """delete_message stores Deleted flag and expunges."""
-        mock_conn = MagicMock()
+        mock_conn = _mock_conn()
         imap_service.connection = mock_conn
 
         imap_service.delete_message(42)
 
-        mock_conn.store.assert_called_once_with("42", "+FLAGS", r"(\Deleted)")
+        mock_conn.uid.assert_called_once_with("STORE", "42", "+FLAGS", r"(\Deleted)")
+        mock_conn.expunge.assert_called_once()
+
+    def test_delete_deferred_expunge(self, imap_service):
+        """delete_message(expunge=False) only stores the Deleted flag."""
+        mock_conn = _mock_conn()
+        imap_service.connection = mock_conn
+
+        imap_service.delete_message(42, expunge=False)
+
+        mock_conn.uid.assert_called_once_with("STORE", "42", "+FLAGS", r"(\Deleted)")
+        mock_conn.expunge.assert_not_called()
+
+    def test_delete_messages_batches_store(self, imap_service):
+        """delete_messages flags all UIDs in one STORE and expunges once."""
+        mock_conn = _mock_conn()
+        imap_service.connection = mock_conn
+
+        imap_service.delete_messages([3, 5, 8])
+
+        mock_conn.uid.assert_called_once_with("STORE", "3,5,8", "+FLAGS", r"(\Deleted)")
+        mock_conn.expunge.assert_called_once()
+
+    def test_delete_messages_empty_is_noop(self, imap_service):
+        """delete_messages with no UIDs sends nothing."""
+        mock_conn = _mock_conn()
+        imap_service.connection = mock_conn
+
+        imap_service.delete_messages([])
+
+        mock_conn.uid.assert_not_called()
+        mock_conn.expunge.assert_not_called()
+
+    def test_expunge(self, imap_service):
+        """expunge issues EXPUNGE on the connection."""
+        mock_conn = _mock_conn()
+        imap_service.connection = mock_conn
+
+        imap_service.expunge()
+
         mock_conn.expunge.assert_called_once()
 
+    def test_expunge_no_connection_raises(self, imap_service):
+        """expunge raises when not connected."""
+        with pytest.raises(IMAPError, match="not established"):
+            imap_service.expunge()
+
     def test_delete_failure_raises(self, imap_service):
         """delete_message raises IMAPError on failure."""
-        mock_conn = MagicMock()
-        mock_conn.store.side_effect = Exception("store failed")
+        mock_conn = _mock_conn()
+        mock_conn.uid.side_effect = Exception("store failed")
         imap_service.connection = mock_conn
 
         with pytest.raises(IMAPError, match="Failed to delete"):
             imap_service.delete_message(1)
 
 
+class TestIMAPServiceMarkSeen:
+    """Tests for IMAPService.mark_seen()."""
+
+    def test_mark_seen_no_connection_raises(self, imap_service):
+        """mark_seen raises when not connected."""
+        with pytest.raises(IMAPError, match="not established"):
+            imap_service.mark_seen(1)
+
+    def test_mark_seen_success(self, imap_service):
+        """mark_seen stores the Seen flag by UID."""
+        mock_conn = _mock_conn()
+        imap_service.connection = mock_conn
+
+        imap_service.mark_seen(42)
+
+        mock_conn.uid.assert_called_once_with("STORE", "42", "+FLAGS", r"(\Seen)")
+
+    def test_mark_seen_connection_lost_raises(self, imap_service):
+        """mark_seen raises IMAPConnectionError and drops the connection on abort."""
+        mock_conn = _mock_conn()
+        mock_conn.uid.side_effect = imaplib.IMAP4.abort("socket closed")
+        imap_service.connection = mock_conn
+
+        with pytest.raises(IMAPConnectionError, match="as seen"):
+            imap_service.mark_seen(1)
+        assert imap_service.connection is None
+
+
+class TestIMAPServiceNoop:
+    """Tests for IMAPService.noop()."""
+
+    def test_noop_no_connection_raises(self, imap_service):
+        """noop raises when not connected."""
+        with pytest.raises(IMAPError, match="not established"):
+            imap_service.noop()
+
+    def test_noop_success(self, imap_service):
+        """noop sends NOOP on the connection."""
+        mock_conn = _mock_conn()
+        imap_service.connection = mock_conn
+
+        imap_service.noop()
+
+        mock_conn.noop.assert_called_once()
+
+    def test_noop_connection_lost_raises(self, imap_service):
+        """noop raises IMAPConnectionError and drops the connection on abort."""
+        mock_conn = _mock_conn()
+        mock_conn.noop.side_effect = imaplib.IMAP4.abort("socket closed")
+        imap_service.connection = mock_conn
+
+        with pytest.raises(IMAPConnectionError, match="NOOP failed"):
+            imap_service.noop()
+        assert imap_service.connection is None
+
+
+class TestIMAPServiceIdle:
+    """Tests for IMAPService.supports_idle() and idle()."""
+
+    @pytest.fixture()
+    def idle_conn(self, imap_service):
+        """Connected mock in SELECTED state advertising IDLE."""
+        mock_conn = _mock_conn()
+        mock_conn.state = "SELECTED"
+        mock_conn.capabilities = ("IMAP4REV1", "IDLE")
+        mock_conn._new_tag.return_value = b"A001"
+        mock_conn.untagged_responses = {}
+        mock_conn.file.peek.return_value = b""
+        imap_service.connection = mock_conn
+        return mock_conn
+
+    def test_supports_idle(self, imap_service, idle_conn):
+        """supports_idle reflects the server CAPABILITY list."""
+        assert imap_service.supports_idle() is True
+        idle_conn.capabilities = ("IMAP4REV1",)
+        assert imap_service.supports_idle() is False
+
+    def test_supports_idle_no_connection(self, imap_service):
+        """supports_idle is False when not connected."""
+        assert imap_service.supports_idle() is False
+
+    def test_idle_no_connection_raises(self, imap_service):
+        """idle raises when not connected."""
+        with pytest.raises(IMAPError, match="not established"):
+            imap_service.idle()
+
+    @patch("src.services.imap_service.select.select")
+    def test_idle_returns_true_on_exists(self, mock_select, imap_service, idle_conn):
+        """idle returns True when the server pushes EXISTS."""
+        mock_select.return_value = ([idle_conn.sock], [], [])
+        idle_conn.readline.side_effect = [b"+ idling\r\n", b"* 4 EXISTS\r\n", b"A001 OK\r\n"]
+
+        assert imap_service.idle(timeout=5) is True
+
+        idle_conn.send.assert_any_call(b"A001 IDLE\r\n")
+        idle_conn.send.assert_any_call(b"DONE\r\n")
+        assert mock_select.call_args[0][3] == pytest.approx(5, abs=1)
+
+    @patch("src.services.imap_service.select.select")
+    def test_idle_returns_false_on_timeout(self, mock_select, imap_service, idle_conn):
+        """idle returns False when the timeout elapses without updates."""
+        mock_select.return_value = ([], [], [])
+        idle_conn.readline.side_effect = [b"+ idling\r\n", b"A001 OK\r\n"]
+
+        assert imap_service.idle() is False
+        assert mock_select.call_args[0][3] == pytest.approx(IMAPService.IDLE_TIMEOUT_SECONDS, abs=1)
+
+    def test_idle_returns_at_once_on_pending_exists(self, imap_service, idle_conn):
+        """EXISTS received with an earlier command short-circuits IDLE."""
+        idle_conn.untagged_responses = {"EXISTS": [b"5"], "FETCH": [b"1"]}
+
+        assert imap_service.idle() is True
+
+        idle_conn.send.assert_not_called()
+        assert idle_conn.untagged_responses == {"FETCH": [b"1"]}
+
+    def test_idle_ignores_counts_from_its_own_select(self, imap_service, idle_conn):
+        """The EXISTS count SELECT reports does not count as new mail."""
+        idle_conn.state = "AUTH"
+        idle_conn.select.side_effect = lambda _: idle_conn.untagged_responses.update(
+            EXISTS=[b"3"], RECENT=[b"0"]
+        )
+        idle_conn.readline.side_effect = [b"+ idling\r\n", b"A001 OK\r\n"]
+
+        with patch("src.services.imap_service.select.select", return_value=([], [], [])):
+            assert imap_service.idle() is False
+
+        idle_conn.send.assert_any_call(b"A001 IDLE\r\n")
+
+    @patch("src.services.imap_service.select.select")
+    def test_idle_reads_buffered_update_without_select(self, mock_select, imap_service, idle_conn):
+        """An EXISTS already buffered behind the continuation is not missed."""
+        idle_conn.file.peek.return_value = b"* 4 EXISTS\r\n"
+        idle_conn.readline.side_effect = [b"+ idling\r\n", b"* 4 EXISTS\r\n", b"A001 OK\r\n"]
+
+        assert imap_service.idle() is True
+        mock_select.assert_not_called()
+
+    @patch("src.services.imap_service.select.select")
+    def test_idle_keeps_waiting_through_keepalives(self, mock_select, imap_service, idle_conn):
+        """Untagged responses that do not announce mail do not end IDLE."""
+        mock_select.return_value = ([idle_conn.sock], [], [])
+        idle_conn.readline.side_effect = [
+            b"+ idling\r\n",
+            b"* OK Still here\r\n",
+            b"* 4 EXISTS\r\n",
+            b"A001 OK\r\n",
+        ]
+
+        assert imap_service.idle(timeout=60) is True
+        assert mock_select.call_count == 2
+        assert idle_conn.send.call_args_list[-1][0][0] == b"DONE\r\n"
+
+    @patch("src.services.imap_service.select.select")
+    def test_idle_update_before_continuation(self, mock_select, imap_service, idle_conn):
+        """EXISTS sent ahead of the continuation counts as new mail and ends IDLE at once."""
+        idle_conn.readline.side_effect = [
+            b"* 3 EXISTS\r\n",
+            b"+ idling\r\n",
+            b"A001 OK IDLE terminated\r\n",
+        ]
+
+        assert imap_service.idle() is True
+
+        mock_select.assert_not_called()
+        assert idle_conn.send.call_args_list[-1][0][0] == b"DONE\r\n"
+        assert imap_service.connection is idle_conn
+
+    def test_idle_rejected_raises(self, imap_service, idle_conn):
+        """idle raises IMAPError when the server answers IDLE with a tagged NO/BAD."""
+        idle_conn.readline.side_effect = [
+            b"* OK still here\r\n",
+            b"A001 BAD unknown command\r\n",
+        ]
+
+        with pytest.raises(IMAPError, match="rejected IDLE"):
+            imap_service.idle()
+
+        # The command completed, so the connection is still usable
+        assert imap_service.connection is idle_conn
+
+    def test_idle_unexpected_failure_disconnects(self, imap_service, idle_conn):
+        """Any other failure drops the connection, which may still be idling."""
+        idle_conn.readline.side_effect = [b"+ idling\r\n"]
+
+        with (
+            patch(
+                "src.services.imap_service._wait_for_mailbox_update",
+                side_effect=ValueError("bad response"),
+            ),
+            pytest.raises(IMAPError, match="IDLE failed"),
+        ):
+            imap_service.idle()
+
+        idle_conn.logout.assert_called_once()
+        assert imap_service.connection is None
+
+    @patch("src.services.imap_service.select.select")
+    def test_idle_connection_lost_raises(self, mock_select, imap_service, idle_conn):
+        """idle raises IMAPConnectionError and drops the connection on EOF."""
+        mock_select.return_value = ([], [], [])
+        idle_conn.readline.side_effect = [b"+ idling\r\n", b""]
+
+        with pytest.raises(IMAPConnectionError, match="IDLE failed"):
+            imap_service.idle()
+        assert imap_service.connection is None
+
+
 class TestIMAPServiceDisconnect:
     """Tests for IMAPService.disconnect()."""
 
     def test_disconnect_with_connection(self, imap_service):
         """disconnect closes and logs out."""
-        mock_conn = MagicMock()
+        mock_conn = _mock_conn()
         imap_service.connection = mock_conn
 
         imap_service.disconnect()
@@ -242,7 +848,7 @@ class TestIMAPServiceDisconnect:
 
     def test_disconnect_error_ignored(self, imap_service):
         """disconnect swallows errors."""
-        mock_conn = MagicMock()
+        mock_conn = _mock_conn()
         mock_conn.close.side_effect = Exception("close failed")
         imap_service.connection = mock_conn
 
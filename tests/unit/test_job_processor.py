@@ -1,5 +1,8 @@
 """Unit tests for JobProcessorService."""
 
+import email
+import email.policy
+import functools
 from email import encoders
 from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
@@ -8,13 +11,24 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from src.models.message_summary import MessageSummary
 from src.models.pdf_attachment import PDFAttachment
-from src.services.imap_service import IMAPConnectionError
-from src.services.job_processor import JobProcessorService
-
-
+from src.models.processing_job import ProcessingJob
+from src.services.imap_service import (
+    IMAPConnectionError,
+    IMAPError,
+    IMAPService,
+    MessageParseError,
+)
+from src.services.job_processor import EmailTooLargeError, JobProcessorService
+from src.services.pdf_converter import PDFConverterService
+from src.services.smtp_service import SMTPService
+from src.services.whitelist_service import WhitelistService
+
+
+@functools.cache
 def _build_email_with_pdf(sender="alice@test.com", subject="Invoice", pdf_name="doc.pdf"):
-    """Build raw email bytes with a PDF attachment."""
+    """Build raw email bytes with a PDF attachment (built once per distinct argument set)."""
     msg = MIMEMultipart()
     msg["From"] = sender
     msg["Subject"] = subject
@@ -28,13 +42,24 @@ def _build_email_with_pdf(sender="alice@test.com", subject="Invoice", pdf_name="
     return msg.as_bytes()
 
 
+def _queue(imap, message, size_bytes=1024):
+    """Make message the only unseen email reported by the mocked IMAP service."""
+    imap.fetch_unseen_summaries.return_value = [
+        MessageSummary(
+            uid=message.uid, sender=message.sender, subject=message.subject, size_bytes=size_bytes
+        )
+    ]
+    imap.fetch_message.return_value = message
+
+
 @pytest.fixture()
 def mock_services(config):
     """Create JobProcessorService with all mocked dependencies."""
-    imap = MagicMock()
-    smtp = MagicMock()
-    converter = MagicMock()
-    whitelist = MagicMock()
+    imap = MagicMock(spec_set=IMAPService)
+    imap.supports_idle.return_value = False
+    smtp = MagicMock(spec_set=SMTPService)
+    converter = MagicMock(spec_set=PDFConverterService)
+    whitelist = MagicMock(spec_set=WhitelistService)
     whitelist.is_whitelisted.return_value = True
 
     processor = JobProcessorService(
@@ -65,28 +90,135 @@ class TestProcessNextEmail:
     def test_no_messages(self, mock_services):
         """process_next_email returns when no unseen messages."""
         processor, imap, _, _, _ = mock_services
-        imap.fetch_unseen_messages.return_value = []
+        imap.fetch_unseen_summaries.return_value = []
 
-        processor.process_next_email()
+        assert processor.process_next_email() is False
 
+        imap.fetch_message.assert_not_called()
         imap.delete_message.assert_not_called()
 
     def test_non_whitelisted_sender_ignored(self, mock_services, make_email):
         """Non-whitelisted sender is deleted without processing."""
         processor, imap, smtp, _, whitelist = mock_services
         whitelist.is_whitelisted.return_value = False
-        imap.fetch_unseen_messages.return_value = [make_email(sender="spam@evil.com")]
+        _queue(imap, make_email(sender="spam@evil.com"))
 
-        processor.process_next_email()
+        assert processor.process_next_email() is True
 
-        imap.delete_message.assert_called_once()
+        imap.delete_messages.assert_called_once_with([1], expunge=False)
+        # Never downloaded
+        imap.fetch_message.assert_not_called()
         smtp.send_reply_with_attachments.assert_not_called()
 
+    def test_oversized_email_rejected_before_download(self, mock_services, make_config):
+        """An email above MAX_EMAIL_SIZE_MB is refused from its summary alone."""
+        processor, imap, smtp, converter, _ = mock_services
+        processor.config = make_config(max_email_size_mb=1)
+        imap.fetch_unseen_summaries.return_value = [
+            MessageSummary(uid=9, sender="alice@test.com", subject="Big", size_bytes=2 << 20)
+        ]
+
+        assert processor.process_next_email() is True
+
+        imap.fetch_message.assert_not_called()
+        converter.convert_pdf_to_png.assert_not_called()
+        notification = smtp.send_error_notification.call_args.kwargs
+        assert notification["to_address"] == "alice@test.com"
+        assert isinstance(notification["error"], EmailTooLargeError)
+        assert "2.0 MB" in str(notification["error"])
+        assert notification["context"]["Email Subject"] == "Big"
+        # Kept for manual recovery per NFR-007
+        imap.delete_message.assert_not_called()
+        imap.mark_seen.assert_called_once_with(9)
+
+    def test_email_of_unknown_size_rejected(self, mock_services):
+        """Without RFC822.SIZE the cap cannot be enforced, so the email is refused."""
+        processor, imap, smtp, _, _ = mock_services
+        imap.fetch_unseen_summaries.return_value = [
+            MessageSummary(uid=9, sender="alice@test.com", subject="S", size_bytes=None)
+        ]
+
+        assert processor.process_next_email() is True
+
+        imap.fetch_message.assert_not_called()
+        error = smtp.send_error_notification.call_args.kwargs["error"]
+        assert isinstance(error, EmailTooLargeError)
+        assert "could not be determined" in str(error)
+        imap.mark_seen.assert_called_once_with(9)
+
+    def test_unreadable_headers_set_aside(self, mock_services):
+        """An email whose headers cannot be read is flagged seen so it is not relisted."""
+        processor, imap, smtp, _, whitelist = mock_services
+        imap.fetch_unseen_summaries.return_value = [
+            MessageSummary(
+                uid=4, sender="", subject="(no subject)", size_bytes=10, header_error="bad"
+            )
+        ]
+
+        assert processor.process_next_email() is True
+
+        imap.mark_seen.assert_called_once_with(4)
+        # No sender to notify; not mistaken for a non-whitelisted email either
+        smtp.send_error_notification.assert_not_called()
+        whitelist.is_whitelisted.assert_not_called()
+        imap.delete_messages.assert_not_called()
+        imap.fetch_message.assert_not_called()
+
+    def test_queue_drained_without_relisting(self, mock_services, make_email):
+        """A batch is listed once and then downloaded one message per call."""
+        processor, imap, _, converter, whitelist = mock_services
+        whitelist.is_whitelisted.side_effect = lambda sender: sender != "spam@evil.com"
+        imap.fetch_unseen_summaries.return_value = [
+            MessageSummary(uid=1, sender="alice@test.com", subject="A", size_bytes=100),
+            MessageSummary(uid=2, sender="spam@evil.com", subject="B", size_bytes=100),
+            MessageSummary(uid=3, sender="spam@evil.com", subject="C", size_bytes=100),
+            MessageSummary(uid=4, sender="alice@test.com", subject="D", size_bytes=100),
+        ]
+        imap.fetch_message.return_value = make_email(raw_bytes=_build_email_with_pdf())
+        converter.convert_pdf_to_png.return_value = []
+
+        assert processor.process_next_email() is True
+        imap.fetch_message.assert_called_once_with(1)
+        # Both non-whitelisted messages are flagged with one UID STORE
+        imap.delete_messages.assert_called_once_with([2, 3], expunge=False)
+
+        imap.fetch_message.return_value = make_email(uid=4, raw_bytes=_build_email_with_pdf())
+        assert processor.process_next_email() is True
+        imap.fetch_message.assert_called_with(4)
+        imap.fetch_unseen_summaries.assert_called_once()
+
+        imap.fetch_unseen_summaries.return_value = []
+        assert processor.process_next_email() is False
+        assert imap.fetch_unseen_summaries.call_count == 2
+
+    def test_vanished_message_skipped(self, mock_services, make_email):
+        """A queued message removed by another client is skipped."""
+        processor, imap, smtp, _, _ = mock_services
+        _queue(imap, make_email())
+        imap.fetch_message.return_value = None
+
+        assert processor.process_next_email() is True
+
+        smtp.send_error_notification.assert_not_called()
+        imap.mark_seen.assert_not_called()
+
+    def test_unparseable_message_set_aside(self, mock_services, make_email):
+        """A message that cannot be parsed is reported and flagged seen, not refetched."""
+        processor, imap, smtp, _, _ = mock_services
+        _queue(imap, make_email())
+        imap.fetch_message.side_effect = MessageParseError("Failed to parse message UID 1")
+
+        assert processor.process_next_email() is True
+
+        smtp.send_error_notification.assert_called_once()
+        imap.mark_seen.assert_called_once_with(1)
+        imap.delete_message.assert_not_called()
+
     def test_no_pdf_attachments(self, mock_services, make_email):
         """Email without PDF attachments is deleted."""
         processor, imap, smtp, _, _ = mock_services
         msg = make_email(raw_bytes=b"From: alice@test.com\r\nSubject: Hello\r\n\r\nNo PDFs here")
-        imap.fetch_unseen_messages.return_value = [msg]
+        _queue(imap, msg)
 
         processor.process_next_email()
 
@@ -99,16 +231,72 @@ class TestProcessNextEmail:
 
         raw_email = _build_email_with_pdf()
         msg = make_email(raw_bytes=raw_email)
-        imap.fetch_unseen_messages.return_value = [msg]
+        _queue(imap, msg)
 
         # Converter returns empty list (no actual PNGs since we can't create real files)
         converter.convert_pdf_to_png.return_value = []
 
-        processor.process_next_email()
+        assert processor.process_next_email() is True
 
         converter.convert_pdf_to_png.assert_called_once()
         smtp.send_reply_with_attachments.assert_called_once()
-        imap.delete_message.assert_called_once()
+        imap.delete_message.assert_called_once_with(msg.uid, expunge=False)
+        imap.expunge.assert_not_called()
+        # Raw message bytes are released once PDFs are extracted
+        assert msg.raw_bytes is None
+
+    def test_multiple_pdfs_converted_in_attachment_order(self, mock_services, make_email):
+        """Each PDF is converted in its own directory; PNGs keep attachment order."""
+        processor, imap, smtp, converter, _ = mock_services
+
+        msg = email.message_from_bytes(_build_email_with_pdf(pdf_name="a.pdf"))
+        part = MIMEBase("application", "pdf")
+        part.set_payload(b"%PDF-1.4 second")
+        encoders.encode_base64(part)
+        part.add_header("Content-Disposition", "attachment; filename=b.pdf")
+        msg.attach(part)
+        _queue(imap, make_email(raw_bytes=msg.as_bytes()))
+
+        def convert(pdf_path, output_prefix, temp_dir):
+            assert pdf_path.parent == temp_dir
+            assert pdf_path.exists()
+            return [f"{output_prefix}-1", f"{output_prefix}-2"]
+
+        converter.convert_pdf_to_png.side_effect = convert
+
+        assert processor.process_next_email() is True
+
+        temp_dirs = {c.kwargs["temp_dir"] for c in converter.convert_pdf_to_png.call_args_list}
+        assert len(temp_dirs) == 2
+        attachments = smtp.send_reply_with_attachments.call_args.kwargs["attachments"]
+        assert attachments == ["a-1", "a-2", "b-1", "b-2"]
+
+    def test_conversion_concurrency_capped_by_config(self, make_config, tmp_path):
+        """No more than pdf_max_concurrency conversions run at once."""
+        processor = JobProcessorService(
+            config=make_config(pdf_max_concurrency=2),
+            imap_service=MagicMock(spec_set=IMAPService),
+            smtp_service=MagicMock(spec_set=SMTPService),
+            pdf_converter=MagicMock(spec_set=PDFConverterService),
+            whitelist_service=MagicMock(spec_set=WhitelistService),
+        )
+        pdfs = [
+            PDFAttachment(
+                filename=f"{name}.pdf",
+                sanitized_name=name,
+                path=tmp_path / f"{name}.pdf",
+                size_bytes=1,
+            )
+            for name in ("a", "b", "c", "d")
+        ]
+
+        with (
+            patch("src.services.job_processor.os.cpu_count", return_value=8),
+            patch("src.services.job_processor.ThreadPoolExecutor") as mock_executor,
+        ):
+            processor._convert_pdfs(pdfs)
+
+        mock_executor.assert_called_once_with(max_workers=2)
 
     def test_conversion_error_sends_notification(self, mock_services, make_email):
         """Conversion error triggers error notification email."""
@@ -116,15 +304,16 @@ class TestProcessNextEmail:
 
         raw_email = _build_email_with_pdf()
         msg = make_email(raw_bytes=raw_email)
-        imap.fetch_unseen_messages.return_value = [msg]
+        _queue(imap, msg)
 
         converter.convert_pdf_to_png.side_effect = RuntimeError("conversion failed")
 
         processor.process_next_email()
 
         smtp.send_error_notification.assert_called_once()
-        # Original email NOT deleted on failure
+        # Original email NOT deleted on failure, but flagged so it is not refetched
         imap.delete_message.assert_not_called()
+        imap.mark_seen.assert_called_once_with(msg.uid)
 
     def test_error_notification_failure_logged(self, mock_services, make_email):
         """If error notification itself fails, error is logged but not raised."""
@@ -132,7 +321,7 @@ class TestProcessNextEmail:
 
         raw_email = _build_email_with_pdf()
         msg = make_email(raw_bytes=raw_email)
-        imap.fetch_unseen_messages.return_value = [msg]
+        _queue(imap, msg)
 
         converter.convert_pdf_to_png.side_effect = RuntimeError("conversion failed")
         smtp.send_error_notification.side_effect = Exception("SMTP down")
@@ -140,36 +329,155 @@ class TestProcessNextEmail:
         # Should not raise despite double failure
         processor.process_next_email()
 
+    def test_mark_seen_failure_logged(self, mock_services, make_email):
+        """If flagging the failed email as seen fails, error is logged but not raised."""
+        processor, imap, _, converter, _ = mock_services
+
+        _queue(imap, make_email(raw_bytes=_build_email_with_pdf()))
+        converter.convert_pdf_to_png.side_effect = RuntimeError("conversion failed")
+        imap.mark_seen.side_effect = Exception("IMAP down")
+
+        assert processor.process_next_email() is False
+
+        imap.mark_seen.assert_called_once()
+
     def test_fetch_error_propagates(self, mock_services):
         """Fatal fetch error is re-raised."""
         processor, imap, _, _, _ = mock_services
-        imap.fetch_unseen_messages.side_effect = RuntimeError("IMAP broken")
+        imap.fetch_unseen_summaries.side_effect = RuntimeError("IMAP broken")
 
         with pytest.raises(RuntimeError, match="IMAP broken"):
             processor.process_next_email()
 
 
+class TestFlushDeletions:
+    """Tests for deferred EXPUNGE handling."""
+
+    def test_flush_after_delete_expunges_once(self, mock_services, make_email):
+        """flush_deletions expunges once after several deletions."""
+        processor, imap, _, _, whitelist = mock_services
+        whitelist.is_whitelisted.return_value = False
+        _queue(imap, make_email(sender="spam@evil.com"))
+
+        processor.process_next_email()
+        processor.process_next_email()
+        processor.flush_deletions()
+
+        assert imap.delete_messages.call_count == 2
+        imap.expunge.assert_called_once()
+
+    def test_flush_without_deletions_is_noop(self, mock_services):
+        """flush_deletions does nothing when no message was deleted."""
+        processor, imap, _, _, _ = mock_services
+
+        processor.flush_deletions()
+
+        imap.expunge.assert_not_called()
+
+
 class TestExtractPdfAttachments:
     """Tests for _extract_pdf_attachments."""
 
-    def test_extract_pdf(self, mock_services, make_email):
+    @pytest.fixture(scope="class")
+    def processor(self, config):
+        """One processor for the class; extraction never calls the other services."""
+        return JobProcessorService(
+            config=config,
+            imap_service=MagicMock(spec_set=IMAPService),
+            smtp_service=MagicMock(spec_set=SMTPService),
+            pdf_converter=MagicMock(spec_set=PDFConverterService),
+            whitelist_service=MagicMock(spec_set=WhitelistService),
+        )
+
+    def test_extract_pdf(self, processor, make_email, tmp_path):
         """Extracts PDF attachments from email."""
-        processor, _, _, _, _ = mock_services
         raw_email = _build_email_with_pdf(pdf_name="invoice.pdf")
         msg = make_email(raw_bytes=raw_email)
 
-        attachments = processor._extract_pdf_attachments(msg)
+        attachments = processor._extract_pdf_attachments(msg, tmp_path)
 
         assert len(attachments) == 1
         assert attachments[0].filename == "invoice.pdf"
         assert isinstance(attachments[0], PDFAttachment)
+        # Decoded straight to disk
+        assert attachments[0].path.read_bytes() == b"%PDF-1.4 fake content"
+        assert attachments[0].size_bytes == len(b"%PDF-1.4 fake content")
+        assert attachments[0].path.parent.parent == tmp_path
+
+    def test_extract_strips_directories_from_filename(self, processor, make_email, tmp_path):
+        """A filename with path components cannot write outside the temp directory."""
+        msg = make_email(raw_bytes=_build_email_with_pdf(pdf_name='"../../escape.pdf"'))
+
+        attachments = processor._extract_pdf_attachments(msg, tmp_path)
+
+        assert attachments[0].path.name == "escape.pdf"
+        assert attachments[0].path.parent.parent == tmp_path
+
+    def test_extract_reuses_parsed_tree(self, processor, make_email, tmp_path):
+        """Uses the message tree parsed at fetch time instead of re-parsing raw bytes."""
+        parsed = email.message_from_bytes(
+            _build_email_with_pdf(pdf_name="parsed.pdf"), policy=email.policy.compat32
+        )
+        msg = make_email(raw_bytes=b"From: a@b.com\r\n\r\nnot the real message", parsed=parsed)
+
+        attachments = processor._extract_pdf_attachments(msg, tmp_path)
+
+        assert [a.filename for a in attachments] == ["parsed.pdf"]
 
-    def test_extract_no_pdf(self, mock_services, make_email):
+    def test_extract_decodes_encoded_filename(self, processor, make_email, tmp_path):
+        """RFC 2047 encoded attachment filenames are decoded."""
+        raw_email = _build_email_with_pdf(pdf_name='"=?utf-8?q?r=C3=A9sum=C3=A9.pdf?="')
+        msg = make_email(raw_bytes=raw_email)
+
+        attachments = processor._extract_pdf_attachments(msg, tmp_path)
+
+        assert attachments[0].filename == "r\u00e9sum\u00e9.pdf"
+
+    def test_extract_stops_decoding_oversized_pdf(self, processor, make_email, tmp_path):
+        """Decoding stops once a PDF exceeds the size cap, which is then rejected."""
+        msg = make_email(raw_bytes=_build_email_with_pdf())
+
+        with (
+            patch.object(PDFAttachment, "MAX_SIZE_BYTES", 4),
+            patch("src.utils.email_utils._BASE64_CHUNK_CHARS", 8),
+            pytest.raises(ValueError, match="PDF must be <"),
+        ):
+            processor._extract_pdf_attachments(msg, tmp_path)
+
+        (written,) = tmp_path.glob("*/doc.pdf")
+        assert written.read_bytes() == b"%PDF-1"
+
+    def test_extract_tolerates_8bit_transfer_encoding(self, processor, make_email, tmp_path):
+        """A raw 8-bit Content-Transfer-Encoding is not fatal; the payload is kept undecoded."""
+        raw_email = (
+            b"From: a@b.com\r\n"
+            b'Content-Type: multipart/mixed; boundary="b"\r\n\r\n'
+            b"--b\r\n"
+            b"Content-Type: application/pdf\r\n"
+            b"Content-Transfer-Encoding: base64\xff\r\n"
+            b'Content-Disposition: attachment; filename="doc.pdf"\r\n\r\n'
+            b"JVBERi0xLjQ=\r\n"
+            b"--b--\r\n"
+        )
+        msg = make_email(raw_bytes=raw_email)
+
+        attachments = processor._extract_pdf_attachments(msg, tmp_path)
+
+        assert attachments[0].path.read_bytes() == b"JVBERi0xLjQ="
+
+    def test_extract_released_message_raises(self, processor, make_email, tmp_path):
+        """A released message is reported, not parsed as an empty message."""
+        msg = make_email(raw_bytes=_build_email_with_pdf())
+        ProcessingJob(email_message=msg).release_raw()
+
+        with pytest.raises(ValueError, match="released"):
+            processor._extract_pdf_attachments(msg, tmp_path)
+
+    def test_extract_no_pdf(self, processor, make_email, tmp_path):
         """Returns empty list when no PDF attachments."""
-        processor, _, _, _, _ = mock_services
         msg = make_email(raw_bytes=b"From: a@b.com\r\nSubject: Hi\r\n\r\nNo attachments")
 
-        attachments = processor._extract_pdf_attachments(msg)
+        attachments = processor._extract_pdf_attachments(msg, tmp_path)
         assert attachments == []
 
 
@@ -209,6 +517,22 @@ class TestRunDaemon:
 
         imap.connect_with_backoff.assert_called_once()
 
+    @patch("src.services.job_processor.time.sleep")
+    def test_daemon_imap_error_drops_queue(self, _mock_sleep, mock_services):
+        """Queued UIDs are discarded after an IMAP error and the INBOX is listed again."""
+        processor, imap, _, _, _ = mock_services
+        imap.fetch_unseen_summaries.return_value = [
+            MessageSummary(uid=1, sender="alice@test.com", subject="A", size_bytes=100),
+            MessageSummary(uid=2, sender="alice@test.com", subject="B", size_bytes=100),
+        ]
+        imap.fetch_message.side_effect = [IMAPError("fetch failed"), KeyboardInterrupt]
+
+        with pytest.raises(KeyboardInterrupt):
+            processor.run_daemon()
+
+        assert imap.fetch_unseen_summaries.call_count == 2
+        assert [c[0][0] for c in imap.fetch_message.call_args_list] == [1, 1]
+
     @patch("src.services.job_processor.time.sleep")
     def test_daemon_general_error_continues(self, mock_sleep, mock_services):
         """Daemon continues after general errors."""
@@ -252,3 +576,91 @@ class TestRunDaemon:
             pytest.raises(KeyboardInterrupt),
         ):
             processor.run_daemon()
+
+    @patch("src.services.job_processor.time.sleep")
+    def test_daemon_uses_idle_when_supported(self, mock_sleep, mock_services):
+        """Daemon waits in IMAP IDLE instead of sleeping when the server supports it."""
+        processor, imap, _, _, _ = mock_services
+        imap.supports_idle.return_value = True
+
+        with (
+            patch.object(processor, "process_next_email", side_effect=[False, KeyboardInterrupt]),
+            pytest.raises(KeyboardInterrupt),
+        ):
+            processor.run_daemon()
+
+        imap.idle.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch("src.services.job_processor.time.sleep")
+    def test_daemon_flushes_deletions_when_batch_ends(self, _mock_sleep, mock_services):
+        """Daemon expunges once the inbox has been drained."""
+        processor, _, _, _, _ = mock_services
+
+        with (
+            patch.object(
+                processor, "process_next_email", side_effect=[True, False, KeyboardInterrupt]
+            ),
+            patch.object(processor, "flush_deletions") as mock_flush,
+            pytest.raises(KeyboardInterrupt),
+        ):
+            processor.run_daemon()
+
+        mock_flush.assert_called_once()
+
+    @patch("src.services.job_processor.time.sleep")
+    def test_daemon_idle_failure_falls_back_to_sleep(self, mock_sleep, mock_services):
+        """Daemon sleeps for the polling interval when IDLE fails."""
+        processor, imap, _, _, _ = mock_services
+        imap.supports_idle.return_value = True
+        imap.idle.side_effect = IMAPError("IDLE rejected")
+
+        with (
+            patch.object(processor, "process_next_email", side_effect=[False, KeyboardInterrupt]),
+            pytest.raises(KeyboardInterrupt),
+        ):
+            processor.run_daemon()
+
+        mock_sleep.assert_called_once_with(processor.config.polling_interval_seconds)
+
+    @patch("src.services.job_processor.time.sleep")
+    def test_polling_sleep_sends_keepalive(self, mock_sleep, make_config):
+        """Long polling waits are split with IMAP NOOPs in between."""
+        imap = MagicMock(spec_set=IMAPService)
+        processor = JobProcessorService(
+            config=make_config(polling_interval_seconds=600, max_retry_interval_seconds=900),
+            imap_service=imap,
+            smtp_service=MagicMock(spec_set=SMTPService),
+            pdf_converter=MagicMock(spec_set=PDFConverterService),
+            whitelist_service=MagicMock(spec_set=WhitelistService),
+        )
+
+        processor._sleep_with_keepalive(600)
+
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [240, 240, 120]
+        assert imap.noop.call_count == 2
+
+    @patch("src.services.job_processor.time.sleep")
+    def test_polling_sleep_stops_on_keepalive_failure(self, mock_sleep, mock_services):
+        """A failed NOOP ends the wait so the daemon can reconnect."""
+        processor, imap, _, _, _ = mock_services
+        imap.noop.side_effect = IMAPConnectionError("dropped")
+
+        processor._sleep_with_keepalive(600)
+
+        mock_sleep.assert_called_once_with(240)
+
+    @patch("src.services.job_processor.time.sleep")
+    def test_daemon_drains_without_waiting(self, mock_sleep, mock_services):
+        """Daemon processes the next message immediately after consuming one."""
+        processor, _, _, _, _ = mock_services
+
+        with (
+            patch.object(
+                processor, "process_next_email", side_effect=[True, True, KeyboardInterrupt]
+            ),
+            pytest.raises(KeyboardInterrupt),
+        ):
+            processor.run_daemon()
+
+        mock_sleep.assert_not_called()
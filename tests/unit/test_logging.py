@@ -0,0 +1,61 @@
+"""Unit tests for logging setup."""
+
+import io
+import logging
+
+from src.utils.logging import TRACEBACK_LIMIT, get_logger
+
+
+class TestLoggedTracebacks:
+    """Tests for traceback formatting in log records."""
+
+    def test_exception_logs_only_innermost_frames(self):
+        """logger.exception keeps the failing frame and drops the outer ones."""
+        stream = io.StringIO()
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(get_logger().handlers[0].formatter)
+        logger = logging.getLogger("test_bounded_tracebacks")
+        logger.addHandler(handler)
+        logger.propagate = False
+
+        def recurse(depth):
+            if depth == 0:
+                raise RuntimeError("deep failure")
+            recurse(depth - 1)
+
+        try:
+            recurse(TRACEBACK_LIMIT * 2)
+        except RuntimeError:
+            logger.exception("Processing failed")
+        finally:
+            logger.removeHandler(handler)
+            logger.propagate = True
+
+        output = stream.getvalue()
+        assert "Processing failed" in output
+        assert "RuntimeError: deep failure" in output
+        assert 'raise RuntimeError("deep failure")' in output
+        assert "recurse(TRACEBACK_LIMIT * 2)" not in output
+        assert output.count("in recurse") <= TRACEBACK_LIMIT
+
+
+class TestLogRecordFields:
+    """Tests for the LogRecord attributes collected per message."""
+
+    def test_unused_record_fields_not_collected(self):
+        """Caller, thread and process details are skipped; the message is kept."""
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        logger = get_logger()
+        logger.addHandler(handler)
+        try:
+            logger.error("Failed to send reply: %s", "timeout")
+        finally:
+            logger.removeHandler(handler)
+
+        record = records[0]
+        assert record.getMessage() == "Failed to send reply: timeout"
+        assert record.funcName == "(unknown function)"
+        assert record.threadName is None
+        assert record.processName is None
@@ -1,11 +1,13 @@
 """Unit tests for all model dataclasses."""
 
-import tempfile
-from datetime import datetime, timezone
+import dataclasses
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from src.models.message_summary import MessageSummary
 from src.models.pdf_attachment import PDFAttachment
 from src.models.png_image import PNGImage
 from src.models.processing_job import JobStatus, ProcessingJob
@@ -25,25 +27,47 @@ class TestEmailMessage:
         assert msg.sender == "alice@test.com"
         assert msg.subject == "Test PDF"
 
-    def test_invalid_uid_raises(self, make_email):
-        """UID <= 0 raises ValueError."""
-        with pytest.raises(ValueError, match="UID must be positive"):
-            make_email(uid=0)
+    @pytest.mark.parametrize(
+        ("overrides", "match"),
+        [
+            pytest.param({"uid": 0}, "UID must be positive", id="zero-uid"),
+            pytest.param({"uid": -5}, "UID must be positive", id="negative-uid"),
+            pytest.param({"sender": "not-an-email"}, "valid email", id="sender-without-at"),
+            pytest.param({"raw_bytes": b""}, "Raw bytes must not be empty", id="empty-raw-bytes"),
+        ],
+    )
+    def test_invalid_field_raises(self, make_email, overrides, match):
+        """Invalid UID, sender or raw bytes raise ValueError."""
+        with pytest.raises(ValueError, match=match):
+            make_email(**overrides)
+
+
+# --- MessageSummary tests ---
+
+
+class TestMessageSummary:
+    """Tests for MessageSummary model."""
 
-    def test_negative_uid_raises(self, make_email):
-        """Negative UID raises ValueError."""
+    def test_valid_summary(self):
+        """A summary needs no valid sender, unlike EmailMessage."""
+        summary = MessageSummary(uid=3, sender="", subject="(no subject)", size_bytes=0)
+        assert summary.uid == 3
+
+    def test_invalid_uid_raises(self):
+        """Non-positive UID raises ValueError."""
         with pytest.raises(ValueError, match="UID must be positive"):
-            make_email(uid=-5)
+            MessageSummary(uid=0, sender="a@b.com", subject="s", size_bytes=1)
 
-    def test_invalid_sender_raises(self, make_email):
-        """Sender without @ raises ValueError."""
-        with pytest.raises(ValueError, match="valid email"):
-            make_email(sender="not-an-email")
+    def test_negative_size_raises(self):
+        """Negative size raises ValueError."""
+        with pytest.raises(ValueError, match="Size must not be negative"):
+            MessageSummary(uid=1, sender="a@b.com", subject="s", size_bytes=-1)
 
-    def test_empty_raw_bytes_raises(self, make_email):
-        """Empty raw_bytes raises ValueError."""
-        with pytest.raises(ValueError, match="Raw bytes must not be empty"):
-            make_email(raw_bytes=b"")
+    def test_unknown_size_allowed(self):
+        """A size the server did not report is kept as None."""
+        summary = MessageSummary(uid=1, sender="a@b.com", subject="s", size_bytes=None)
+        assert summary.size_bytes is None
+        assert summary.header_error is None
 
 
 # --- PDFAttachment tests ---
@@ -57,50 +81,31 @@ class TestPDFAttachment:
         pdf = PDFAttachment(
             filename="invoice.pdf",
             sanitized_name="invoice",
-            content=b"%PDF-1.4 content",
+            path=Path("/tmp/doc.pdf"),
             size_bytes=100,
         )
         assert pdf.filename == "invoice.pdf"
         assert pdf.page_count is None
 
-    def test_non_pdf_extension_raises(self):
-        """Non-.pdf filename raises ValueError."""
-        with pytest.raises(ValueError, match="pdf extension"):
-            PDFAttachment(
-                filename="document.docx",
-                sanitized_name="document",
-                content=b"content",
-                size_bytes=7,
-            )
-
-    def test_empty_pdf_raises(self):
-        """Zero-size PDF raises ValueError."""
-        with pytest.raises(ValueError, match="must not be empty"):
-            PDFAttachment(
-                filename="empty.pdf",
-                sanitized_name="empty",
-                content=b"",
-                size_bytes=0,
-            )
-
-    def test_oversized_pdf_raises(self):
-        """PDF > 100MB raises ValueError."""
-        with pytest.raises(ValueError, match="100MB"):
-            PDFAttachment(
-                filename="huge.pdf",
-                sanitized_name="huge",
-                content=b"x",
-                size_bytes=200 * 1024 * 1024,
-            )
-
-    def test_invalid_sanitized_name_raises(self):
-        """Sanitized name with special chars raises ValueError."""
-        with pytest.raises(ValueError, match="alphanumeric"):
+    @pytest.mark.parametrize(
+        ("filename", "sanitized_name", "size_bytes", "match"),
+        [
+            pytest.param("document.docx", "document", 7, "pdf extension", id="non-pdf-extension"),
+            pytest.param("empty.pdf", "empty", 0, "must not be empty", id="empty"),
+            pytest.param("huge.pdf", "huge", 200 * 1024 * 1024, "100MB", id="oversized"),
+            pytest.param("test.pdf", "test file!", 3, "alphanumeric", id="special-chars-in-name"),
+            # Restricted to the ASCII set sanitize_filename emits
+            pytest.param("caf\u00e9.pdf", "caf\u00e9", 3, "alphanumeric", id="non-ascii-name"),
+        ],
+    )
+    def test_invalid_attachment_raises(self, filename, sanitized_name, size_bytes, match):
+        """Bad extension, size or sanitized name raises ValueError."""
+        with pytest.raises(ValueError, match=match):
             PDFAttachment(
-                filename="test.pdf",
-                sanitized_name="test file!",
-                content=b"pdf",
-                size_bytes=3,
+                filename=filename,
+                sanitized_name=sanitized_name,
+                path=Path("/tmp/doc.pdf"),
+                size_bytes=size_bytes,
             )
 
     def test_page_count_optional(self):
@@ -108,7 +113,7 @@ class TestPDFAttachment:
         pdf = PDFAttachment(
             filename="a.pdf",
             sanitized_name="a",
-            content=b"data",
+            path=Path("/tmp/doc.pdf"),
             size_bytes=4,
         )
         assert pdf.page_count is None
@@ -119,107 +124,123 @@ class TestPDFAttachment:
 # --- PNGImage tests ---
 
 
+@pytest.fixture(scope="module")
+def png_stub(tmp_path_factory):
+    """One PNG file shared by the PNGImage tests; none of them modify it."""
+    png_path = tmp_path_factory.mktemp("png_stub") / "test.png"
+    png_path.write_bytes(b"\x89PNG fake content")
+    return png_path
+
+
 class TestPNGImage:
     """Tests for PNGImage dataclass."""
 
-    def test_valid_png_image(self):
+    def test_valid_png_image(self, png_stub):
         """Valid PNGImage is created when file exists."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            png_path = Path(tmpdir) / "test.png"
-            png_path.write_bytes(b"\x89PNG fake content")
+        img = PNGImage(
+            path=png_stub,
+            filename="test.png",
+            source_pdf="doc.pdf",
+            page_number=1,
+            size_bytes=17,
+            resolution=(1920, 1080),
+            density_dpi=300,
+        )
+        assert img.page_number == 1
+        assert img.resolution == (1920, 1080)
+
+    def test_png_image_is_immutable(self, png_stub):
+        """Fields cannot be reassigned once validated."""
+        img = PNGImage(
+            path=png_stub,
+            filename="test.png",
+            source_pdf="doc.pdf",
+            page_number=1,
+            size_bytes=17,
+            resolution=(1920, 1080),
+            density_dpi=300,
+        )
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            img.page_number = 2
 
-            img = PNGImage(
-                path=png_path,
+    def test_nonexistent_path_raises(self):
+        """PNGImage with non-existent path raises ValueError."""
+        with pytest.raises(ValueError, match="must exist"):
+            PNGImage(
+                path=Path("/nonexistent/test.png"),
                 filename="test.png",
                 source_pdf="doc.pdf",
                 page_number=1,
-                size_bytes=17,
+                size_bytes=100,
                 resolution=(1920, 1080),
                 density_dpi=300,
             )
-            assert img.page_number == 1
-            assert img.resolution == (1920, 1080)
 
-    def test_nonexistent_path_raises(self):
-        """PNGImage with non-existent path raises ValueError."""
-        with pytest.raises(ValueError, match="must exist"):
+    def test_validate_fs_false_skips_existence_check(self):
+        """validate_fs=False accepts a path without touching the filesystem."""
+        img = PNGImage(
+            path=Path("/nonexistent/test.png"),
+            filename="test.png",
+            source_pdf="doc.pdf",
+            page_number=1,
+            size_bytes=100,
+            resolution=(1920, 1080),
+            density_dpi=300,
+            validate_fs=False,
+        )
+        assert img.path == Path("/nonexistent/test.png")
+
+    def test_zero_size_raises(self, png_stub):
+        """PNGImage with zero size raises ValueError."""
+        with pytest.raises(ValueError, match="must not be empty"):
             PNGImage(
-                path=Path("/nonexistent/test.png"),
+                path=png_stub,
                 filename="test.png",
                 source_pdf="doc.pdf",
                 page_number=1,
-                size_bytes=100,
+                size_bytes=0,
                 resolution=(1920, 1080),
                 density_dpi=300,
             )
 
-    def test_zero_size_raises(self):
-        """PNGImage with zero size raises ValueError."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            png_path = Path(tmpdir) / "test.png"
-            png_path.write_bytes(b"x")
-
-            with pytest.raises(ValueError, match="must not be empty"):
-                PNGImage(
-                    path=png_path,
-                    filename="test.png",
-                    source_pdf="doc.pdf",
-                    page_number=1,
-                    size_bytes=0,
-                    resolution=(1920, 1080),
-                    density_dpi=300,
-                )
-
-    def test_invalid_resolution_raises(self):
+    def test_invalid_resolution_raises(self, png_stub):
         """PNGImage with zero resolution raises ValueError."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            png_path = Path(tmpdir) / "test.png"
-            png_path.write_bytes(b"x")
-
-            with pytest.raises(ValueError, match="Resolution"):
-                PNGImage(
-                    path=png_path,
-                    filename="test.png",
-                    source_pdf="doc.pdf",
-                    page_number=1,
-                    size_bytes=1,
-                    resolution=(0, 1080),
-                    density_dpi=300,
-                )
-
-    def test_invalid_dpi_raises(self):
+        with pytest.raises(ValueError, match="Resolution"):
+            PNGImage(
+                path=png_stub,
+                filename="test.png",
+                source_pdf="doc.pdf",
+                page_number=1,
+                size_bytes=1,
+                resolution=(0, 1080),
+                density_dpi=300,
+            )
+
+    def test_invalid_dpi_raises(self, png_stub):
         """PNGImage with zero DPI raises ValueError."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            png_path = Path(tmpdir) / "test.png"
-            png_path.write_bytes(b"x")
-
-            with pytest.raises(ValueError, match="DPI"):
-                PNGImage(
-                    path=png_path,
-                    filename="test.png",
-                    source_pdf="doc.pdf",
-                    page_number=1,
-                    size_bytes=1,
-                    resolution=(1920, 1080),
-                    density_dpi=0,
-                )
-
-    def test_invalid_page_number_raises(self):
+        with pytest.raises(ValueError, match="DPI"):
+            PNGImage(
+                path=png_stub,
+                filename="test.png",
+                source_pdf="doc.pdf",
+                page_number=1,
+                size_bytes=1,
+                resolution=(1920, 1080),
+                density_dpi=0,
+            )
+
+    def test_invalid_page_number_raises(self, png_stub):
         """PNGImage with page_number < 1 raises ValueError."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            png_path = Path(tmpdir) / "test.png"
-            png_path.write_bytes(b"x")
-
-            with pytest.raises(ValueError, match="Page number"):
-                PNGImage(
-                    path=png_path,
-                    filename="test.png",
-                    source_pdf="doc.pdf",
-                    page_number=0,
-                    size_bytes=1,
-                    resolution=(1920, 1080),
-                    density_dpi=300,
-                )
+        with pytest.raises(ValueError, match="Page number"):
+            PNGImage(
+                path=png_stub,
+                filename="test.png",
+                source_pdf="doc.pdf",
+                page_number=0,
+                size_bytes=1,
+                resolution=(1920, 1080),
+                density_dpi=300,
+            )
 
 
 # --- ProcessingJob tests ---
@@ -257,6 +278,17 @@ class TestProcessingJob:
         assert job.duration_seconds is not None
         assert job.duration_seconds >= 0
 
+    def test_duration_uses_monotonic_clock(self, email_msg):
+        """duration_seconds is measured on the monotonic clock, not wall time."""
+        job = ProcessingJob(email_message=email_msg)
+        with patch(
+            "src.models.processing_job.time.monotonic",
+            return_value=job._started_monotonic + 2.5,
+        ):
+            job.mark_completed()
+        assert job.duration_seconds == pytest.approx(2.5)
+        assert job.completed_at - job.started_at == timedelta(seconds=job.duration_seconds)
+
     def test_mark_failed(self, email_msg):
         """mark_failed transitions to FAILED with error and timestamp."""
         job = ProcessingJob(email_message=email_msg)
@@ -267,6 +299,13 @@ class TestProcessingJob:
         assert job.completed_at is not None
         assert job.duration_seconds >= 0
 
+    def test_release_raw(self, email_msg):
+        """release_raw drops the raw message bytes."""
+        job = ProcessingJob(email_message=email_msg)
+        job.release_raw()
+        assert job.email_message.raw_bytes is None
+        assert job.email_message.parsed is None
+
     def test_completed_with_error_raises(self, email_msg):
         """Completed status with error set raises ValueError."""
         with pytest.raises(ValueError, match="must not have errors"):
@@ -287,6 +326,12 @@ class TestProcessingJob:
                 completed_at=early,
             )
 
+    def test_models_use_slots(self, email_msg):
+        """Model instances carry no per-instance __dict__."""
+        job = ProcessingJob(email_message=email_msg)
+        assert not hasattr(job, "__dict__")
+        assert not hasattr(email_msg, "__dict__")
+
     def test_job_status_enum(self):
         """JobStatus enum has expected values."""
         assert JobStatus.PENDING.value == "pending"
@@ -36,6 +36,22 @@ def test_sanitize_filename_truncates_to_50_chars():
 def test_sanitize_filename_no_extension():
     """sanitize_filename handles filenames without extension."""
     assert sanitize_filename("readme") == "readme"
+    assert sanitize_filename("archive.tar.gz") == "archive_tar"
+    assert sanitize_filename(".pdf") == "unnamed"
+
+
+def test_sanitize_filename_collapses_mixed_runs():
+    """Existing underscores and replaced characters collapse into one underscore."""
+    assert sanitize_filename("a__b (_c_) - d.pdf") == "a_b_c_-_d"
+    assert sanitize_filename("__lead_and_trail__.pdf") == "lead_and_trail"
+
+
+def test_sanitize_filename_clean_names_unchanged():
+    """Names that are already safe come back as-is; non-ASCII letters are still replaced."""
+    assert sanitize_filename("invoice-2024.pdf") == "invoice-2024"
+    assert sanitize_filename("Rechnung.pdf") == "Rechnung"
+    assert sanitize_filename("caf\u00e9.pdf") == "caf"
+    assert sanitize_filename("-.pdf") == "-"
 
 
 def test_sanitize_filename_empty_becomes_unnamed():
@@ -52,6 +68,18 @@ def test_pdf_converter_default_config():
     assert converter.timeout == 120
 
 
+def test_pdf_converter_defaults_follow_configuration(make_config):
+    """Without a config the converter matches a Configuration left at its defaults."""
+    default_config = make_config()
+    converter = PDFConverterService()
+    configured = PDFConverterService(default_config)
+
+    assert converter.target_resolution == configured.target_resolution
+    assert converter.target_dpi == configured.target_dpi
+    assert converter.background == configured.background
+    assert converter.timeout == configured.timeout
+
+
 def test_pdf_converter_with_config(config):
     """PDFConverterService uses config values."""
     converter = PDFConverterService(config)
@@ -62,51 +90,42 @@ def test_pdf_converter_with_config(config):
     assert converter.target_dpi == config.pdf_density_dpi
 
 
-def test_pdf_converter_raises_error_on_corrupted_pdf():
-    """PDFConverterService raises PDFCorruptedError on malformed PDF."""
-    converter = PDFConverterService()
-    mock_result = subprocess.CompletedProcess(
-        args=[], returncode=1, stdout="", stderr="Error: corrupted PDF file"
-    )
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        corrupted_pdf = Path(tmpdir) / "corrupted.pdf"
-        corrupted_pdf.write_bytes(b"This is not a valid PDF file")
-
-        with (
-            patch("subprocess.run", return_value=mock_result),
-            pytest.raises(PDFCorruptedError),
-        ):
-            converter.convert_pdf_to_png(
-                pdf_path=corrupted_pdf, output_prefix="test", temp_dir=Path(tmpdir)
-            )
-
-
-def test_pdf_converter_raises_error_on_encrypted_pdf():
-    """PDFConverterService raises PDFPasswordProtectedError on encrypted PDF."""
+@pytest.mark.parametrize(
+    ("stderr", "expected_exc", "message"),
+    [
+        (b"Error: corrupted PDF file", PDFCorruptedError, "PDF is corrupted or malformed"),
+        (b"This PDF is password protected", PDFPasswordProtectedError, "password-protected"),
+        # Matched case-insensitively; encryption wins over the generic "error" keyword
+        (b"**** Error: File is ENCRYPTED", PDFPasswordProtectedError, "password-protected"),
+        (b"some unknown failure", PDFConversionError, "ImageMagick conversion failed"),
+    ],
+)
+def test_pdf_converter_maps_stderr_to_error(stderr, expected_exc, message):
+    """A failed magick run raises the error type matching its stderr."""
     converter = PDFConverterService()
-    mock_result = subprocess.CompletedProcess(
-        args=[], returncode=1, stdout="", stderr="This PDF is password protected"
-    )
+    mock_result = subprocess.CompletedProcess(args=[], returncode=1, stdout=b"", stderr=stderr)
 
     with tempfile.TemporaryDirectory() as tmpdir:
-        pdf_path = Path(tmpdir) / "encrypted.pdf"
-        pdf_path.write_bytes(b"fake encrypted pdf")
+        pdf_path = Path(tmpdir) / "test.pdf"
+        pdf_path.write_bytes(b"fake pdf")
 
         with (
             patch("subprocess.run", return_value=mock_result),
-            pytest.raises(PDFPasswordProtectedError),
+            pytest.raises(PDFConversionError, match=message) as exc_info,
         ):
             converter.convert_pdf_to_png(
                 pdf_path=pdf_path, output_prefix="test", temp_dir=Path(tmpdir)
             )
 
+    assert exc_info.type is expected_exc
 
-def test_pdf_converter_generic_error():
-    """PDFConverterService raises PDFConversionError on generic failure."""
+
+def test_pdf_converter_error_quotes_only_stderr_tail():
+    """Conversion errors quote the end of stderr, and stdout is not captured."""
     converter = PDFConverterService()
+    noise = b"GPL Ghostscript: warning, ignoring broken xref\n" * 500
     mock_result = subprocess.CompletedProcess(
-        args=[], returncode=1, stdout="", stderr="some unknown failure"
+        args=[], returncode=1, stdout=None, stderr=noise + b"fatal: out of resources"
     )
 
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -114,13 +133,19 @@ def test_pdf_converter_generic_error():
         pdf_path.write_bytes(b"fake pdf")
 
         with (
-            patch("subprocess.run", return_value=mock_result),
-            pytest.raises(PDFConversionError, match="ImageMagick conversion failed"),
+            patch("subprocess.run", return_value=mock_result) as mock_run,
+            pytest.raises(PDFConversionError) as exc_info,
         ):
             converter.convert_pdf_to_png(
                 pdf_path=pdf_path, output_prefix="test", temp_dir=Path(tmpdir)
             )
 
+    message = str(exc_info.value)
+    assert message.endswith("fatal: out of resources")
+    assert len(message) < len(noise)
+    assert mock_run.call_args.kwargs["stdout"] is subprocess.DEVNULL
+    assert "text" not in mock_run.call_args.kwargs
+
 
 def test_pdf_converter_file_not_found():
     """PDFConverterService raises on non-existent PDF."""
@@ -174,7 +199,7 @@ def test_pdf_converter_magick_not_found():
 def test_pdf_converter_no_pngs_generated():
     """PDFConverterService raises when conversion produces no PNGs."""
     converter = PDFConverterService()
-    mock_result = subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr="")
+    mock_result = subprocess.CompletedProcess(args=[], returncode=0, stdout=b"", stderr=b"")
 
     with tempfile.TemporaryDirectory() as tmpdir:
         pdf_path = Path(tmpdir) / "empty.pdf"
@@ -192,7 +217,7 @@ def test_pdf_converter_no_pngs_generated():
 def test_pdf_converter_success():
     """PDFConverterService returns PNGImage list on success."""
     converter = PDFConverterService()
-    mock_result = subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr="")
+    mock_result = subprocess.CompletedProcess(args=[], returncode=0, stdout=b"", stderr=b"")
 
     with tempfile.TemporaryDirectory() as tmpdir:
         tmpdir_path = Path(tmpdir)
@@ -215,3 +240,82 @@ def test_pdf_converter_success():
         assert images[1].page_number == 2
         assert images[0].source_pdf == "doc.pdf"
         assert images[0].resolution == (1920, 1080)
+
+
+def test_pdf_converter_command_uses_config(config):
+    """The magick command line carries the configured geometry, DPI and background."""
+    converter = PDFConverterService(config)
+    geometry = f"{config.pdf_resolution_width}x{config.pdf_resolution_height}!"
+    mock_result = subprocess.CompletedProcess(args=[], returncode=0, stdout=b"", stderr=b"")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir_path = Path(tmpdir)
+        pdf_path = tmpdir_path / "doc.pdf"
+        pdf_path.write_bytes(b"fake pdf")
+        (tmpdir_path / "doc_pdf-000.png").write_bytes(b"\x89PNG page1")
+
+        with patch("subprocess.run", return_value=mock_result) as mock_run:
+            converter.convert_pdf_to_png(
+                pdf_path=pdf_path, output_prefix="doc", temp_dir=tmpdir_path
+            )
+
+    assert mock_run.call_args[0][0] == [
+        "magick",
+        "-density",
+        str(config.pdf_density_dpi),
+        str(pdf_path),
+        "-resize",
+        geometry,
+        "-extent",
+        geometry,
+        "-gravity",
+        "center",
+        "-background",
+        config.pdf_background,
+        str(tmpdir_path / "doc_pdf-%03d.png"),
+    ]
+
+
+def test_pdf_converter_orders_pages_beyond_999(tmp_path):
+    """Pages keep their order past the 3-digit index and unrelated files are ignored."""
+    converter = PDFConverterService()
+    mock_result = subprocess.CompletedProcess(args=[], returncode=0, stdout=b"", stderr=b"")
+    pdf_path = tmp_path / "doc.pdf"
+    pdf_path.write_bytes(b"fake pdf")
+    for name in ("doc_pdf-1000.png", "doc_pdf-999.png", "doc_pdf-100.png", "other_pdf-000.png"):
+        (tmp_path / name).write_bytes(b"\x89PNG")
+
+    with patch("subprocess.run", return_value=mock_result):
+        images = converter.convert_pdf_to_png(
+            pdf_path=pdf_path, output_prefix="doc", temp_dir=tmp_path
+        )
+
+    assert [image.filename for image in images] == [
+        "doc_pdf-100.png",
+        "doc_pdf-999.png",
+        "doc_pdf-1000.png",
+    ]
+    assert [image.page_number for image in images] == [1, 2, 3]
+    assert images[2].path == tmp_path / "doc_pdf-1000.png"
+    assert images[2].size_bytes == len(b"\x89PNG")
+
+
+def test_pdf_converter_keeps_scratch_in_temp_dir(tmp_path):
+    """ImageMagick and Ghostscript scratch files are directed into the job directory."""
+    converter = PDFConverterService()
+    mock_result = subprocess.CompletedProcess(args=[], returncode=0, stdout=b"", stderr=b"")
+    pdf_path = tmp_path / "doc.pdf"
+    pdf_path.write_bytes(b"fake pdf")
+    (tmp_path / "doc_pdf-000.png").write_bytes(b"\x89PNG page1")
+
+    with (
+        patch.dict("os.environ", {"MAGICK_MEMORY_LIMIT": "256MiB"}),
+        patch("subprocess.run", return_value=mock_result) as mock_run,
+    ):
+        converter.convert_pdf_to_png(pdf_path=pdf_path, output_prefix="doc", temp_dir=tmp_path)
+
+    env = mock_run.call_args[1]["env"]
+    assert env["MAGICK_TEMPORARY_PATH"] == str(tmp_path)
+    assert env["TMPDIR"] == str(tmp_path)
+    # Operator-provided ImageMagick limits are passed through
+    assert env["MAGICK_MEMORY_LIMIT"] == "256MiB"
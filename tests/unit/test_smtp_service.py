@@ -1,10 +1,15 @@
 """Unit tests for SMTPService."""
 
+import email
+import email.message
+import re
 import smtplib
 import ssl
 import tempfile
+from email.header import decode_header, make_header
 from pathlib import Path
 from unittest.mock import MagicMock, patch
+
 import pytest
 
 from src.models.png_image import PNGImage
@@ -22,6 +27,48 @@ def smtp_service(config):
     return SMTPService(config)
 
 
+def _mock_conn() -> MagicMock:
+    """Connection mock restricted to the smtplib.SMTP API.
+
+    A typo in a method name fails the test instead of returning a fresh
+    child mock.
+    """
+    return MagicMock(spec=smtplib.SMTP)
+
+
+@pytest.fixture()
+def mock_smtplib():
+    """Patched smtplib module whose SMTP_SSL and SMTP return spec'd connections.
+
+    The real exception classes are kept so connect() can catch them.
+    """
+    with patch("src.services.smtp_service.smtplib") as mock_module:
+        mock_module.SMTPAuthenticationError = smtplib.SMTPAuthenticationError
+        mock_module.SMTP_SSL.return_value = _mock_conn()
+        mock_module.SMTP.return_value = _mock_conn()
+        yield mock_module
+
+
+def _make_streaming_conn() -> MagicMock:
+    """Mock SMTP connection that accepts a streamed message."""
+    conn = _mock_conn()
+    conn.has_extn.return_value = False
+    conn.mail.return_value = (250, b"OK")
+    conn.rcpt.return_value = (250, b"OK")
+    conn.docmd.return_value = (354, b"Start mail input")
+    conn.getreply.return_value = (250, b"Queued")
+    return conn
+
+
+def _parse_streamed(conn: MagicMock) -> email.message.Message:
+    """Reassemble and parse the message written to a mock connection."""
+    data = b"".join(c.args[0] for c in conn.send.call_args_list)
+    assert data.endswith(b"\r\n.\r\n")
+    # Undo dot-stuffing
+    data = re.sub(rb"(?m)^\.\.", b".", data.removesuffix(b".\r\n"))
+    return email.message_from_bytes(data)
+
+
 def _make_png_image(tmpdir: Path, name: str = "test.png") -> PNGImage:
     """Create a real PNGImage with a temp file."""
     png_path = tmpdir / name
@@ -49,61 +96,48 @@ class TestSMTPServiceInit:
 class TestSMTPServiceConnect:
     """Tests for SMTPService.connect()."""
 
-    @patch("src.services.smtp_service.smtplib")
     def test_connect_ssl_success(self, mock_smtplib, smtp_service):
         """connect() succeeds with SMTP_SSL."""
-        mock_conn = MagicMock()
-        mock_smtplib.SMTP_SSL.return_value = mock_conn
+        mock_conn = mock_smtplib.SMTP_SSL.return_value
 
         smtp_service.connect()
 
         mock_smtplib.SMTP_SSL.assert_called_once_with("smtp.test.com", 587, timeout=120)
         mock_conn.login.assert_called_once_with("user@test.com", "secret")
 
-    @patch("src.services.smtp_service.smtplib")
     def test_connect_ssl_fails_starttls_succeeds(self, mock_smtplib, smtp_service):
         """connect() falls back to STARTTLS when SSL fails."""
         mock_smtplib.SMTP_SSL.side_effect = ssl.SSLError("SSL failed")
-        mock_conn = MagicMock()
-        mock_smtplib.SMTP.return_value = mock_conn
+        mock_conn = mock_smtplib.SMTP.return_value
 
         smtp_service.connect()
 
         mock_smtplib.SMTP.assert_called_once()
         mock_conn.login.assert_called_once()
 
-    @patch("src.services.smtp_service.smtplib")
     def test_connect_auth_failure(self, mock_smtplib, smtp_service):
         """connect() raises SMTPAuthenticationError on auth failure."""
         mock_smtplib.SMTP_SSL.side_effect = ssl.SSLError("SSL failed")
-        mock_smtplib.SMTP.return_value = MagicMock()
         mock_smtplib.SMTP.return_value.login.side_effect = smtplib.SMTPAuthenticationError(
             535, b"bad creds"
         )
-        mock_smtplib.SMTPAuthenticationError = smtplib.SMTPAuthenticationError
 
         with pytest.raises(SMTPAuthenticationError):
             smtp_service.connect()
 
-    @patch("src.services.smtp_service.smtplib")
     def test_connect_all_fail(self, mock_smtplib, smtp_service):
         """connect() raises SMTPConnectionError when everything fails."""
         mock_smtplib.SMTP_SSL.side_effect = Exception("ssl fail")
-        mock_smtplib.SMTP.return_value = MagicMock()
         mock_smtplib.SMTP.return_value.login.side_effect = Exception("login fail")
-        mock_smtplib.SMTPAuthenticationError = type("SMTPAuthError", (Exception,), {})
 
         with pytest.raises(SMTPConnectionError):
             smtp_service.connect()
 
-    @patch("src.services.smtp_service.smtplib")
     def test_connect_ssl_auth_failure(self, mock_smtplib, smtp_service):
         """connect() raises SMTPAuthenticationError on SSL auth failure."""
-        mock_smtplib.SMTP_SSL.return_value = MagicMock()
         mock_smtplib.SMTP_SSL.return_value.login.side_effect = smtplib.SMTPAuthenticationError(
             535, b"bad creds"
         )
-        mock_smtplib.SMTPAuthenticationError = smtplib.SMTPAuthenticationError
 
         with pytest.raises(SMTPAuthenticationError):
             smtp_service.connect()
@@ -121,8 +155,8 @@ class TestSMTPServiceSendReply:
             )
 
     def test_send_with_attachments(self, smtp_service):
-        """send constructs email with PNG attachments."""
-        mock_conn = MagicMock()
+        """send streams the email with PNG attachments over SMTP DATA."""
+        mock_conn = _make_streaming_conn()
         smtp_service.connection = mock_conn
 
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -135,14 +169,199 @@ class TestSMTPServiceSendReply:
                 attachments=[png],
             )
 
-        mock_conn.sendmail.assert_called_once()
-        args = mock_conn.sendmail.call_args
-        assert args[0][0] == "user@test.com"
-        assert args[0][1] == ["alice@test.com"]
+        mock_conn.mail.assert_called_once_with("user@test.com", [])
+        mock_conn.rcpt.assert_called_once_with("alice@test.com")
+        mock_conn.docmd.assert_called_once_with("data")
+        mock_conn.sendmail.assert_not_called()
+
+        msg = _parse_streamed(mock_conn)
+        assert msg["Subject"] == "Re: PDF"
+        parts = msg.get_payload()
+        assert parts[0].get_payload() == "Here are your PNGs"
+        assert parts[1].get_content_type() == "image/png"
+        assert parts[1].get_filename() == "test.png"
+        assert parts[1].get_payload(decode=True) == b"\x89PNG fake content here!"
+
+    def test_send_streams_attachments_in_order(self, smtp_service):
+        """PNGs are appended one after another, in attachment order."""
+        mock_conn = _make_streaming_conn()
+        smtp_service.connection = mock_conn
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pngs = [_make_png_image(Path(tmpdir), f"page-{i}.png") for i in range(3)]
+
+            smtp_service.send_reply_with_attachments(
+                to_address="alice@test.com", subject="Re: PDF", body="B", attachments=pngs
+            )
+
+        parts = _parse_streamed(mock_conn).get_payload()
+        assert [p.get_filename() for p in parts[1:]] == ["page-0.png", "page-1.png", "page-2.png"]
+
+    def test_send_encodes_attachment_in_blocks(self, smtp_service):
+        """A PNG is base64-encoded from its file block by block, never whole."""
+        mock_conn = _make_streaming_conn()
+        smtp_service.connection = mock_conn
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            png = _make_png_image(Path(tmpdir))
+            content = bytes(range(256)) * 4
+            png.path.write_bytes(content)
+
+            with patch("src.services.smtp_service._BASE64_READ_SIZE", 57):
+                smtp_service.send_reply_with_attachments(
+                    to_address="alice@test.com", subject="S", body="B", attachments=[png]
+                )
+
+        chunks = [c.args[0] for c in mock_conn.send.call_args_list]
+        # skeleton + part headers + one 76-character line per block + closing + end marker
+        assert len(chunks) == 2 + -(-len(content) // 57) + 2
+        assert max(len(c) for c in chunks[2:-2]) == 78
+        assert _parse_streamed(mock_conn).get_payload()[1].get_payload(decode=True) == content
+
+    def test_send_splits_large_replies(self, make_config):
+        """Attachments beyond attachments_per_email are spread over numbered replies."""
+        smtp_service = SMTPService(make_config(attachments_per_email=2))
+        mock_conn = _make_streaming_conn()
+        smtp_service.connection = mock_conn
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pngs = [_make_png_image(Path(tmpdir), f"page-{i}.png") for i in range(5)]
+
+            with patch.object(smtp_service, "_send_streamed") as mock_send:
+                smtp_service.send_reply_with_attachments(
+                    to_address="alice@test.com", subject="Re: PDF", body="B", attachments=pngs
+                )
+
+            messages = []
+            for call in mock_send.call_args_list:
+                data = b"".join(call.args[1])
+                messages.append(email.message_from_bytes(data))
+
+        assert [m["Subject"] for m in messages] == [
+            "Re: PDF (1/3)",
+            "Re: PDF (2/3)",
+            "Re: PDF (3/3)",
+        ]
+        assert [[p.get_filename() for p in m.get_payload()[1:]] for m in messages] == [
+            ["page-0.png", "page-1.png"],
+            ["page-2.png", "page-3.png"],
+            ["page-4.png"],
+        ]
+
+    def test_batches_respect_encoded_size_limit(self, make_config):
+        """Replies are also split so their base64-encoded size stays within max_reply_size_mb."""
+        smtp_service = SMTPService(make_config(max_reply_size_mb=1))
+        sizes = [300_000, 300_000, 300_000, 2_000_000, 100_000]
+        pngs = [
+            PNGImage(
+                path=Path(f"page-{i}.png"),
+                filename=f"page-{i}.png",
+                source_pdf="doc.pdf",
+                page_number=i + 1,
+                size_bytes=size,
+                resolution=(1920, 1080),
+                density_dpi=300,
+                validate_fs=False,
+            )
+            for i, size in enumerate(sizes)
+        ]
+
+        batches = smtp_service._batch_attachments(pngs)
+
+        # Two 300 kB images fit in 1 MB once encoded, three do not; the
+        # oversized image is sent alone rather than dropped
+        assert [[png.filename for png in batch] for batch in batches] == [
+            ["page-0.png", "page-1.png"],
+            ["page-2.png"],
+            ["page-3.png"],
+            ["page-4.png"],
+        ]
+
+    def test_send_at_batch_limit_is_single_reply(self, make_config):
+        """A reply with exactly attachments_per_email PNGs keeps its subject."""
+        smtp_service = SMTPService(make_config(attachments_per_email=2))
+        mock_conn = _make_streaming_conn()
+        smtp_service.connection = mock_conn
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pngs = [_make_png_image(Path(tmpdir), f"page-{i}.png") for i in range(2)]
+            smtp_service.send_reply_with_attachments(
+                to_address="alice@test.com", subject="Re: PDF", body="B", attachments=pngs
+            )
+
+        mock_conn.mail.assert_called_once()
+        assert _parse_streamed(mock_conn)["Subject"] == "Re: PDF"
+
+    def test_send_announces_size_when_supported(self, smtp_service):
+        """MAIL FROM carries an ESMTP SIZE that covers the streamed message."""
+        mock_conn = _make_streaming_conn()
+        mock_conn.has_extn.side_effect = lambda name: name == "size"
+        smtp_service.connection = mock_conn
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pngs = [_make_png_image(Path(tmpdir), f"page-{i}.png") for i in range(2)]
+            smtp_service.send_reply_with_attachments(
+                to_address="alice@test.com", subject="Re: PDF", body="B", attachments=pngs
+            )
+
+        (option,) = mock_conn.mail.call_args.args[1]
+        assert option.startswith("SIZE=")
+        sent = sum(len(c.args[0]) for c in mock_conn.send.call_args_list)
+        assert int(option.removeprefix("SIZE=")) >= sent
+
+    def test_send_failure_mid_data_closes_socket(self, smtp_service):
+        """A read error while streaming closes the socket instead of sending QUIT into DATA."""
+        mock_conn = _make_streaming_conn()
+        fresh_conn = _make_streaming_conn()
+        smtp_service.connection = mock_conn
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            png = _make_png_image(Path(tmpdir))
+            with (
+                patch.object(Path, "open", side_effect=OSError("read failed")),
+                patch.object(SMTPService, "connect") as mock_connect,
+                pytest.raises(SMTPError),
+            ):
+                mock_connect.side_effect = lambda: setattr(smtp_service, "connection", fresh_conn)
+                smtp_service.send_reply_with_attachments(
+                    to_address="a@b.com", subject="S", body="B", attachments=[png]
+                )
+
+        mock_conn.close.assert_called_once()
+        mock_conn.quit.assert_not_called()
+        fresh_conn.close.assert_called_once()
+        fresh_conn.quit.assert_not_called()
+
+    def test_send_dot_stuffs_body(self, smtp_service):
+        """Body lines starting with a dot are escaped inside DATA."""
+        mock_conn = _make_streaming_conn()
+        smtp_service.connection = mock_conn
+
+        smtp_service.send_reply_with_attachments(
+            to_address="alice@test.com", subject="S", body="a\n.b", attachments=[]
+        )
+
+        data = b"".join(c.args[0] for c in mock_conn.send.call_args_list)
+        assert b"\r\n..b\r\n" in data
+        assert data.endswith(b"\r\n.\r\n")
+        assert _parse_streamed(mock_conn).get_payload()[0].get_payload() == "a\r\n.b"
+
+    def test_send_encodes_non_ascii_subject(self, smtp_service):
+        """Non-ASCII subjects are sent RFC 2047 encoded."""
+        mock_conn = _make_streaming_conn()
+        smtp_service.connection = mock_conn
+
+        smtp_service.send_reply_with_attachments(
+            to_address="alice@test.com", subject="Re: Caf\u00e9", body="B", attachments=[]
+        )
+
+        subject = _parse_streamed(mock_conn)["Subject"]
+        assert subject.startswith("=?utf-8?")
+        assert str(make_header(decode_header(subject))) == "Re: Caf\u00e9"
 
     def test_send_with_cc(self, smtp_service):
         """send includes CC recipients."""
-        mock_conn = MagicMock()
+        mock_conn = _make_streaming_conn()
         smtp_service.connection = mock_conn
 
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -156,13 +375,49 @@ class TestSMTPServiceSendReply:
                 cc_addresses=["boss@test.com"],
             )
 
-        args = mock_conn.sendmail.call_args
-        assert "boss@test.com" in args[0][1]
+        assert [c.args[0] for c in mock_conn.rcpt.call_args_list] == [
+            "alice@test.com",
+            "boss@test.com",
+        ]
+        assert _parse_streamed(mock_conn)["Cc"] == "boss@test.com"
+
+    def test_send_all_recipients_refused_raises(self, smtp_service):
+        """send fails without sending data when every recipient is refused."""
+        mock_conn = _make_streaming_conn()
+        mock_conn.rcpt.return_value = (550, b"No such user")
+        smtp_service.connection = mock_conn
+
+        with (
+            patch.object(SMTPService, "connect") as mock_connect,
+            pytest.raises(SMTPError, match="Failed to send reply email"),
+        ):
+            mock_connect.side_effect = lambda: setattr(smtp_service, "connection", mock_conn)
+            smtp_service.send_reply_with_attachments(
+                to_address="a@b.com", subject="S", body="B", attachments=[]
+            )
+
+        mock_conn.rset.assert_called()
+        mock_conn.docmd.assert_not_called()
+
+    def test_send_data_rejected_raises(self, smtp_service):
+        """send fails when the server rejects the message after DATA."""
+        mock_conn = _make_streaming_conn()
+        mock_conn.getreply.return_value = (552, b"Message too large")
+        smtp_service.connection = mock_conn
+
+        with (
+            patch.object(SMTPService, "connect") as mock_connect,
+            pytest.raises(SMTPError, match="Message too large"),
+        ):
+            mock_connect.side_effect = lambda: setattr(smtp_service, "connection", mock_conn)
+            smtp_service.send_reply_with_attachments(
+                to_address="a@b.com", subject="S", body="B", attachments=[]
+            )
 
     def test_send_failure_raises(self, smtp_service):
-        """send raises SMTPError on sendmail failure after retries."""
-        mock_conn = MagicMock()
-        mock_conn.sendmail.side_effect = Exception("network error")
+        """send raises SMTPError on send failure after retries."""
+        mock_conn = _make_streaming_conn()
+        mock_conn.send.side_effect = Exception("network error")
         smtp_service.connection = mock_conn
 
         with (
@@ -178,10 +433,10 @@ class TestSMTPServiceSendReply:
 
     def test_send_retries_on_stale_connection(self, smtp_service):
         """send reconnects and retries when first attempt fails."""
-        stale_conn = MagicMock()
-        stale_conn.sendmail.side_effect = smtplib.SMTPServerDisconnected("disconnected")
+        stale_conn = _make_streaming_conn()
+        stale_conn.mail.side_effect = smtplib.SMTPServerDisconnected("disconnected")
 
-        fresh_conn = MagicMock()
+        fresh_conn = _make_streaming_conn()
         smtp_service.connection = stale_conn
 
         with (
@@ -197,11 +452,12 @@ class TestSMTPServiceSendReply:
                 attachments=[png],
             )
 
-        fresh_conn.sendmail.assert_called_once()
+        fresh_conn.mail.assert_called_once()
+        assert _parse_streamed(fresh_conn).get_payload()[0].get_payload() == "Retried"
 
     def test_send_reconnects_when_connection_is_none(self, smtp_service):
         """send establishes connection when none exists."""
-        mock_conn = MagicMock()
+        mock_conn = _make_streaming_conn()
 
         with (
             tempfile.TemporaryDirectory() as tmpdir,
@@ -217,7 +473,7 @@ class TestSMTPServiceSendReply:
             )
 
         mock_connect.assert_called_once()
-        mock_conn.sendmail.assert_called_once()
+        mock_conn.mail.assert_called_once()
 
 
 class TestSMTPServiceSendError:
@@ -231,7 +487,7 @@ class TestSMTPServiceSendError:
 
     def test_send_error_notification(self, smtp_service):
         """send_error constructs error email."""
-        mock_conn = MagicMock()
+        mock_conn = _mock_conn()
         smtp_service.connection = mock_conn
 
         smtp_service.send_error_notification(
@@ -243,7 +499,7 @@ class TestSMTPServiceSendError:
 
     def test_send_error_with_context(self, smtp_service):
         """send_error includes context dict in body."""
-        mock_conn = MagicMock()
+        mock_conn = _mock_conn()
         smtp_service.connection = mock_conn
 
         smtp_service.send_error_notification(
@@ -254,12 +510,58 @@ class TestSMTPServiceSendError:
 
         call_args = mock_conn.sendmail.call_args
         email_body = call_args[0][2]
-        assert "Invoice" in email_body
-        assert "ValueError" in email_body
+        assert b"Invoice" in email_body
+        assert b"ValueError" in email_body
+
+    def test_send_error_serializes_crlf_bytes(self, smtp_service):
+        """The notification is handed to sendmail as CRLF bytes; non-ASCII context survives."""
+        mock_conn = _mock_conn()
+        smtp_service.connection = mock_conn
+
+        smtp_service.send_error_notification(
+            to_address="alice@test.com",
+            error=ValueError("bad pdf"),
+            context={"Email Subject": "Caf\u00e9"},
+        )
+
+        data = mock_conn.sendmail.call_args[0][2]
+        assert isinstance(data, bytes)
+        assert b"\r\n" in data
+        assert b"\n" not in data.replace(b"\r\n", b"")
+        body = email.message_from_bytes(data).get_payload(decode=True).decode()
+        assert "Email Subject: Caf\u00e9" in body
+
+    def test_send_error_uses_error_traceback(self, smtp_service):
+        """The trace comes from the error itself and keeps only the innermost frames."""
+        mock_conn = _mock_conn()
+        smtp_service.connection = mock_conn
+
+        def recurse(depth):
+            if depth == 0:
+                raise RuntimeError("deep failure")
+            recurse(depth - 1)
+
+        try:
+            recurse(40)
+        except RuntimeError as e:
+            error = e
+
+        # Called outside the except block, where format_exc() would report nothing
+        smtp_service.send_error_notification(to_address="alice@test.com", error=error)
+
+        data = mock_conn.sendmail.call_args[0][2]
+        body = email.message_from_bytes(data).get_payload().replace("\r\n", "\n")
+        assert "Traceback (most recent call last):" in body
+        assert "RuntimeError: deep failure" in body
+        # Innermost frame kept, outermost (this test's call) dropped by the frame limit
+        assert 'raise RuntimeError("deep failure")' in body
+        assert "recurse(40)" not in body
+        assert body.startswith("An error occurred while processing your PDF attachment.\n\n")
+        assert body.endswith("If the problem persists, please contact support.")
 
     def test_send_error_failure_raises(self, smtp_service):
         """send_error raises SMTPError on failure after retries."""
-        mock_conn = MagicMock()
+        mock_conn = _mock_conn()
         mock_conn.sendmail.side_effect = Exception("network error")
         smtp_service.connection = mock_conn
 
@@ -271,12 +573,62 @@ class TestSMTPServiceSendError:
             smtp_service.send_error_notification(to_address="a@b.com", error=RuntimeError("fail"))
 
 
+class TestSMTPServiceIdleCheck:
+    """Tests for probing idle SMTP connections before sending."""
+
+    def _send(self, smtp_service):
+        smtp_service.send_reply_with_attachments(
+            to_address="alice@test.com", subject="S", body="B", attachments=[]
+        )
+
+    def test_recent_connection_not_probed(self, smtp_service):
+        """No NOOP is sent while the connection was used recently."""
+        mock_conn = _make_streaming_conn()
+        smtp_service.connection = mock_conn
+
+        self._send(smtp_service)
+
+        mock_conn.noop.assert_not_called()
+        mock_conn.mail.assert_called_once()
+
+    def test_idle_connection_probed_and_reused(self, smtp_service):
+        """An idle connection that answers NOOP is reused."""
+        mock_conn = _make_streaming_conn()
+        mock_conn.noop.return_value = (250, b"OK")
+        smtp_service.connection = mock_conn
+        smtp_service._last_activity -= SMTPService.IDLE_CHECK_SECONDS + 1
+
+        with patch.object(SMTPService, "connect") as mock_connect:
+            self._send(smtp_service)
+
+        mock_conn.noop.assert_called_once()
+        mock_connect.assert_not_called()
+        mock_conn.mail.assert_called_once()
+
+    def test_dead_idle_connection_replaced(self, smtp_service):
+        """An idle connection that fails NOOP is closed and replaced before sending."""
+        stale_conn = _make_streaming_conn()
+        stale_conn.noop.side_effect = smtplib.SMTPServerDisconnected("gone")
+        fresh_conn = _make_streaming_conn()
+        smtp_service.connection = stale_conn
+        smtp_service._last_activity -= SMTPService.IDLE_CHECK_SECONDS + 1
+
+        with patch.object(SMTPService, "connect") as mock_connect:
+            mock_connect.side_effect = lambda: setattr(smtp_service, "connection", fresh_conn)
+            self._send(smtp_service)
+
+        stale_conn.close.assert_called_once()
+        stale_conn.quit.assert_not_called()
+        stale_conn.mail.assert_not_called()
+        fresh_conn.mail.assert_called_once()
+
+
 class TestSMTPServiceDisconnect:
     """Tests for SMTPService.disconnect()."""
 
     def test_disconnect_with_connection(self, smtp_service):
         """disconnect quits and nullifies connection."""
-        mock_conn = MagicMock()
+        mock_conn = _mock_conn()
         smtp_service.connection = mock_conn
 
         smtp_service.disconnect()
@@ -291,7 +643,7 @@ class TestSMTPServiceDisconnect:
 
     def test_disconnect_error_ignored(self, smtp_service):
         """disconnect swallows errors."""
-        mock_conn = MagicMock()
+        mock_conn = _mock_conn()
         mock_conn.quit.side_effect = Exception("quit failed")
         smtp_service.connection = mock_conn
 
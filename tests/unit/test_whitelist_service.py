@@ -45,3 +45,106 @@ def test_whitelist_raises_on_invalid_regex():
     """T058 [US2] Unit test: WhitelistService raises ValueError on invalid regex."""
     with pytest.raises(ValueError, match="Invalid regex pattern"):
         WhitelistService(regex_pattern="[invalid(regex")
+
+
+def test_whitelist_requires_full_match():
+    """WhitelistService rejects addresses that only match as a prefix."""
+    whitelist = WhitelistService(regex_pattern=".*@company\\.com")
+
+    assert whitelist.is_whitelisted("user@company.com.evil.org") is False
+    assert whitelist.is_whitelisted("user@company.com") is True
+
+
+def test_whitelist_empty_address_rejected():
+    """WhitelistService rejects empty addresses."""
+    whitelist = WhitelistService(regex_pattern=".*")
+
+    assert whitelist.is_whitelisted("") is False
+
+
+def test_whitelist_rejects_overlong_address():
+    """Addresses longer than RFC 5321 allows never reach the pattern."""
+    whitelist = WhitelistService(regex_pattern=".*@company\\.com")
+    local_part = "a" * (WhitelistService.MAX_ADDRESS_LENGTH - len("@company.com"))
+
+    assert whitelist.is_whitelisted(f"{local_part}@company.com") is True
+    assert whitelist.is_whitelisted(f"a{local_part}@company.com") is False
+    assert whitelist._matches.cache_info().currsize == 1
+
+
+def test_whitelist_caches_repeat_senders():
+    """WhitelistService only runs the regex once per distinct sender."""
+    whitelist = WhitelistService(regex_pattern=".*@company\\.com")
+
+    for _ in range(3):
+        assert whitelist.is_whitelisted("alice@company.com") is True
+
+    assert whitelist._matches.cache_info().misses == 1
+
+
+def test_whitelist_shares_compiled_pattern_with_configuration(make_config):
+    """The pattern validated by Configuration is reused, not compiled again."""
+    config = make_config(sender_whitelist_regex=".*@shared\\.example")
+    whitelist = WhitelistService(regex_pattern=config.sender_whitelist_regex)
+
+    assert whitelist.compiled_pattern is config.compiled_whitelist
+
+
+@pytest.mark.parametrize("pattern", [".*@company\\.com", ".*@my\\-k\\.com"])
+def test_whitelist_domain_suffix_fast_path_agrees_with_regex(pattern):
+    """Plain ".*@domain" patterns skip the regex engine but give the same answers."""
+    domain = "company.com" if "company" in pattern else "my-k.com"
+    addresses = [
+        f"alice@{domain}",
+        f"ALICE@{domain.upper()}",
+        f"@{domain}",
+        f"caf\u00e9@{domain}",
+        f"a\n@{domain}",
+        f"x@sub.{domain}",
+        f"x@{domain}.evil.org",
+        f"x@evil{domain}",
+        # Kelvin sign (U+212A) in place of "k"
+        "x@" + domain.replace("k", "\u212a"),
+    ]
+    fast = WhitelistService(regex_pattern=pattern)
+    slow = WhitelistService(regex_pattern=pattern)
+    slow._domain_suffix = None
+
+    assert fast._domain_suffix is not None
+    for address in addresses:
+        assert fast.is_whitelisted(address) is slow.is_whitelisted(address), address
+
+
+def test_whitelist_unescaped_dot_keeps_regex():
+    """An unescaped "." is a wildcard, so such patterns are not treated as suffixes."""
+    whitelist = WhitelistService(regex_pattern=".*@company.com")
+
+    assert whitelist._domain_suffix is None
+    assert whitelist.is_whitelisted("alice@companyXcom") is True
+
+
+def test_whitelist_matches_case_insensitively():
+    """Differently-cased spellings of an address match and share one cache entry."""
+    whitelist = WhitelistService(regex_pattern=".*@company\\.com")
+
+    assert whitelist.is_whitelisted("Alice@Company.COM") is True
+    assert whitelist.is_whitelisted("alice@company.com") is True
+    assert whitelist.is_whitelisted("ALICE@COMPANY.COM.evil.org") is False
+    assert whitelist._matches.cache_info().misses == 2
+
+
+def test_whitelist_rejects_unicode_case_folding_lookalikes():
+    """Non-ASCII characters that fold to ASCII letters do not match them."""
+    whitelist = WhitelistService(regex_pattern=".*@kpn\\.com")
+
+    # U+212A KELVIN SIGN lowercases and case-folds to "k"
+    assert whitelist.is_whitelisted("user@\u212apn.com") is False
+    assert whitelist.is_whitelisted("user@KPN.com") is True
+
+
+def test_whitelist_word_class_is_ascii_only():
+    r"""\w in the pattern matches ASCII word characters only."""
+    whitelist = WhitelistService(regex_pattern="\\w+@company\\.com")
+
+    assert whitelist.is_whitelisted("alice_1@company.com") is True
+    assert whitelist.is_whitelisted("alïce@company.com") is False